@@ -1,11 +1,14 @@
 """Main API class for the ExpertOption API."""
 import asyncio
 import logging
+import random
 import time
 import json
-from typing import Dict, List, Optional
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
 from uuid import uuid4
 from Expert.ws.client import WebSocketClient
+from Expert.ws.scheduler import OutboundScheduler
 from Expert.ws.channels.authenticate import AuthenticateChannel
 from Expert.ws.channels.ping import PingChannel
 from Expert.ws.channels.candles import CandlesChannel
@@ -15,44 +18,106 @@ from Expert.ws.channels.traders_choice import TradersChoiceChannel
 from Expert.ws.objects.profile import Profile
 from Expert.ws.objects.candles import Candles
 from Expert.ws.objects.order import Order
-from Expert.constants import get_asset_id, get_asset_symbol, get_available_regions, get_default_multiple_action
-from Expert.utils import validate_asset_id, validate_symbol, get_next_expiration_time
+from Expert.asset_registry import AssetRegistry
+from Expert.bootstrap import BOOTSTRAP_PROFILES, BootstrapCache
+from Expert.candle_store import CandleStore
+from Expert.metrics import MetricsServer, PrometheusWriter
+from Expert.symbols import SymbolTable
+from Expert.clock import ServerClock
+from Expert.order_tracker import OrderTracker
+from Expert.constants import get_asset_symbol, get_available_regions, get_default_multiple_action
+from Expert.utils import validate_asset_id, get_next_expiration_time
 from Expert.exceptions import (
     ConnectionError, InvalidAssetError, InvalidExpirationTimeError,
     OrderPlacementError, DataFetchError
 )
 
+# Responses connect() waits for before the session is usable
+READY_ACTIONS = ("profile", "assets", "getCandlesTimeframes")
+
 class ExpertOptionAPI:
     """Main API class for interacting with the ExpertOption server."""
     
-    def __init__(self, token: str, demo: bool = True, server_region: str = "wss://fr24g1us.expertoption.finance/ws/v40"):
+    def __init__(self, token: str, demo: bool = True, server_region: str = "wss://fr24g1us.expertoption.finance/ws/v40",
+                 auto_reconnect: bool = True, max_reconnect_attempts: Optional[int] = None,
+                 reconnect_base_delay: float = 0.25, reconnect_max_delay: float = 30.0,
+                 bootstrap: str = "full", bootstrap_cache: Optional[BootstrapCache] = None,
+                 symbol_snapshot: Optional[str] = None, rate_limits: Optional[Dict[str, Tuple[float, Optional[float]]]] = None,
+                 batch_window: Optional[float] = None, max_batch: int = 50):
         """Initialize the API client.
         
         Args:
             token: Authentication token for the ExpertOption server.
             demo: True for demo mode, False for real trading.
             server_region: WebSocket server URI.
+            auto_reconnect: Reconnect and restore the session when the connection drops.
+            max_reconnect_attempts: Attempts per drop before giving up, or None to keep trying.
+            reconnect_base_delay: Backoff delay after the first failed attempt in seconds.
+            reconnect_max_delay: Upper bound of the backoff delay in seconds.
+            bootstrap: Startup actions to send, one of BOOTSTRAP_PROFILES ("minimal", "standard" or "full").
+            bootstrap_cache: Cache of slow-changing startup responses; fresh entries are not requested again.
+            symbol_snapshot: File the symbol table is loaded from at startup and saved to after connecting.
+            rate_limits: Outbound (frames per second, burst) per priority class ("orders", "pings",
+                "subscriptions", "bulk"); classes left out are unlimited.
+            batch_window: Seconds to collect candle subscriptions, traders' choice and history
+                requests into one multipleAction frame, or None (the default) to send each on its own.
+            max_batch: Maximum requests per batched frame.
+        
+        Raises:
+            ValueError: If bootstrap is not a known profile, a rate limit is invalid or the batching
+                settings are invalid.
         """
+        if bootstrap not in BOOTSTRAP_PROFILES:
+            raise ValueError(f"Unknown bootstrap profile {bootstrap!r}, expected one of {BOOTSTRAP_PROFILES}")
         self.token = token
         self.demo = demo
-        self.server_region = server_region if server_region in get_available_regions() else "wss://fr24g1us.expertoption.finance/ws/v40"
-        self.websocket_client = WebSocketClient(self)
+        # Local URIs are allowed for the mock server (Expert.mock_server)
+        is_local = server_region.startswith(("ws://127.0.0.1", "ws://localhost"))
+        self.server_region = server_region if server_region in get_available_regions() or is_local else "wss://fr24g1us.expertoption.finance/ws/v40"
+        self.websocket_client = WebSocketClient(self, scheduler=OutboundScheduler(rate_limits),
+                                                batch_window=batch_window, max_batch=max_batch)
         self.logger = logging.getLogger("ExpertOptionAPI")
         self.profile = Profile()
         self.candles = Candles()
-        self.active_assets: Dict[int, Dict] = {}
+        # Kept current from every assets message; active_assets is its dict of active raw assets
+        self.asset_registry = AssetRegistry()
+        self.active_assets: Dict[int, Dict] = self.asset_registry.active
+        self.symbols = SymbolTable(symbol_snapshot)
+        self.asset_registry.add_listener(self.symbols.update)
         self.candle_cache: Dict[int, Dict] = {}
+        self.candle_store = CandleStore()
+        self.server_clock = ServerClock()
         self.order_cache: Dict[int, Order] = {}
+        self.order_tracker = OrderTracker(self.order_cache)
         self.connected = False
         self.assets_data = None
         self.profile_data = None
+        # Active candle subscriptions (asset ID -> timeframes), replayed after a reconnect
+        self.subscriptions: Dict[int, List[int]] = {}
+        self.auto_reconnect = auto_reconnect
+        self.max_reconnect_attempts = max_reconnect_attempts
+        self.reconnect_base_delay = reconnect_base_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self.bootstrap = bootstrap
+        self.bootstrap_cache = bootstrap_cache
+        self.reconnect_count = 0
+        self.reconnect_failures = 0
+        self.reconnect_latencies = deque(maxlen=100)
+        self._reconnect_task: Optional[asyncio.Task] = None
+        # Seconds from the start of the last successful connect() to each phase
+        self.connect_timings: Dict[str, float] = {}
+        self.websocket_client.on_connection_lost = self._on_connection_lost
 
-    async def connect(self, max_retries: int = 3, retry_delay: float = 5.0):
+    async def connect(self, max_retries: int = 3, retry_delay: float = 5.0, ready_timeout: float = 10.0):
         """Connect to the ExpertOption server and initialize the session with retries.
         
+        Returns as soon as the profile, assets and candle timeframes responses
+        have arrived. The time of each phase is recorded in connect_timings.
+        
         Args:
             max_retries: Maximum number of connection retries.
             retry_delay: Delay between retries in seconds.
+            ready_timeout: Maximum time to wait for the startup responses in seconds.
         
         Raises:
             ConnectionError: If all retries fail.
@@ -64,43 +129,48 @@ class ExpertOptionAPI:
         for attempt in range(max_retries):
             try:
                 self.logger.info(f"Connection attempt {attempt + 1}/{max_retries}")
+                started = time.perf_counter()
                 await self.websocket_client.connect(self.server_region)
-                # Send multipleAction requests and fetch assets
-                await self.send_multiple_action()
-                # Wait for assets data to arrive with polling
-                max_wait = 10  # Maximum 10 seconds
-                wait_interval = 0.2  # Check every 200ms
-                waited = 0
-                while waited < max_wait:
-                    if self.assets_data and isinstance(self.assets_data, dict):
-                        break
-                    await asyncio.sleep(wait_interval)
-                    waited += wait_interval
-                self.logger.info(f"Waited {waited:.1f}s for assets data")
+                timings = {"websocket": time.perf_counter() - started}
+                batches = self._bootstrap_actions()
+                sent = {entry["action"] for batch in batches for entry in batch}
+                cached = set(self.bootstrap_cache.fresh_actions()) if self.bootstrap_cache is not None else set()
+                if "assets" in cached:
+                    # Start from the cached catalog; the live response is merged when it arrives
+                    self._merge_assets(self.bootstrap_cache.get("assets").get("assets", []))
+                # Register the waiters before sending so fast responses are not missed
+                ready = {action: self.websocket_client.expect(action)
+                         for action in READY_ACTIONS if action in sent and action not in cached}
+                if self.bootstrap_cache is not None:
+                    for action in sent.intersection(self.bootstrap_cache.ttls):
+                        self.websocket_client.expect(action).add_done_callback(self._cache_response)
+                await self.send_multiple_action(batches)
                 await self.set_trading_mode()
+                timings.update(await self._await_ready(ready, started, ready_timeout))
+                # Falls back to a profile request if the response did not arrive
                 await self.fetch_profile()
                 # Process assets data
                 self.logger.debug(f"Assets data type: {type(self.assets_data)}, content: {self.assets_data}")
-                if self.assets_data and isinstance(self.assets_data, dict):
+                # A fresh cached catalog was merged above; the live response is applied when it arrives
+                if "assets" not in cached and self.assets_data and isinstance(self.assets_data, dict):
                     try:
                         assets_list = self.assets_data.get("message", {}).get("assets", [])
                         if not isinstance(assets_list, list):
                             self.logger.error(f"Assets list is not a list: {assets_list}")
                             raise ValueError("Assets data is invalid")
-                        # Merge new assets with existing ones
-                        for asset in assets_list:
-                            if asset.get("is_active") == 1:
-                                self.active_assets[asset["id"]] = asset
-                        self.logger.info(f"Merged {len(assets_list)} assets, total active assets: {len(self.active_assets)}")
-                        self.logger.debug(f"Active asset IDs: {list(self.active_assets.keys())}")
+                        self._merge_assets(assets_list)
                     except Exception as e:
                         self.logger.error(f"Failed to process assets data: {str(e)}")
                         raise DataFetchError(f"Failed to process assets data: {str(e)}")
-                else:
+                elif "assets" not in cached:
                     self.logger.warning("No valid assets data received from multipleAction, trying fetch_assets")
                     await self.fetch_assets()
+                timings["total"] = time.perf_counter() - started
+                self.connect_timings = {phase: round(seconds, 4) for phase, seconds in timings.items()}
+                self.symbols.save()
                 self.connected = True
-                self.logger.info("Successfully connected to ExpertOption server")
+                self.logger.info(f"Successfully connected to ExpertOption server in {timings['total']:.3f}s "
+                                 f"({self.connect_timings})")
                 asyncio.create_task(self._auto_ping())
                 return
             except Exception as e:
@@ -113,78 +183,123 @@ class ExpertOptionAPI:
                 else:
                     raise ConnectionError(f"Connection failed after {max_retries} attempts: {str(e)}")
 
-    async def send_multiple_action(self):
-        """Send multipleAction requests similar to the old library and F12 data."""
+    async def _await_ready(self, futures: Dict[str, asyncio.Future], started: float,
+                           timeout: float) -> Dict[str, float]:
+        """Wait for startup responses in parallel and record when each arrived.
+        
+        Responses still missing after the timeout are logged and left to the
+        fallbacks in connect().
+        
+        Args:
+            futures: Futures from WebSocketClient.expect() keyed by action.
+            started: perf_counter() value the timings are relative to.
+            timeout: Maximum time to wait in seconds.
+        
+        Returns:
+            Seconds from started to each response that arrived, keyed by action.
+        
+        Raises:
+            ConnectionError: If the connection is lost while waiting.
+        """
+        timings: Dict[str, float] = {}
+        for action, future in futures.items():
+            future.add_done_callback(
+                lambda f, action=action: None if f.cancelled() else timings.setdefault(action, time.perf_counter() - started))
+        done, pending = await asyncio.wait(futures.values(), timeout=timeout)
+        for future in pending:
+            future.cancel()
+        for future in done:
+            if future.exception() is not None:
+                raise future.exception()
+        missing = [action for action, future in futures.items() if future in pending]
+        if missing:
+            self.logger.warning(f"No {', '.join(missing)} response within {timeout}s")
+        return timings
+
+    def _bootstrap_actions(self) -> List[List[Dict]]:
+        """Build the startup multipleAction batches for the bootstrap profile.
+        
+        ``full`` replays the browser's three batches, ``standard`` keeps what
+        trading and order tracking use, and ``minimal`` only what connect()
+        waits for. Actions whose response is fresh in bootstrap_cache are left out.
+        
+        Returns:
+            One list of actions per multipleAction request.
+        """
+        def action(name: str, message: Optional[Dict] = None) -> Dict:
+            entry = {"action": name, "ns": str(uuid4()), "token": self.token}
+            if message is not None:
+                entry["message"] = message
+            return entry
+        
+        is_demo = 1 if self.demo else 0
+        if self.bootstrap == "minimal":
+            batches = [[
+                action("userGroup"), action("profile"),
+                action("assets", {"mode": ["vanilla"], "subscribeMode": ["vanilla"]}),
+                action("getCandlesTimeframes"),
+            ]]
+        elif self.bootstrap == "standard":
+            batches = [[
+                action("userGroup"), action("profile"),
+                action("assets", {"mode": ["vanilla"], "subscribeMode": ["vanilla"]}),
+                action("getCurrency"), action("setTimeZone", {"timeZone": -180}), action("getCandlesTimeframes"),
+            ], [
+                action("openOptions"),
+                action("tradeHistory", {"index_from": 0, "count": 20, "is_demo": is_demo}),
+            ]]
+        else:
+            batches = [
+                # Matches F12, without defaultSubscribeCandles
+                [
+                    action("userGroup"), action("profile"), action("assets"), action("getCurrency"),
+                    action("getCountries"),
+                    action("environment", {
+                        "supportedFeatures": ["achievements", "trade_result_share", "tournaments", "referral", "twofa", "inventory", "deposit_withdrawal_error_handling", "report_a_problem_form", "ftt_trade", "stocks_trade"],
+                        "supportedAbTests": ["tournament_glow", "floating_exp_time", "tutorial", "tutorial_account_type", "tutorial_account_type_reg", "hide_education_section", "in_app_update_android_2", "auto_consent_reg", "btn_finances_to_register", "battles_4th_5th_place_rewards", "show_achievements_bottom_sheet", "kyc_webview", "promo_story_priority", "force_lang_in_app", "one_click_deposit"],
+                        "supportedInventoryItems": ["riskless_deal", "profit", "eopoints", "tournaments_prize_x3", "mystery_box", "special_deposit_bonus", "cashback_offer"]
+                    }),
+                    action("setTimeZone", {"timeZone": 180}), action("getCandlesTimeframes"),
+                ],
+                # Matches the old library, without defaultSubscribeCandles
+                [
+                    action("userGroup"), action("profile"),
+                    action("assets", {"mode": ["vanilla"], "subscribeMode": ["vanilla"]}),
+                    action("getCurrency"), action("getCountries"), action("environment"),
+                    action("setTimeZone", {"timeZone": -180}), action("getCandlesTimeframes"),
+                ],
+                [
+                    action("openOptions"),
+                    action("tradeHistory", {"index_from": 0, "count": 20, "is_demo": 1}),
+                    action("tradeHistory", {"index_from": 0, "count": 20, "is_demo": 0}),
+                    action("getTournaments"), action("getTournamentInfo"),
+                ],
+            ]
+        if self.bootstrap_cache is not None:
+            # The assets response carries live activity and payouts and subscribes to updates, so it is always sent
+            cached = set(self.bootstrap_cache.fresh_actions()) - {"assets"}
+            batches = [[entry for entry in batch if entry["action"] not in cached] for batch in batches]
+        return [batch for batch in batches if batch]
+
+    async def send_multiple_action(self, batches: Optional[List[List[Dict]]] = None):
+        """Send the startup multipleAction requests for the bootstrap profile.
+        
+        Args:
+            batches: Action batches from _bootstrap_actions(), built if omitted.
+        """
         try:
-            # First multipleAction request (matches F12, without defaultSubscribeCandles)
-            ns = str(uuid4())
-            payload1 = {
-                "action": "multipleAction",
-                "message": {
-                    "actions": [
-                        {"action": "userGroup", "ns": str(uuid4()), "token": self.token},
-                        {"action": "profile", "ns": str(uuid4()), "token": self.token},
-                        {"action": "assets", "ns": str(uuid4()), "token": self.token},
-                        {"action": "getCurrency", "ns": str(uuid4()), "token": self.token},
-                        {"action": "getCountries", "ns": str(uuid4()), "token": self.token},
-                        {"action": "environment", "message": {
-                            "supportedFeatures": ["achievements", "trade_result_share", "tournaments", "referral", "twofa", "inventory", "deposit_withdrawal_error_handling", "report_a_problem_form", "ftt_trade", "stocks_trade"],
-                            "supportedAbTests": ["tournament_glow", "floating_exp_time", "tutorial", "tutorial_account_type", "tutorial_account_type_reg", "hide_education_section", "in_app_update_android_2", "auto_consent_reg", "btn_finances_to_register", "battles_4th_5th_place_rewards", "show_achievements_bottom_sheet", "kyc_webview", "promo_story_priority", "force_lang_in_app", "one_click_deposit"],
-                            "supportedInventoryItems": ["riskless_deal", "profit", "eopoints", "tournaments_prize_x3", "mystery_box", "special_deposit_bonus", "cashback_offer"]
-                        }, "ns": str(uuid4()), "token": self.token},
-                        {"action": "setTimeZone", "message": {"timeZone": 180}, "ns": str(uuid4()), "token": self.token},
-                        {"action": "getCandlesTimeframes", "ns": str(uuid4()), "token": self.token}
-                    ]
-                },
-                "token": self.token,
-                "ns": ns
-            }
-            self.logger.debug(f"Sending first multipleAction payload: {json.dumps(payload1, indent=2)}")
-            await self.websocket_client.send(payload1)
-            self.logger.info("Sent first multipleAction request")
-            await asyncio.sleep(1.0)  # Wait for response
-
-            # Second multipleAction request (matches old library, without defaultSubscribeCandles)
-            payload2 = {
-                "action": "multipleAction",
-                "message": {
-                    "actions": [
-                        {"action": "userGroup", "ns": str(uuid4()), "token": self.token},
-                        {"action": "profile", "ns": str(uuid4()), "token": self.token},
-                        {"action": "assets", "message": {"mode": ["vanilla"], "subscribeMode": ["vanilla"]}, "ns": str(uuid4()), "token": self.token},
-                        {"action": "getCurrency", "ns": str(uuid4()), "token": self.token},
-                        {"action": "getCountries", "ns": str(uuid4()), "token": self.token},
-                        {"action": "environment", "ns": str(uuid4()), "token": self.token},
-                        {"action": "setTimeZone", "message": {"timeZone": -180}, "ns": str(uuid4()), "token": self.token},
-                        {"action": "getCandlesTimeframes", "ns": str(uuid4()), "token": self.token}
-                    ]
-                },
-                "token": self.token,
-                "ns": str(uuid4())
-            }
-            self.logger.debug(f"Sending second multipleAction payload: {json.dumps(payload2, indent=2)}")
-            await self.websocket_client.send(payload2)
-            self.logger.info("Sent second multipleAction request")
-            await asyncio.sleep(1.0)  # Wait for response
-
-            # Third multipleAction request (matches old library)
-            payload3 = {
-                "action": "multipleAction",
-                "message": {
-                    "actions": [
-                        {"action": "openOptions", "ns": str(uuid4()), "token": self.token},
-                        {"action": "tradeHistory", "message": {"index_from": 0, "count": 20, "is_demo": 1}, "ns": str(uuid4()), "token": self.token},
-                        {"action": "tradeHistory", "message": {"index_from": 0, "count": 20, "is_demo": 0}, "ns": str(uuid4()), "token": self.token},
-                        {"action": "getTournaments", "ns": str(uuid4()), "token": self.token},
-                        {"action": "getTournamentInfo", "ns": str(uuid4()), "token": self.token}
-                    ]
-                },
-                "token": self.token,
-                "ns": str(uuid4())
-            }
-            self.logger.debug(f"Sending third multipleAction payload: {json.dumps(payload3, indent=2)}")
-            await self.websocket_client.send(payload3)
-            self.logger.info("Sent third multipleAction request")
+            batches = batches if batches is not None else self._bootstrap_actions()
+            for number, actions in enumerate(batches, 1):
+                payload = {
+                    "action": "multipleAction",
+                    "message": {"actions": actions},
+                    "token": self.token,
+                    "ns": str(uuid4())
+                }
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(f"Sending multipleAction payload {number}: {json.dumps(payload, indent=2)}")
+                await self.websocket_client.send(payload)
+            self.logger.info(f"Sent {len(batches)} multipleAction requests ({self.bootstrap} bootstrap)")
         except Exception as e:
             self.logger.error(f"Failed to send multipleAction requests: {str(e)}", exc_info=True)
             raise
@@ -193,15 +308,211 @@ class ExpertOptionAPI:
         """Disconnect from the ExpertOption server."""
         try:
             self.connected = False  # Set connected to False before disconnecting
+            if self._reconnect_task and not self._reconnect_task.done():
+                self._reconnect_task.cancel()
             await self.websocket_client.disconnect()
+            self.order_tracker.fail_all(ConnectionError("Disconnected from ExpertOption server"))
             self.logger.info("Disconnected from ExpertOption server")
         except Exception as e:
             self.logger.error(f"Failed to disconnect: {str(e)}", exc_info=True)
 
+    def _on_connection_lost(self, error: Exception):
+        """Start the reconnect supervisor when the WebSocket drops unexpectedly."""
+        if not self.connected:
+            return
+        if not self.auto_reconnect:
+            self.connected = False
+            self.order_tracker.fail_all(error)
+            return
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self):
+        """Reconnect with jittered exponential backoff and restore the session.
+        
+        The first attempt is immediate. ``connected`` stays True while
+        reconnecting, so order waiters and the ping task survive the drop; it
+        turns False only if max_reconnect_attempts is exhausted.
+        """
+        started = time.monotonic()
+        attempt = 0
+        while self.connected:
+            try:
+                await self.websocket_client.connect(self.server_region)
+                await self._restore_session()
+                latency = time.monotonic() - started
+                self.reconnect_count += 1
+                self.reconnect_latencies.append(latency)
+                self.logger.info(f"Reconnected after {attempt + 1} attempt(s) in {latency:.3f}s, "
+                                 f"replayed {len(self.subscriptions)} candle subscriptions")
+                return
+            except Exception as e:
+                attempt += 1
+                self.reconnect_failures += 1
+                self.logger.warning(f"Reconnect attempt {attempt} failed: {str(e)}")
+                if self.websocket_client.connected:
+                    await self.websocket_client.disconnect()
+                if self.max_reconnect_attempts is not None and attempt >= self.max_reconnect_attempts:
+                    self.logger.error(f"Giving up after {attempt} reconnect attempts")
+                    self.connected = False
+                    self.order_tracker.fail_all(ConnectionError(f"Reconnect failed after {attempt} attempts: {str(e)}"))
+                    return
+                delay = min(self.reconnect_max_delay, self.reconnect_base_delay * 2 ** (attempt - 1))
+                await asyncio.sleep(random.uniform(delay / 2, delay))
+
+    async def _restore_session(self, assets_timeout: float = 10.0):
+        """Re-authenticate, restore the trading mode and replay candle subscriptions on a new connection.
+        
+        The assets subscription is renewed too, and its response merged into
+        asset_registry, so payouts and assets deactivated during the outage
+        are current before the reconnect completes.
+        
+        Args:
+            assets_timeout: Maximum time to wait for the assets response in seconds.
+        """
+        is_demo = 1 if self.demo else 0
+        assets_ready = self.websocket_client.expect("assets")
+        if self.bootstrap_cache is not None and "assets" in self.bootstrap_cache.ttls:
+            assets_ready.add_done_callback(self._cache_response)
+        await self.websocket_client.send({
+            "action": "multipleAction",
+            "message": {
+                "actions": [
+                    {"action": "userGroup", "ns": str(uuid4()), "token": self.token},
+                    {"action": "profile", "ns": str(uuid4()), "token": self.token},
+                    {"action": "assets", "message": {"mode": ["vanilla"], "subscribeMode": ["vanilla"]},
+                     "ns": str(uuid4()), "token": self.token},
+                    {"action": "getCandlesTimeframes", "ns": str(uuid4()), "token": self.token},
+                    # Settlements pushed while disconnected are recovered from the open options and history
+                    {"action": "openOptions", "ns": str(uuid4()), "token": self.token},
+                    {"action": "tradeHistory", "message": {"index_from": 0, "count": 20, "is_demo": is_demo},
+                     "ns": str(uuid4()), "token": self.token}
+                ]
+            },
+            "token": self.token,
+            "ns": str(uuid4())
+        })
+        await self.set_trading_mode()
+        # One subscribeCandles per distinct timeframe set
+        groups: Dict[tuple, List[int]] = {}
+        for asset_id, timeframes in self.subscriptions.items():
+            groups.setdefault(tuple(timeframes), []).append(asset_id)
+        for timeframes, asset_ids in groups.items():
+            await self.websocket_client.send({
+                "action": "subscribeCandles",
+                "message": {"assetsIds": asset_ids, "timeframes": list(timeframes)},
+                "token": self.token,
+                "ns": str(uuid4())
+            })
+        try:
+            self.assets_data = await asyncio.wait_for(asyncio.shield(assets_ready), assets_timeout)
+            assets_list = (self.assets_data.get("message") or {}).get("assets", [])
+            if isinstance(assets_list, list):
+                self._merge_assets(assets_list)
+            else:
+                self.logger.error(f"Assets list is not a list: {assets_list}")
+        except asyncio.TimeoutError:
+            self.logger.warning(f"No assets response within {assets_timeout}s after reconnecting")
+
+    @property
+    def reconnect_metrics(self) -> Dict:
+        """Get reconnect statistics.
+        
+        Returns:
+            Dictionary with the number of reconnects and failed attempts, and
+            the last, mean and max time in seconds from drop to restored session.
+        """
+        latencies = list(self.reconnect_latencies)
+        return {
+            "reconnects": self.reconnect_count,
+            "failed_attempts": self.reconnect_failures,
+            "reconnecting": self._reconnect_task is not None and not self._reconnect_task.done(),
+            "last_latency": latencies[-1] if latencies else None,
+            "mean_latency": sum(latencies) / len(latencies) if latencies else None,
+            "max_latency": max(latencies) if latencies else None,
+        }
+
+    def metrics_snapshot(self) -> Dict:
+        """Get the client's latency and throughput metrics.
+        
+        Returns:
+            The WebSocketClient metrics (per-action request latency, timeouts
+            and errors, inbound and outbound frames and bytes, decode time),
+            plus per-action queue depths and drops, outstanding requests,
+            outbound frames, backlog and queueing delay per priority class,
+            request batching counts (when enabled), connect phase timings
+            and reconnect statistics.
+        """
+        client = self.websocket_client
+        return {
+            **client.metrics.snapshot(),
+            "queues": {action: {"depth": queue.qsize(), "dropped": queue.dropped}
+                       for action, queue in client.message_queue.items()},
+            "pending_requests": len(client.pending_requests),
+            "outbound": client.scheduler.snapshot(),
+            "batching": client.batcher.snapshot() if client.batcher is not None else None,
+            "connected": client.connected,
+            "connect_timings": dict(self.connect_timings),
+            "reconnect": self.reconnect_metrics,
+        }
+
+    def prometheus_metrics(self) -> str:
+        """Render the metrics in Prometheus text exposition format."""
+        client = self.websocket_client
+        metrics = client.metrics
+        writer = PrometheusWriter()
+        writer.histograms("request_latency_seconds", "Request to response latency by action.",
+                          (({"action": action}, histogram) for action, histogram in sorted(metrics.request_latency.items())))
+        writer.counter("request_timeouts_total", "Requests that timed out by action.", metrics.request_timeouts)
+        writer.counter("request_errors_total", "Requests failed by a lost connection by action.", metrics.request_errors)
+        writer.counter("recv_timeouts_total", "recv() calls that timed out by action.", metrics.recv_timeouts)
+        writer.counter("frames_received_total", "Inbound frames by action.", metrics.frames_received)
+        writer.counter("bytes_received_total", "Inbound bytes by action.", metrics.bytes_received)
+        writer.counter("frames_sent_total", "Outbound frames by action.", metrics.frames_sent)
+        writer.counter("bytes_sent_total", "Outbound bytes by action.", metrics.bytes_sent)
+        writer.histograms("decode_seconds", "Time to decode an inbound frame.", [({}, metrics.decode_time)])
+        writer.counter("decode_errors_total", "Inbound frames that failed to decode.", metrics.decode_errors)
+        family = writer.family("queue_depth", "gauge", "Messages waiting in each action queue.")
+        for action, queue in sorted(client.message_queue.items()):
+            writer.sample(family, queue.qsize(), {"action": action})
+        writer.counter("queue_dropped_total", "Messages dropped on queue overflow by action.",
+                       {action: queue.dropped for action, queue in client.message_queue.items()})
+        writer.gauge("pending_requests", "Requests waiting for a response.", len(client.pending_requests))
+        scheduler = client.scheduler
+        writer.histograms("outbound_queue_delay_seconds", "Time frames waited for the socket by priority class.",
+                          (({"priority": priority}, histogram) for priority, histogram in scheduler.queue_delay.items()))
+        family = writer.family("outbound_queue_depth", "gauge", "Frames waiting for the socket by priority class.")
+        for priority, depth in scheduler.depths().items():
+            writer.sample(family, depth, {"priority": priority})
+        writer.counter("outbound_frames_total", "Frames sent by priority class.", scheduler.sent, label="priority")
+        if client.batcher is not None:
+            writer.counter("batched_frames_total", "Frames carrying batched requests.", client.batcher.frames_sent)
+            writer.counter("batched_requests_total", "Requests sent through the batcher.", client.batcher.requests_sent)
+        writer.gauge("connected", "1 while the WebSocket is connected.", int(client.connected))
+        writer.counter("reconnects_total", "Successful reconnects.", self.reconnect_count)
+        writer.counter("reconnect_failures_total", "Failed reconnect attempts.", self.reconnect_failures)
+        return writer.render()
+
+    async def serve_metrics(self, host: str = "127.0.0.1", port: int = 9108) -> MetricsServer:
+        """Serve prometheus_metrics() over HTTP at ``/metrics``.
+        
+        Args:
+            host: Interface to listen on.
+            port: Port to listen on (0 picks a free port).
+        
+        Returns:
+            The started server; call close() to stop it.
+        """
+        return await MetricsServer(self.prometheus_metrics, host, port).start()
+
     async def _auto_ping(self):
         """Periodically send ping requests to keep the connection alive."""
         ping_channel = PingChannel(self)
         while self.connected:
+            if not self.websocket_client.connected:
+                # Reconnect in progress
+                await asyncio.sleep(1)
+                continue
             try:
                 await ping_channel.send(self, {})
                 self.logger.debug("Sent ping request")
@@ -222,32 +533,35 @@ class ExpertOptionAPI:
             self.logger.error(f"Failed to set trading mode: {str(e)}", exc_info=True)
             raise DataFetchError(f"Failed to set trading mode: {str(e)}")
 
-    async def fetch_profile(self):
-        """Fetch user profile data from the server."""
+    async def fetch_profile(self, refresh: bool = False):
+        """Fetch user profile data from the server.
+        
+        Args:
+            refresh: Request the profile even if one was already received (e.g. to read the balance after a trade).
+        """
         try:
-            if self.profile_data:
-                profile_data = self.profile_data.get("message", {}).get("profile", {})
-                self.profile.demo_balance = profile_data.get("demo_balance", 0.0)
-                self.profile.real_balance = profile_data.get("balance", 0.0)
-                self.profile.user_id = profile_data.get("id")
-                self.profile.nickname = profile_data.get("name")
+            if self.profile_data and not refresh:
+                self._apply_profile(self.profile_data.get("message"))
                 self.logger.info("User profile data fetched from cache")
             else:
                 payload = {"action": "profile", "message": None, "ns": str(uuid4()), "token": self.token}
                 self.logger.debug(f"Sending profile payload: {json.dumps(payload, indent=2)}")
-                await self.websocket_client.send(payload)
-                response = await self.websocket_client.recv("profile", timeout=20.0)
+                response = await self.websocket_client.request(payload, timeout=20.0)
                 self.profile_data = response
-                profile_data = response.get("message", {}).get("profile", {})
-                self.profile.demo_balance = profile_data.get("demo_balance", 0.0)
-                self.profile.real_balance = profile_data.get("balance", 0.0)
-                self.profile.user_id = profile_data.get("id")
-                self.profile.nickname = profile_data.get("name")
+                self._apply_profile(response.get("message"))
                 self.logger.info("User profile data fetched successfully")
         except Exception as e:
             self.logger.error(f"Failed to fetch profile data: {str(e)}", exc_info=True)
             raise DataFetchError(f"Failed to fetch profile data: {str(e)}")
 
+    def _apply_profile(self, message: Optional[Dict]):
+        """Copy the fields of a profile message body onto the Profile object."""
+        profile = (message or {}).get("profile") or {}
+        self.profile.demo_balance = profile.get("demo_balance", 0.0)
+        self.profile.real_balance = profile.get("balance", 0.0)
+        self.profile.user_id = profile.get("id")
+        self.profile.nickname = profile.get("name")
+
     async def fetch_assets(self):
         """Fetch available assets data from the server (fallback)."""
         try:
@@ -258,21 +572,30 @@ class ExpertOptionAPI:
                 "token": self.token
             }
             self.logger.debug(f"Sending assets payload: {json.dumps(payload, indent=2)}")
-            await self.websocket_client.send(payload)
-            await asyncio.sleep(0.5)
-            response = await self.websocket_client.recv("assets", timeout=30.0)
+            response = await self.websocket_client.request(payload, timeout=30.0)
             self.assets_data = response
-            # Merge new assets with existing ones
-            assets_list = response.get("message", {}).get("assets", [])
-            for asset in assets_list:
-                if asset.get("is_active") == 1:
-                    self.active_assets[asset["id"]] = asset
-            self.logger.info(f"Merged {len(assets_list)} assets, total active assets: {len(self.active_assets)}")
-            self.logger.debug(f"Active asset IDs: {list(self.active_assets.keys())}")
+            self._merge_assets(response.get("message", {}).get("assets", []))
         except Exception as e:
             self.logger.error(f"Failed to fetch assets data: {str(e)}", exc_info=True)
             raise DataFetchError(f"Failed to fetch assets data: {str(e)}")
 
+    def _merge_assets(self, assets_list: List[Dict]):
+        """Apply the assets of an assets response to asset_registry."""
+        self.asset_registry.update(assets_list)
+        self.logger.info(f"Merged {len(assets_list)} assets, total active assets: {len(self.active_assets)}")
+        self.logger.debug(f"Active asset IDs: {list(self.active_assets.keys())}")
+
+    def _cache_response(self, future: asyncio.Future):
+        """Store a startup response in bootstrap_cache."""
+        if not future.cancelled() and future.exception() is None:
+            data = future.result()
+            if isinstance(data.get("message"), dict):
+                self.bootstrap_cache.put(data["action"], data["message"])
+
+    def get_assets_map(self) -> Dict[str, int]:
+        """Get the server symbol of each active asset mapped to its ID."""
+        return self.symbols.symbols()
+
     def get_balance(self) -> float:
         """Get the current account balance.
         
@@ -304,6 +627,7 @@ class ExpertOptionAPI:
             
             candles_channel = CandlesChannel(self)
             response = await candles_channel(asset_id, timeframes)
+            self.subscriptions[asset_id] = list(timeframes) if isinstance(timeframes, (list, tuple)) else [timeframes]
             self.logger.debug(f"Candle response for asset ID {asset_id}: {response}")
             
             candle_data = response.get("message", {})
@@ -319,6 +643,30 @@ class ExpertOptionAPI:
             self.logger.error(f"Failed to fetch candle data for asset ID {asset_id}: {str(e)}", exc_info=True)
             raise DataFetchError(f"Failed to fetch candle data: {str(e)}")
 
+    async def subscribe_many(self, asset_ids: Iterable[int], timeframes: List[int] = [0, 5]) -> Dict[int, Optional[Dict]]:
+        """Subscribe to many assets concurrently.
+        
+        With batching enabled, the subscriptions go out in a few multipleAction
+        frames instead of one frame each.
+        
+        Args:
+            asset_ids: IDs of the assets.
+            timeframes: List of timeframes for every asset.
+        
+        Returns:
+            Mapping of asset ID to candle data, or None if the subscription failed.
+        """
+        asset_ids = list(asset_ids)
+        responses = await asyncio.gather(*(self.get_candles(asset_id, timeframes) for asset_id in asset_ids),
+                                         return_exceptions=True)
+        results = {}
+        for asset_id, response in zip(asset_ids, responses):
+            if isinstance(response, Exception):
+                self.logger.error(f"Failed to subscribe to asset ID {asset_id}: {str(response)}")
+                response = None
+            results[asset_id] = response
+        return results
+
     async def place_order(self, asset_id: int, amount: float, direction: str = "call") -> int:
         """Place a trading order.
         
@@ -339,25 +687,16 @@ class ExpertOptionAPI:
             if not validate_asset_id(asset_id, self.active_assets):
                 raise InvalidAssetError(f"Asset ID {asset_id} is not active")
             
-            await self.get_candles(asset_id)
-            candle_data = self.candle_cache.get(asset_id, {})
-            self.logger.debug(f"Candle data for placing order: {candle_data}")
-            
-            exp_times = self.active_assets.get(asset_id, {}).get("rates", [{}])[0].get("expirations", [])
-            server_time = candle_data.get("candles", [{}])[0].get("t", int(time.time()))
-            
-            if not exp_times:
-                self.logger.warning("No valid expiration times found, using fallback")
-                exp_time = int(time.time()) + 60  # Fallback to 1 minute from now
-            else:
-                exp_time = get_next_expiration_time(exp_times, server_time)
+            server_time = await self._get_server_time()
+            exp_time = self._get_expiration_time(asset_id, server_time)
             
             buy_channel = BuyChannel(self)
-            response = await buy_channel(asset_id, amount, direction, exp_time, self.demo)
+            response = await buy_channel(asset_id, amount, direction, exp_time, self.demo, strike_time=server_time)
             options = response.get("message", {}).get("options", [])
             if options:
                 order_id = options[0].get("id")
-                order = Order()
+                # The order tracker may already have cached this order from the same response
+                order = self.order_cache.get(order_id) or Order()
                 order.order_id = order_id
                 order.asset_id = asset_id
                 order.amount = amount
@@ -372,6 +711,141 @@ class ExpertOptionAPI:
             self.logger.error(f"Failed to place order for asset ID {asset_id}: {str(e)}", exc_info=True)
             raise OrderPlacementError(f"Failed to place order: {str(e)}")
 
+    async def place_orders(self, legs: List[Dict], max_legs_per_frame: int = 20) -> List[Optional[Order]]:
+        """Place several orders, packing the legs into as few expertOption frames as possible.
+        
+        Each leg is a dict with 'asset_id', 'amount', and optionally 'direction'
+        (defaults to "call") and 'exp_time' (defaults to the next expiration of
+        the asset). Frames are sent concurrently.
+        
+        Args:
+            legs: The orders to place.
+            max_legs_per_frame: Maximum number of legs sent in one frame.
+        
+        Returns:
+            One entry per leg, in order: the placed Order, or None if the leg
+            was rejected or its frame failed.
+        """
+        results: List[Optional[Order]] = [None] * len(legs)
+        if not legs:
+            return results
+        # Independent of the legs: a synced clock costs nothing, otherwise one ping
+        server_time = await self._get_server_time()
+        options = []
+        indexes = []
+        for index, leg in enumerate(legs):
+            asset_id = leg["asset_id"]
+            if not validate_asset_id(asset_id, self.active_assets):
+                self.logger.error(f"Skipping order leg {index}: asset ID {asset_id} is not active")
+                continue
+            exp_time = leg.get("exp_time") or self._get_expiration_time(asset_id, server_time)
+            options.append(BuyChannel.build_option(asset_id, leg["amount"], leg.get("direction", "call"),
+                                                   exp_time, self.demo, strike_time=server_time))
+            indexes.append(index)
+        
+        frames = [(options[i:i + max_legs_per_frame], indexes[i:i + max_legs_per_frame])
+                  for i in range(0, len(options), max_legs_per_frame)]
+        buy_channel = BuyChannel(self)
+        responses = await asyncio.gather(*(buy_channel.send_options(frame_options) for frame_options, _ in frames),
+                                         return_exceptions=True)
+        for (frame_options, frame_indexes), response in zip(frames, responses):
+            if isinstance(response, Exception):
+                self.logger.error(f"Failed to place order frame with {len(frame_options)} legs: {str(response)}")
+                continue
+            returned = response.get("message", {}).get("options", [])
+            for position, opt in self._match_options(frame_options, returned):
+                order = self.order_cache.get(opt.get("id")) or Order()
+                order.order_id = opt.get("id")
+                order.asset_id = frame_options[position]["asset_id"]
+                order.amount = frame_options[position]["amount"]
+                order.direction = frame_options[position]["direction"]
+                order.strike_time = server_time
+                order.exp_time = frame_options[position]["expired"]
+                self.order_cache[order.order_id] = order
+                results[frame_indexes[position]] = order
+        self.logger.info(f"Placed {sum(1 for r in results if r is not None)}/{len(legs)} orders in {len(frames)} frames")
+        return results
+
+    @staticmethod
+    def _match_options(sent: List[Dict], returned: List[Dict]) -> List[tuple]:
+        """Map options returned by the server back to the positions of the sent legs.
+        
+        Options are matched on asset, direction, amount and expiration; if the
+        server omits those fields, a response with one option per leg is
+        matched by position.
+        
+        Returns:
+            List of (position in sent, returned option) pairs.
+        """
+        def key(opt):
+            return (opt.get("asset_id"), opt.get("direction"), opt.get("amount"), opt.get("expired"))
+        
+        waiting: Dict[tuple, List[int]] = {}
+        for position, opt in enumerate(sent):
+            waiting.setdefault(key(opt), []).append(position)
+        matched = []
+        for opt in returned:
+            positions = waiting.get(key(opt))
+            if positions:
+                matched.append((positions.pop(0), opt))
+        if not matched and len(returned) == len(sent):
+            matched = list(enumerate(returned))
+        return matched
+
+    async def _get_server_time(self) -> int:
+        """Get the current server time, reading it from a ping reply if the clock is not synced.
+        
+        A ping subscribes to nothing, so this is safe on the order connection
+        of a ConnectionPool. The receive loop feeds the reply's timestamp to
+        server_clock; without one, the local clock is used.
+        
+        Returns:
+            The server time (Unix timestamp).
+        """
+        if self.server_clock.synced:
+            return self.server_clock.server_time()
+        try:
+            await PingChannel(self)()
+        except (asyncio.TimeoutError, ConnectionError) as e:
+            self.logger.warning(f"Ping for the server time failed: {str(e)}")
+        if not self.server_clock.synced:
+            self.logger.warning("Server clock not synced, using the local clock")
+        return self.server_clock.server_time()
+
+    def _get_expiration_time(self, asset_id: int, server_time: int) -> int:
+        """Pick the next expiration time offered for an asset.
+        
+        Args:
+            asset_id: The ID of the asset.
+            server_time: Current server time.
+        
+        Returns:
+            The expiration time (Unix timestamp).
+        """
+        exp_times = self.active_assets.get(asset_id, {}).get("rates", [{}])[0].get("expirations", [])
+        if not exp_times:
+            self.logger.warning("No valid expiration times found, using fallback")
+            return int(time.time()) + 60  # Fallback to 1 minute from now
+        return get_next_expiration_time(exp_times, server_time)
+
+    async def wait_settled(self, order_id: int, timeout: Optional[float] = None) -> Order:
+        """Wait until a trading order settles.
+        
+        Settlement is pushed by the order tracker as order messages arrive, so
+        any number of orders can be awaited concurrently without polling.
+        
+        Args:
+            order_id: The ID of the order.
+            timeout: Maximum time to wait, or None to wait indefinitely.
+        
+        Returns:
+            The settled order with its final status and profit.
+        
+        Raises:
+            asyncio.TimeoutError: If the order does not settle within the timeout.
+        """
+        return await self.order_tracker.wait_settled(order_id, timeout)
+
     async def check_order_status(self, order_id: int, timeout: float = 60.0) -> Optional[Order]:
         """Check the status of a trading order.
         
@@ -380,27 +854,13 @@ class ExpertOptionAPI:
             timeout: Maximum time to wait for the result.
         
         Returns:
-            The order object with updated status and profit.
+            The order object with updated status and profit, or None if it did not settle in time.
         """
         try:
-            start_time = time.time()
-            while time.time() - start_time < timeout:
-                try:
-                    response = await self.websocket_client.recv("expertOption", timeout=1.0)
-                    options = response.get("message", {}).get("options", [])
-                    for opt in options:
-                        if opt.get("id") == order_id:
-                            order = self.order_cache.get(order_id, Order())
-                            order.status = opt.get("status")
-                            order.profit = opt.get("profit", 0)
-                            self.logger.info(f"Order status for ID {order_id}: {opt}")
-                            return order
-                    await asyncio.sleep(1)
-                except asyncio.TimeoutError:
-                    continue
-                except Exception as e:
-                    self.logger.error(f"Error checking order status for ID {order_id}: {str(e)}", exc_info=True)
-                    return None
+            order = await self.wait_settled(order_id, timeout)
+            self.logger.info(f"Order ID {order_id} settled with status {order.status}, profit {order.profit}")
+            return order
+        except asyncio.TimeoutError:
             self.logger.warning(f"Order ID {order_id} did not resolve within {timeout} seconds")
             return None
         except Exception as e:
@@ -410,8 +870,11 @@ class ExpertOptionAPI:
     async def place_order_by_symbol(self, symbol: str, amount: float, direction: str = "call") -> int:
         """Place a trading order using the asset symbol.
         
+        The symbol is resolved through the live symbol table, ignoring case
+        and separators; the asset's name works too.
+        
         Args:
-            symbol: The symbol of the asset (e.g., 'BTCUSD').
+            symbol: The symbol of the asset (e.g., 'BTCUSD', 'eurusd_otc').
             amount: The amount to invest.
             direction: Trade direction ("call" or "put").
         
@@ -422,20 +885,25 @@ class ExpertOptionAPI:
             InvalidAssetError: If the symbol is invalid.
         """
         try:
-            if not validate_symbol(symbol):
+            asset_id = self.symbols.resolve(symbol)
+            if asset_id is None:
                 raise InvalidAssetError(f"Symbol {symbol} not found")
-            asset_id = get_asset_id(symbol)
             return await self.place_order(asset_id, amount, direction)
         except Exception as e:
             self.logger.error(f"Failed to place order by symbol {symbol}: {str(e)}", exc_info=True)
             raise InvalidAssetError(f"Failed to place order by symbol: {str(e)}")
 
-    async def get_historical_candles(self, asset_id: int, periods: List[List[int]]) -> Dict:
+    async def get_historical_candles(self, asset_id: int, periods: List[List[int]], timeframe: int = 5,
+                                     timeout: float = 20.0) -> Dict:
         """Fetch historical candle data for a specific asset.
         
+        For ranges larger than one server response, use Expert.backfill.HistoryBackfill.
+        
         Args:
             asset_id: The ID of the asset.
             periods: List of time periods [[start, end], ...] in Unix timestamps.
+            timeframe: Candle timeframe in seconds.
+            timeout: Maximum time to wait for the response.
         
         Returns:
             The historical candle data.
@@ -449,20 +917,8 @@ class ExpertOptionAPI:
                 self.logger.error(f"Asset ID {asset_id} not found in active assets: {list(self.active_assets.keys())}")
                 raise InvalidAssetError(f"Asset ID {asset_id} is not active")
             
-            payload = {
-                "action": "assetHistoryCandles",
-                "message": {
-                    "assetid": asset_id,
-                    "periods": periods,
-                    "timeframes": [5]
-                },
-                "token": self.token,
-                "ns": str(uuid4())
-            }
-            self.logger.debug(f"Sending historical candles request: {json.dumps(payload, indent=2)}")
-            await self.websocket_client.send(payload)
-            response = await self.websocket_client.recv("assetHistoryCandles", timeout=20.0)
-            self.logger.debug(f"Received historical candles response: {response}")
+            history_channel = HistoryChannel(self)
+            response = await history_channel(asset_id, periods, timeframe, timeout=timeout)
             
             candle_data = response.get("message", {})
             if not isinstance(candle_data, dict) or "candles" not in candle_data:
@@ -0,0 +1,374 @@
+"""On-disk candle archive with memory-mapped reads."""
+import asyncio
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from Expert.ws.messages import CandleSeries
+
+# One fixed-width 40-byte record per candle
+RECORD_DTYPE = np.dtype([("t", "<i8"), ("open", "<f8"), ("high", "<f8"), ("low", "<f8"), ("close", "<f8")])
+
+class CandleArchive:
+    """Append-only candle files, one per (asset_id, timeframe).
+
+    Each ``<asset_id>_<timeframe>.candles`` file holds RECORD_DTYPE records
+    in timestamp order, next to a small JSON index with the record count and
+    the first and last timestamps. New candles are appended; a candle with
+    the latest timestamp (the still-open live candle) is updated in place,
+    as are repeated older candles. Only older candles missing from the file,
+    as a backfill of an earlier range produces, are merged by rewriting the
+    file once.
+
+    Reads return read-only ``np.memmap`` slices located by binary search, so
+    no candle data is copied or parsed. The JSON indexes are written by
+    flush(), which attach() runs every ``flush_interval`` seconds, and by
+    close().
+
+    Ticks (timeframe 0) are not archived: the ticks of one period share a
+    timestamp, so they cannot be keyed by it.
+    """
+
+    def __init__(self, root: str, flush_interval: float = 1.0):
+        """Initialize the archive.
+        
+        Args:
+            root: Directory holding the archive files (created if missing).
+            flush_interval: Seconds between writes of queued live candles and index flushes after attach().
+        """
+        self.root = root
+        self.flush_interval = flush_interval
+        self.logger = logging.getLogger("CandleArchive")
+        os.makedirs(root, exist_ok=True)
+        self._files = {}
+        self._index: Dict[Tuple[int, int], Dict] = {}
+        self._dirty = set()
+        # Serializes file access between the event loop and the writer thread
+        self._lock = threading.RLock()
+        self._queued: List[CandleSeries] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._stores = []
+
+    def _path(self, asset_id: int, timeframe: int) -> str:
+        return os.path.join(self.root, f"{asset_id}_{timeframe}.candles")
+
+    def _load_index(self, key: Tuple[int, int]) -> Dict:
+        """Get the index of a file, rebuilding it if it does not match the file."""
+        index = self._index.get(key)
+        if index is not None:
+            return index
+        path = self._path(*key)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        count = size // RECORD_DTYPE.itemsize
+        if size % RECORD_DTYPE.itemsize:
+            # Drop a record torn by a crash mid-write
+            self.logger.warning(f"Truncating partial record in {path}")
+            with open(path, "r+b") as f:
+                f.truncate(count * RECORD_DTYPE.itemsize)
+        try:
+            with open(path + ".idx", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = None
+        if index is None or index.get("count") != count:
+            index = {"count": count, "first": None, "last": None}
+            if count:
+                records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", shape=(count,))
+                index["first"], index["last"] = int(records["t"][0]), int(records["t"][-1])
+                del records
+        self._index[key] = index
+        return index
+
+    def _file(self, key: Tuple[int, int]):
+        """Get the open read/write handle of a file."""
+        handle = self._files.get(key)
+        if handle is None:
+            path = self._path(*key)
+            handle = self._files[key] = open(path, "r+b" if os.path.exists(path) else "w+b")
+        return handle
+
+    def keys(self):
+        """Get the (asset_id, timeframe) pairs stored in the archive."""
+        keys = set(self._index)
+        for name in os.listdir(self.root):
+            if name.endswith(".candles"):
+                asset_id, timeframe = name[:-len(".candles")].split("_")
+                keys.add((int(asset_id), int(timeframe)))
+        return sorted(keys)
+
+    def range(self, asset_id: int, timeframe: int) -> Optional[Tuple[int, int]]:
+        """Get the first and last archived timestamps, or None if nothing is archived."""
+        index = self._load_index((asset_id, timeframe))
+        return (index["first"], index["last"]) if index["count"] else None
+
+    def write(self, asset_id: int, timeframe: int, timestamps: np.ndarray, ohlc: np.ndarray) -> int:
+        """Write candles, oldest first.
+        
+        Args:
+            asset_id: The ID of the asset.
+            timeframe: Candle timeframe in seconds.
+            timestamps: Candle start times of shape (n,).
+            ohlc: Open, high, low and close prices of shape (n, 4).
+        
+        Returns:
+            The number of candles appended or updated.
+        """
+        if not len(timestamps):
+            return 0
+        with self._lock:
+            return self._write(asset_id, timeframe, timestamps, ohlc)
+
+    def _write(self, asset_id: int, timeframe: int, timestamps: np.ndarray, ohlc: np.ndarray) -> int:
+        key = (asset_id, timeframe)
+        index = self._load_index(key)
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        ohlc = np.asarray(ohlc, dtype=np.float64)
+        written = 0
+        if index["count"]:
+            older = timestamps < index["last"]
+            if older.any():
+                written += self._write_older(key, timestamps[older], ohlc[older])
+                timestamps, ohlc = timestamps[~older], ohlc[~older]
+                index = self._index[key]
+            latest = timestamps == index["last"]
+            if latest.any():
+                # Update the still-open candle in place
+                handle = self._file(key)
+                handle.seek((index["count"] - 1) * RECORD_DTYPE.itemsize)
+                handle.write(self._records(timestamps[latest][-1:], ohlc[latest][-1:]).tobytes())
+                timestamps, ohlc = timestamps[~latest], ohlc[~latest]
+                written += 1
+        if len(timestamps):
+            handle = self._file(key)
+            # Keep the last update of each candle
+            keep = np.concatenate((np.diff(timestamps) > 0, [True]))
+            records = self._records(timestamps[keep], ohlc[keep])
+            handle.seek(index["count"] * RECORD_DTYPE.itemsize)
+            handle.write(records.tobytes())
+            if not index["count"]:
+                index["first"] = int(records["t"][0])
+            index["count"] += len(records)
+            index["last"] = int(records["t"][-1])
+            written += len(records)
+        self._dirty.add(key)
+        return written
+
+    @staticmethod
+    def _records(timestamps: np.ndarray, ohlc: np.ndarray) -> np.ndarray:
+        records = np.empty(len(timestamps), dtype=RECORD_DTYPE)
+        records["t"] = timestamps
+        ohlc = np.asarray(ohlc, dtype=np.float64)
+        records["open"], records["high"], records["low"], records["close"] = ohlc.T
+        return records
+
+    def _write_older(self, key: Tuple[int, int], timestamps: np.ndarray, ohlc: np.ndarray) -> int:
+        """Write candles older than the last archived one.
+        
+        Archived candles are updated in place; only the missing ones are
+        merged by rewriting the file.
+        
+        Returns:
+            The number of candles updated or added.
+        """
+        self._sync(key)
+        count = self._index[key]["count"]
+        records = np.memmap(self._path(*key), dtype=RECORD_DTYPE, mode="r+", shape=(count,))
+        positions = np.searchsorted(records["t"], timestamps, side="left")
+        present = records["t"][positions] == timestamps
+        if present.any():
+            records[positions[present]] = self._records(timestamps[present], ohlc[present])
+            records.flush()
+        del records
+        written = int(present.sum())
+        if not present.all():
+            written += self._merge(key, timestamps[~present], ohlc[~present])
+        return written
+
+    def _merge(self, key: Tuple[int, int], timestamps: np.ndarray, ohlc: np.ndarray) -> int:
+        """Merge candles that overlap or precede the archived range by rewriting the file."""
+        self._sync(key)
+        existing = np.array(self.read(*key))
+        incoming = self._records(timestamps, ohlc)
+        merged = np.concatenate([existing, incoming])
+        # Keep the newest record for each timestamp (incoming wins over archived)
+        order = np.argsort(merged["t"], kind="stable")[::-1]
+        _, first = np.unique(merged["t"][order], return_index=True)
+        merged = merged[order][first]
+        handle = self._files.pop(key, None)
+        if handle is not None:
+            handle.close()
+        path = self._path(*key)
+        with open(path + ".tmp", "wb") as f:
+            f.write(merged.tobytes())
+        os.replace(path + ".tmp", path)
+        self._index[key] = {"count": len(merged), "first": int(merged["t"][0]), "last": int(merged["t"][-1])}
+        self._dirty.add(key)
+        return len(merged) - len(existing)
+
+    def write_series(self, series: CandleSeries) -> int:
+        """Write a decoded candle series (e.g. from a backfill or a live push); tick series are skipped."""
+        if series.asset_id is None or series.timeframe == 0:
+            return 0
+        return self.write(series.asset_id, series.timeframe, series.timestamps, series.ohlc)
+
+    def read(self, asset_id: int, timeframe: int, start: Optional[int] = None,
+             end: Optional[int] = None) -> np.ndarray:
+        """Read archived candles in a time range without copying.
+        
+        Args:
+            asset_id: The ID of the asset.
+            timeframe: Candle timeframe in seconds.
+            start: Range start (inclusive), or None for the beginning.
+            end: Range end (exclusive), or None for the end.
+        
+        Returns:
+            Read-only structured array with fields t, open, high, low and close.
+        """
+        key = (asset_id, timeframe)
+        with self._lock:
+            self._sync(key)
+            index = self._load_index(key)
+            if not index["count"]:
+                return np.empty(0, dtype=RECORD_DTYPE)
+            records = np.memmap(self._path(*key), dtype=RECORD_DTYPE, mode="r", shape=(index["count"],))
+        times = records["t"]
+        lo = 0 if start is None else int(np.searchsorted(times, start, side="left"))
+        hi = len(records) if end is None else int(np.searchsorted(times, end, side="left"))
+        return records[lo:hi]
+
+    def attach(self, store):
+        """Archive every candle series ingested by a CandleStore.
+        
+        Called from a running event loop, pushed series are only queued by
+        the store's listener; a background task writes them in batches on a
+        worker thread every ``flush_interval`` seconds and then flushes the
+        indexes, so no file I/O runs in the WebSocket receive loop. Without
+        a running loop, series are written as they are ingested.
+        """
+        store.add_listener(self._enqueue)
+        self._stores.append(store)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._writer is None or self._writer.done():
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="CandleArchive")
+            self._writer = loop.create_task(self._run_writer())
+
+    def detach(self, store):
+        """Stop archiving a CandleStore attached with attach().
+        
+        Series already queued are still written.
+        """
+        store.remove_listener(self._enqueue)
+        if store in self._stores:
+            self._stores.remove(store)
+
+    def _enqueue(self, series: CandleSeries):
+        """CandleStore listener: queue a series for the writer task, or write it if there is none."""
+        if series.asset_id is None or not series.timeframe:
+            return
+        if self._writer is None:
+            self.write_series(series)
+        else:
+            self._queued.append(series)
+
+    async def _run_writer(self):
+        """Write queued series and flush the indexes every flush_interval seconds."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            batch, self._queued = self._queued, []
+            try:
+                await loop.run_in_executor(self._executor, self._write_batch, batch)
+            except Exception as e:
+                self.logger.error(f"Failed to archive {len(batch)} candle series: {str(e)}", exc_info=True)
+            if not self._stores and not self._queued:
+                self._writer = None
+                return
+
+    def _write_batch(self, batch: List[CandleSeries]):
+        """Write queued series, one write per file, then flush the indexes."""
+        grouped: Dict[Tuple[int, int], List[CandleSeries]] = {}
+        for series in batch:
+            grouped.setdefault((series.asset_id, series.timeframe), []).append(series)
+        for (asset_id, timeframe), parts in grouped.items():
+            timestamps = np.concatenate([part.timestamps for part in parts])
+            ohlc = np.concatenate([part.ohlc for part in parts])
+            # Pushes arrive in time order; sort anyway so one late push cannot force a merge per candle
+            order = np.argsort(timestamps, kind="stable")
+            self.write(asset_id, timeframe, timestamps[order], ohlc[order])
+        self.flush()
+
+    async def backfill(self, backfill, asset_id: int, timeframe: int, start: int, end: Optional[int] = None) -> int:
+        """Download the parts of a range that are not archived yet.
+        
+        Args:
+            backfill: A HistoryBackfill used to download missing candles.
+            asset_id: The ID of the asset.
+            timeframe: Candle timeframe in seconds.
+            start: Range start (Unix timestamp, inclusive).
+            end: Range end (Unix timestamp, exclusive; defaults to now).
+        
+        Returns:
+            The number of candles written.
+        """
+        archived = self.range(asset_id, timeframe)
+        gaps = [(start, end)]
+        if archived is not None:
+            first, last = archived
+            gaps = [(start, min(first, end) if end is not None else first)]
+            gaps.append((last + timeframe, end))
+        written = 0
+        for gap_start, gap_end in gaps:
+            if gap_end is not None and gap_start >= gap_end:
+                continue
+            series = await backfill.fetch_range(asset_id, timeframe, gap_start, gap_end)
+            written += self.write_series(series)
+        self.flush()
+        return written
+
+    def _sync(self, key: Tuple[int, int]):
+        """Flush buffered record writes of a file so memory maps see them."""
+        handle = self._files.get(key)
+        if handle is not None:
+            handle.flush()
+
+    def flush(self, key: Optional[Tuple[int, int]] = None):
+        """Flush pending writes and indexes to disk.
+        
+        Args:
+            key: The (asset_id, timeframe) to flush, or None for all.
+        """
+        with self._lock:
+            for dirty in ([key] if key is not None else list(self._dirty)):
+                if dirty not in self._dirty:
+                    continue
+                self._sync(dirty)
+                path = self._path(*dirty)
+                with open(path + ".idx.tmp", "w", encoding="utf-8") as f:
+                    json.dump(self._index[dirty], f)
+                os.replace(path + ".idx.tmp", path + ".idx")
+                self._dirty.discard(dirty)
+
+    def close(self):
+        """Write queued live candles, flush and close every open file, and stop the writer."""
+        for store in list(self._stores):
+            self.detach(store)
+        if self._writer is not None:
+            self._writer.cancel()
+            self._writer = None
+        with self._lock:
+            batch, self._queued = self._queued, []
+            self._write_batch(batch)
+            for handle in self._files.values():
+                handle.close()
+            self._files.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
\ No newline at end of file
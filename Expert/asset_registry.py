@@ -0,0 +1,183 @@
+"""Indexed registry of the assets announced by the server."""
+import bisect
+import logging
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+from Expert.symbols import resolution_rank
+from Expert.utils import normalize_symbol
+from Expert.ws.messages import AssetInfo
+
+class AssetRegistry:
+    """Assets by ID, kept current from ``assets`` messages.
+
+    Every update is applied incrementally: an asset's raw dictionary is
+    merged with the fields pushed for it, so partial pushes work, and an
+    asset whose ``is_active`` turns 0 leaves the active indexes. Secondary
+    indexes by group, payout bucket and normalized symbol, and payout-ranked
+    lists of active assets (overall and per group), are updated with each
+    change, so queries never scan every asset.
+    """
+
+    def __init__(self, payout_bucket_size: int = 5):
+        """Initialize an empty registry.
+        
+        Args:
+            payout_bucket_size: Width of the payout buckets in percentage points.
+        """
+        self.payout_bucket_size = payout_bucket_size
+        self.logger = logging.getLogger("AssetRegistry")
+        self.assets: Dict[int, AssetInfo] = {}
+        # Raw dictionaries of the active assets, exposed as ExpertOptionAPI.active_assets
+        self.active: Dict[int, Dict] = {}
+        self._raw: Dict[int, Dict] = {}
+        self._by_group: Dict[Hashable, Set[int]] = {}
+        self._by_bucket: Dict[int, Set[int]] = {}
+        self._by_symbol: Dict[str, Set[int]] = {}
+        # (-payout, asset ID) of active assets in ascending order, overall and per group
+        self._ranked: List[Tuple[float, int]] = []
+        self._ranked_by_group: Dict[Hashable, List[Tuple[float, int]]] = {}
+        self._listeners: List[Callable[[List[AssetInfo]], None]] = []
+
+    def __len__(self) -> int:
+        return len(self.assets)
+
+    def __contains__(self, asset_id: int) -> bool:
+        return asset_id in self.assets
+
+    def add_listener(self, listener: Callable[[List[AssetInfo]], None]):
+        """Register a callback invoked with the added or changed assets of every update."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[List[AssetInfo]], None]):
+        """Unregister a callback added with add_listener()."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def apply(self, message: Optional[Dict]) -> List[AssetInfo]:
+        """Apply the ``message`` field of an ``assets`` message.
+        
+        Returns:
+            The assets that were added or changed.
+        """
+        if not isinstance(message, dict):
+            return []
+        return self.update(message.get("assets") or [])
+
+    def update(self, assets: Iterable[Dict]) -> List[AssetInfo]:
+        """Add or update assets from their raw dictionaries.
+        
+        Args:
+            assets: Raw asset dictionaries, complete or holding only the changed fields.
+        
+        Returns:
+            The assets that were added or changed.
+        """
+        changed = []
+        for raw in assets:
+            if not isinstance(raw, dict) or raw.get("id") is None:
+                continue
+            asset_id = raw["id"]
+            previous = self._raw.get(asset_id)
+            merged = {**previous, **raw} if previous is not None else raw
+            if merged == previous:
+                continue
+            old = self.assets.get(asset_id)
+            if old is not None:
+                self._unindex(old)
+            info = AssetInfo.from_dict(merged)
+            self._raw[asset_id] = merged
+            self.assets[asset_id] = info
+            self._index(info, merged)
+            changed.append(info)
+        if changed:
+            self.logger.debug(f"Updated {len(changed)} assets, {len(self.active)} of {len(self.assets)} active")
+            for listener in list(self._listeners):
+                try:
+                    listener(changed)
+                except Exception as e:
+                    self.logger.error(f"Asset listener failed: {str(e)}", exc_info=True)
+        return changed
+
+    def _bucket(self, profit: Optional[float]) -> int:
+        return int((profit or 0) // self.payout_bucket_size) * self.payout_bucket_size
+
+    def _index(self, info: AssetInfo, raw: Dict):
+        self._by_group.setdefault(info.group_id, set()).add(info.id)
+        if info.symbol:
+            self._by_symbol.setdefault(normalize_symbol(info.symbol), set()).add(info.id)
+        if info.is_active:
+            self.active[info.id] = raw
+            self._by_bucket.setdefault(self._bucket(info.profit), set()).add(info.id)
+            key = (-(info.profit or 0), info.id)
+            bisect.insort(self._ranked, key)
+            bisect.insort(self._ranked_by_group.setdefault(info.group_id, []), key)
+
+    def _unindex(self, info: AssetInfo):
+        self._by_group[info.group_id].discard(info.id)
+        if info.symbol:
+            symbol = normalize_symbol(info.symbol)
+            self._by_symbol[symbol].discard(info.id)
+            if not self._by_symbol[symbol]:
+                del self._by_symbol[symbol]
+        if info.is_active:
+            del self.active[info.id]
+            self._by_bucket[self._bucket(info.profit)].discard(info.id)
+            key = (-(info.profit or 0), info.id)
+            for ranked in (self._ranked, self._ranked_by_group[info.group_id]):
+                del ranked[bisect.bisect_left(ranked, key)]
+
+    def get(self, asset_id: int) -> Optional[AssetInfo]:
+        """Get an asset by ID, active or not."""
+        return self.assets.get(asset_id)
+
+    def by_symbol(self, symbol: str) -> Optional[AssetInfo]:
+        """Get an asset by symbol, ignoring case and separators (``eur/usd`` matches ``EURUSD``).
+        
+        When several assets share the symbol, the one SymbolTable would
+        resolve it to wins (see symbols.resolution_rank).
+        """
+        ids = self._by_symbol.get(normalize_symbol(symbol))
+        if not ids:
+            return None
+        return self.assets[min(ids, key=lambda i: resolution_rank(i, bool(self.assets[i].is_active), True))]
+
+    @property
+    def groups(self) -> List[Hashable]:
+        """Get the group IDs of the known assets."""
+        return [group for group, ids in self._by_group.items() if ids]
+
+    def group(self, group_id: Hashable, active_only: bool = True) -> List[AssetInfo]:
+        """Get the assets of a group.
+        
+        Args:
+            group_id: The ``asset_group_id`` of the group.
+            active_only: Leave out inactive assets.
+        """
+        return [self.assets[i] for i in self._by_group.get(group_id, ()) if not active_only or self.assets[i].is_active]
+
+    def payout_bucket(self, payout: float) -> List[AssetInfo]:
+        """Get the active assets in the payout bucket containing ``payout``."""
+        return [self.assets[i] for i in self._by_bucket.get(self._bucket(payout), ())]
+
+    def top(self, k: int, group: Optional[Hashable] = None, min_payout: Optional[float] = None) -> List[AssetInfo]:
+        """Get the active assets with the highest payouts.
+        
+        Reads the first k entries of a payout-ranked list, so the cost
+        grows with k, not with the number of assets.
+        
+        Args:
+            k: Maximum number of assets.
+            group: Only assets of this ``asset_group_id``, or None for all.
+            min_payout: Only assets paying at least this percentage.
+        
+        Returns:
+            Assets in descending payout order, ties broken by ID.
+        """
+        ranked = self._ranked_by_group.get(group, []) if group is not None else self._ranked
+        end = min(k, len(ranked))
+        if min_payout is not None:
+            end = min(end, bisect.bisect_right(ranked, (-min_payout, float("inf"))))
+        return [self.assets[asset_id] for _, asset_id in ranked[:end]]
+
+    def with_min_payout(self, min_payout: float, group: Optional[Hashable] = None) -> List[AssetInfo]:
+        """Get every active asset paying at least ``min_payout``, highest payout first."""
+        return self.top(len(self.active), group, min_payout)
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""Bulk historical candle download for the ExpertOption API."""
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, List, Optional, Tuple
+import numpy as np
+from Expert.ws.messages import CandleSeries, decode_candles
+
+class HistoryBackfill:
+    """Downloads long candle histories as many concurrent ``assetHistoryCandles`` requests.
+
+    A [start, end) range is split into chunks of at most ``chunk_candles``
+    candles; tick history (timeframe 0) has no fixed spacing, so it is
+    split into spans of ``tick_chunk_seconds`` instead. Up to
+    ``max_concurrency`` chunks are in flight at once; each request is
+    correlated by ``ns``, so responses cannot be mixed up. Candles outside
+    their chunk's window and repeated timestamps are dropped, so overlapping
+    server responses never produce duplicates. Ticks of one period share a
+    timestamp, so they are never de-duplicated.
+    """
+
+    def __init__(self, api, max_concurrency: int = 8, chunk_candles: int = 720, retries: int = 3,
+                 timeout: float = 20.0, tick_chunk_seconds: int = 600):
+        """Initialize the backfill engine.
+        
+        Args:
+            api: The ExpertOption API instance (or a ConnectionPool).
+            max_concurrency: Maximum number of requests in flight.
+            chunk_candles: Maximum number of candles requested per chunk.
+            retries: Attempts per chunk before it is reported as failed.
+            timeout: Maximum time to wait for each response.
+            tick_chunk_seconds: Seconds of tick history (timeframe 0) requested per chunk.
+        """
+        self.api = api
+        self.max_concurrency = max_concurrency
+        self.chunk_candles = chunk_candles
+        self.retries = retries
+        self.timeout = timeout
+        self.tick_chunk_seconds = tick_chunk_seconds
+        self.logger = logging.getLogger("HistoryBackfill")
+
+    def chunks(self, timeframe: int, start: int, end: int) -> List[Tuple[int, int]]:
+        """Split a time range into request-sized chunks.
+        
+        Args:
+            timeframe: Candle timeframe in seconds (0 for ticks).
+            start: Range start (Unix timestamp, inclusive).
+            end: Range end (Unix timestamp, exclusive).
+        
+        Returns:
+            List of [chunk_start, chunk_end) pairs aligned to the timeframe.
+        
+        Raises:
+            ValueError: If the timeframe is negative.
+        """
+        if timeframe < 0:
+            raise ValueError(f"Timeframe must not be negative, got {timeframe}")
+        if timeframe == 0:
+            span = self.tick_chunk_seconds
+        else:
+            span = self.chunk_candles * timeframe
+            start -= start % timeframe
+        return [(chunk_start, min(chunk_start + span, end)) for chunk_start in range(start, end, span)]
+
+    async def _fetch_chunk(self, asset_id: int, timeframe: int, chunk: Tuple[int, int]) -> CandleSeries:
+        """Fetch one chunk with retries and trim it to the chunk window."""
+        chunk_start, chunk_end = chunk
+        for attempt in range(1, self.retries + 1):
+            try:
+                message = await self.api.get_historical_candles(asset_id, [[chunk_start, chunk_end]], timeframe,
+                                                                timeout=self.timeout)
+                break
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                self.logger.warning(f"Chunk {chunk_start}-{chunk_end} of asset ID {asset_id} failed "
+                                    f"(attempt {attempt}/{self.retries}): {str(e)}")
+                await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+        series = [s for s in decode_candles(message) if s.timeframe == timeframe and len(s)]
+        if not series:
+            return CandleSeries(asset_id, timeframe, None, np.empty(0, dtype=np.int64), np.empty((0, 4)))
+        timestamps = np.concatenate([s.timestamps for s in series])
+        ohlc = np.concatenate([s.ohlc for s in series])
+        in_window = (timestamps >= chunk_start) & (timestamps < chunk_end)
+        timestamps, ohlc = timestamps[in_window], ohlc[in_window]
+        if timeframe == 0:
+            # Ticks of one period share a timestamp: sort them but keep every one
+            order = np.argsort(timestamps, kind="stable")
+            return CandleSeries(asset_id, timeframe, None, timestamps[order], ohlc[order])
+        # Keep the last occurrence of each timestamp, sorted oldest first
+        order = np.argsort(timestamps, kind="stable")[::-1]
+        unique, first = np.unique(timestamps[order], return_index=True)
+        return CandleSeries(asset_id, timeframe, None, unique, ohlc[order][first])
+
+    async def iter_range(self, asset_id: int, timeframe: int, start: int,
+                         end: Optional[int] = None) -> AsyncIterator[CandleSeries]:
+        """Stream the candles of a range chunk by chunk as responses arrive.
+        
+        Chunks are yielded in completion order, not time order; each chunk is
+        sorted and free of duplicates (ticks, timeframe 0, are all kept), and
+        chunks never overlap.
+        
+        Args:
+            asset_id: The ID of the asset.
+            timeframe: Candle timeframe in seconds.
+            start: Range start (Unix timestamp, inclusive).
+            end: Range end (Unix timestamp, exclusive; defaults to now).
+        
+        Yields:
+            One CandleSeries per chunk that returned candles.
+        """
+        end = int(time.time()) if end is None else end
+        chunks = self.chunks(timeframe, start, end)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def fetch(chunk):
+            async with semaphore:
+                return await self._fetch_chunk(asset_id, timeframe, chunk)
+        
+        tasks = [asyncio.ensure_future(fetch(chunk)) for chunk in chunks]
+        started = time.monotonic()
+        candles = failed = 0
+        try:
+            for future in asyncio.as_completed(tasks):
+                try:
+                    series = await future
+                except Exception as e:
+                    failed += 1
+                    self.logger.error(f"Giving up on a chunk of asset ID {asset_id}: {str(e)}")
+                    continue
+                if len(series):
+                    candles += len(series)
+                    yield series
+        finally:
+            for task in tasks:
+                task.cancel()
+        self.logger.info(f"Backfilled {candles} candles of asset ID {asset_id} tf {timeframe} in "
+                         f"{len(chunks)} chunks ({failed} failed) in {time.monotonic() - started:.1f}s")
+
+    async def fetch_range(self, asset_id: int, timeframe: int, start: int, end: Optional[int] = None) -> CandleSeries:
+        """Download a range and return it as one sorted, de-duplicated series.
+        
+        Args:
+            asset_id: The ID of the asset.
+            timeframe: Candle timeframe in seconds.
+            start: Range start (Unix timestamp, inclusive).
+            end: Range end (Unix timestamp, exclusive; defaults to now).
+        
+        Returns:
+            The candle series with (n,) timestamps and (n, 4) OHLC arrays.
+        """
+        parts = [series async for series in self.iter_range(asset_id, timeframe, start, end)]
+        if not parts:
+            return CandleSeries(asset_id, timeframe, None, np.empty(0, dtype=np.int64), np.empty((0, 4)))
+        timestamps = np.concatenate([part.timestamps for part in parts])
+        ohlc = np.concatenate([part.ohlc for part in parts])
+        order = np.argsort(timestamps, kind="stable")
+        return CandleSeries(asset_id, timeframe, None, timestamps[order], ohlc[order])
\ No newline at end of file
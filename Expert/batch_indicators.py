@@ -0,0 +1,250 @@
+"""Vectorized technical indicators over many assets at once.
+
+Every function takes 2-D arrays shaped (assets, time), oldest candle first,
+and returns arrays of the same shape. Values that are not defined yet
+(the warm-up window) are NaN, so all outputs stay aligned with the input.
+"""
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+from Expert.candle_store import CandleStore
+
+def _as_matrix(values) -> np.ndarray:
+    """Convert input to a 2-D float64 array of shape (assets, time)."""
+    matrix = np.asarray(values, dtype=np.float64)
+    if matrix.ndim == 1:
+        matrix = matrix[np.newaxis, :]
+    if matrix.ndim != 2:
+        raise ValueError(f"Expected a 2-D (assets, time) array, got shape {matrix.shape}")
+    return matrix
+
+def batch_sma(values, period: int) -> np.ndarray:
+    """Simple moving average along the time axis.
+
+    Args:
+        values: Array of shape (assets, time).
+        period: Window length.
+
+    Returns:
+        SMA values; the first period - 1 columns are NaN.
+    """
+    matrix = _as_matrix(values)
+    result = np.full(matrix.shape, np.nan)
+    if matrix.shape[1] < period:
+        return result
+    cumsum = np.cumsum(matrix, axis=1)
+    result[:, period - 1] = cumsum[:, period - 1]
+    result[:, period:] = cumsum[:, period:] - cumsum[:, :-period]
+    result[:, period - 1:] /= period
+    return result
+
+def batch_smma(values, period: int) -> np.ndarray:
+    """Smoothed (Wilder) moving average along the time axis, seeded with the SMA.
+
+    Args:
+        values: Array of shape (assets, time).
+        period: Smoothing period.
+
+    Returns:
+        SMMA values; the first period - 1 columns are NaN.
+    """
+    matrix = _as_matrix(values)
+    result = np.full(matrix.shape, np.nan)
+    if matrix.shape[1] < period:
+        return result
+    current = matrix[:, :period].mean(axis=1)
+    result[:, period - 1] = current
+    for t in range(period, matrix.shape[1]):
+        current = (current * (period - 1) + matrix[:, t]) / period
+        result[:, t] = current
+    return result
+
+def batch_rsi(closes, period: int = 14) -> np.ndarray:
+    """Relative Strength Index with Wilder smoothing, as in RSIIndicator.
+
+    Args:
+        closes: Closing prices of shape (assets, time).
+        period: Number of periods for RSI calculation.
+
+    Returns:
+        RSI values; the first period columns are NaN.
+    """
+    matrix = _as_matrix(closes)
+    result = np.full(matrix.shape, np.nan)
+    if matrix.shape[1] <= period:
+        return result
+    changes = np.diff(matrix, axis=1)
+    gains = np.where(changes > 0, changes, 0.0)
+    losses = np.where(changes < 0, -changes, 0.0)
+    avg_gain = batch_smma(gains, period)
+    avg_loss = batch_smma(losses, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+    rsi = np.where(avg_loss == 0, 100.0, rsi)
+    rsi[np.isnan(avg_gain)] = np.nan
+    result[:, 1:] = rsi
+    return result
+
+def batch_alligator(closes, jaw_period: int = 13, teeth_period: int = 8, lips_period: int = 5,
+                    smoothed: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Alligator jaw, teeth and lips lines.
+
+    Args:
+        closes: Closing prices of shape (assets, time).
+        jaw_period: Period of the jaw line.
+        teeth_period: Period of the teeth line.
+        lips_period: Period of the lips line.
+        smoothed: Use SMMA lines instead of the SMA lines used by AlligatorIndicator.
+
+    Returns:
+        Tuple of (jaw, teeth, lips) arrays.
+    """
+    average = batch_smma if smoothed else batch_sma
+    return average(closes, jaw_period), average(closes, teeth_period), average(closes, lips_period)
+
+def batch_bollinger_bands(closes, length: int = 20, std: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bollinger Bands using the population standard deviation.
+
+    Args:
+        closes: Closing prices of shape (assets, time).
+        length: Window length.
+        std: Number of standard deviations for the bands.
+
+    Returns:
+        Tuple of (lower, middle, upper) arrays.
+    """
+    matrix = _as_matrix(closes)
+    middle = batch_sma(matrix, length)
+    mean_sq = batch_sma(matrix * matrix, length)
+    deviation = np.sqrt(np.maximum(mean_sq - middle * middle, 0.0))
+    return middle - std * deviation, middle, middle + std * deviation
+
+def batch_atr(highs, lows, closes, length: int = 14) -> np.ndarray:
+    """Average True Range with Wilder smoothing.
+
+    Args:
+        highs: High prices of shape (assets, time).
+        lows: Low prices of shape (assets, time).
+        closes: Closing prices of shape (assets, time).
+        length: Smoothing period.
+
+    Returns:
+        ATR values; the first length columns are NaN.
+    """
+    high, low, close = _as_matrix(highs), _as_matrix(lows), _as_matrix(closes)
+    result = np.full(close.shape, np.nan)
+    if close.shape[1] < 2:
+        return result
+    prev_close = close[:, :-1]
+    true_range = np.maximum.reduce([
+        high[:, 1:] - low[:, 1:],
+        np.abs(high[:, 1:] - prev_close),
+        np.abs(low[:, 1:] - prev_close),
+    ])
+    result[:, 1:] = batch_smma(true_range, length)
+    return result
+
+def batch_supertrend(highs, lows, closes, length: int = 10, multiplier: float = 3.0) -> Tuple[np.ndarray, np.ndarray]:
+    """SuperTrend line and direction.
+
+    Args:
+        highs: High prices of shape (assets, time).
+        lows: Low prices of shape (assets, time).
+        closes: Closing prices of shape (assets, time).
+        length: ATR period.
+        multiplier: ATR multiplier for the bands.
+
+    Returns:
+        Tuple of (trend, direction) arrays. Direction is 1 for up and -1 for
+        down; both are NaN during the ATR warm-up.
+    """
+    high, low, close = _as_matrix(highs), _as_matrix(lows), _as_matrix(closes)
+    atr = batch_atr(high, low, close, length)
+    hl2 = (high + low) / 2
+    upper = hl2 + multiplier * atr
+    lower = hl2 - multiplier * atr
+    trend = np.full(close.shape, np.nan)
+    direction = np.full(close.shape, np.nan)
+    start = length
+    if close.shape[1] <= start:
+        return trend, direction
+    current = np.ones(close.shape[0])
+    direction[:, start] = current
+    trend[:, start] = lower[:, start]
+    for t in range(start + 1, close.shape[1]):
+        up = close[:, t] > upper[:, t - 1]
+        down = close[:, t] < lower[:, t - 1]
+        current = np.where(up, 1.0, np.where(down, -1.0, current))
+        hold = ~(up | down)
+        # While the direction holds, the active band can only move with the trend
+        lower[:, t] = np.where(hold & (current > 0) & (lower[:, t] < lower[:, t - 1]), lower[:, t - 1], lower[:, t])
+        upper[:, t] = np.where(hold & (current < 0) & (upper[:, t] > upper[:, t - 1]), upper[:, t - 1], upper[:, t])
+        direction[:, t] = current
+        trend[:, t] = np.where(current > 0, lower[:, t], upper[:, t])
+    return trend, direction
+
+def compute_batch_indicators(closes, highs=None, lows=None, rsi_period: int = 14,
+                             bb_length: int = 20, bb_std: float = 2.0,
+                             supertrend_length: int = 10, supertrend_multiplier: float = 3.0,
+                             smoothed_alligator: bool = False) -> Dict[str, np.ndarray]:
+    """Compute RSI, Alligator, Bollinger Bands and SuperTrend for many assets in one pass.
+
+    Args:
+        closes: Closing prices of shape (assets, time).
+        highs: High prices of shape (assets, time); SuperTrend is skipped if omitted.
+        lows: Low prices of shape (assets, time); SuperTrend is skipped if omitted.
+        rsi_period: Number of periods for RSI calculation.
+        bb_length: Bollinger Bands window length.
+        bb_std: Bollinger Bands standard deviation multiplier.
+        supertrend_length: SuperTrend ATR period.
+        supertrend_multiplier: SuperTrend ATR multiplier.
+        smoothed_alligator: Use SMMA lines for the Alligator.
+
+    Returns:
+        Dictionary of indicator arrays, each shaped (assets, time).
+    """
+    close = _as_matrix(closes)
+    jaw, teeth, lips = batch_alligator(close, smoothed=smoothed_alligator)
+    bb_lower, bb_middle, bb_upper = batch_bollinger_bands(close, bb_length, bb_std)
+    result = {
+        "rsi": batch_rsi(close, rsi_period),
+        "jaw": jaw,
+        "teeth": teeth,
+        "lips": lips,
+        "bb_lower": bb_lower,
+        "bb_middle": bb_middle,
+        "bb_upper": bb_upper,
+    }
+    if highs is not None and lows is not None:
+        trend, direction = batch_supertrend(highs, lows, close, supertrend_length, supertrend_multiplier)
+        result["supertrend"] = trend
+        result["supertrend_direction"] = direction
+    return result
+
+def stack_from_store(store: CandleStore, asset_ids: Iterable[int], timeframe: int,
+                     length: int) -> Tuple[List[int], Dict[str, np.ndarray]]:
+    """Stack the latest candles of many assets into (assets, time) matrices.
+
+    Assets with fewer than length candles in the store are skipped.
+
+    Args:
+        store: The candle store to read from.
+        asset_ids: IDs of the assets to stack.
+        timeframe: Candle timeframe in seconds.
+        length: Number of most recent candles per asset.
+
+    Returns:
+        Tuple of (included asset IDs, dict with 'open', 'high', 'low' and 'close' matrices).
+    """
+    included = []
+    rows = []
+    for asset_id in asset_ids:
+        buffer = store.buffer(asset_id, timeframe)
+        if buffer is None or len(buffer) < length:
+            continue
+        included.append(asset_id)
+        rows.append(buffer.ohlc()[:, -length:])
+    if not rows:
+        empty = np.empty((0, length))
+        return included, {"open": empty, "high": empty, "low": empty, "close": empty}
+    stacked = np.stack(rows, axis=1)
+    return included, {"open": stacked[0], "high": stacked[1], "low": stacked[2], "close": stacked[3]}
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""Startup action profiles and an on-disk cache of slow-changing session data."""
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional
+
+# Startup profiles, from the fewest actions to the browser's full sequence
+BOOTSTRAP_PROFILES = ("minimal", "standard", "full")
+
+# Seconds a cached response stays fresh, per action
+DEFAULT_TTLS: Dict[str, float] = {
+    "getCountries": 7 * 86400.0,
+    "getCurrency": 86400.0,
+    "getCandlesTimeframes": 86400.0,
+    "assets": 3600.0,
+}
+
+def default_cache_path(token: str, server_region: str) -> str:
+    """Get the default cache file for an account and server.
+
+    Args:
+        token: API authentication token (only a hash of it is used).
+        server_region: WebSocket server URI.
+
+    Returns:
+        Path under ~/.cache/expertoption.
+    """
+    digest = hashlib.blake2b(f"{server_region}|{token}".encode(), digest_size=8).hexdigest()
+    return os.path.join(os.path.expanduser("~"), ".cache", "expertoption", f"bootstrap_{digest}.json")
+
+class BootstrapCache:
+    """Responses to slow-changing startup actions, persisted as JSON.
+
+    Only actions listed in the TTLs are cached. A cached response younger
+    than its TTL lets connect() skip the request; an expired one is
+    requested again and replaced by the new response.
+    """
+
+    def __init__(self, path: str, ttls: Optional[Dict[str, float]] = None):
+        """Initialize the cache and load any entries saved earlier.
+        
+        Args:
+            path: JSON file holding the cache (created on first save).
+            ttls: Seconds each action's response stays fresh, merged over DEFAULT_TTLS.
+        """
+        self.path = path
+        self.ttls: Dict[str, float] = {**DEFAULT_TTLS, **(ttls or {})}
+        self.logger = logging.getLogger("BootstrapCache")
+        self._entries: Dict[str, Dict] = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable bootstrap cache {path}: {str(e)}")
+
+    def get(self, action: str) -> Optional[Dict]:
+        """Get the cached response message for an action if it is still fresh.
+        
+        Args:
+            action: The startup action.
+        
+        Returns:
+            The response message, or None if missing or expired.
+        """
+        entry = self._entries.get(action)
+        if entry is None or time.time() - entry["fetched_at"] > self.ttls.get(action, 0):
+            return None
+        return entry["message"]
+
+    def fresh_actions(self) -> List[str]:
+        """Get the actions whose cached responses are still fresh."""
+        return [action for action in self._entries if self.get(action) is not None]
+
+    def put(self, action: str, message: Dict):
+        """Store the response message for a cacheable action and save the file.
+        
+        Args:
+            action: The startup action.
+            message: The ``message`` field of the response.
+        """
+        if action not in self.ttls:
+            return
+        self._entries[action] = {"fetched_at": time.time(), "message": message}
+        self.save()
+
+    def invalidate(self, action: Optional[str] = None):
+        """Drop one cached action, or every entry if action is None."""
+        if action is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(action, None)
+        self.save()
+
+    def save(self):
+        """Write the cache atomically, so readers never see a partial file."""
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            temporary = f"{self.path}.{os.getpid()}.tmp"
+            with open(temporary, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(temporary, self.path)
+        except OSError as e:
+            self.logger.warning(f"Failed to save bootstrap cache {self.path}: {str(e)}")
\ No newline at end of file
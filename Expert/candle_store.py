@@ -0,0 +1,274 @@
+"""Streaming candle store for the ExpertOption API."""
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from Expert.ws.objects.candles import Candle
+from Expert.ws.messages import CandleSeries
+
+OPEN, HIGH, LOW, CLOSE = range(4)
+
+# Outcomes of CandleBuffer._apply
+_IGNORED, _REPLACED, _APPENDED = range(3)
+
+class CandleBuffer:
+    """Fixed-capacity ring buffer of candles for one asset and timeframe.
+
+    Every slot is written twice (at ``i`` and ``i + capacity``) so the most
+    recent candles are always a contiguous slice of the backing arrays. The
+    accessors therefore return read-only NumPy views without copying.
+
+    A tick buffer (timeframe 0) appends every tick: ticks of one period
+    share its start time, so a repeated timestamp is not an update.
+    """
+
+    def __init__(self, capacity: int = 1000, ticks: bool = False):
+        """Initialize the candle buffer.
+        
+        Args:
+            capacity: Maximum number of candles kept.
+            ticks: Append entries with the latest timestamp instead of replacing the latest one.
+        """
+        if capacity < 1:
+            raise ValueError(f"Buffer capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self.ticks = ticks
+        self._timestamps = np.zeros(2 * capacity, dtype=np.int64)
+        self._prices = np.zeros((4, 2 * capacity), dtype=np.float64)
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _write(self, index: int, timestamp: int, open_: float, high: float, low: float, close: float):
+        """Write a candle into both copies of a slot."""
+        for i in (index, index + self.capacity):
+            self._timestamps[i] = timestamp
+            self._prices[OPEN, i] = open_
+            self._prices[HIGH, i] = high
+            self._prices[LOW, i] = low
+            self._prices[CLOSE, i] = close
+
+    def update(self, timestamp: int, open_: float, high: float, low: float, close: float) -> bool:
+        """Append a new candle or update the current one in place.
+        
+        A candle with the same timestamp as the latest one replaces it (the
+        server keeps pushing the still-open candle). Older candles are ignored.
+        
+        Args:
+            timestamp: Candle start time (Unix timestamp).
+            open_: Open price.
+            high: High price.
+            low: Low price.
+            close: Close price.
+        
+        Returns:
+            True if the buffer changed, False if the candle was older than the latest one.
+        """
+        return self._apply(timestamp, open_, high, low, close) != _IGNORED
+
+    def _apply(self, timestamp: int, open_: float, high: float, low: float, close: float) -> int:
+        """Apply one candle; returns _APPENDED, _REPLACED or _IGNORED."""
+        if self._size:
+            last = (self._head - 1) % self.capacity
+            last_timestamp = self._timestamps[last]
+            if timestamp == last_timestamp and not self.ticks:
+                self._write(last, timestamp, open_, high, low, close)
+                return _REPLACED
+            if timestamp < last_timestamp:
+                return _IGNORED
+        self._write(self._head, timestamp, open_, high, low, close)
+        self._head = (self._head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        return _APPENDED
+
+    def extend(self, timestamps: np.ndarray, ohlc: np.ndarray) -> int:
+        """Apply a batch of candles, oldest first, with the same rules as update().
+        
+        Args:
+            timestamps: Candle start times of shape (n,).
+            ohlc: Open, high, low and close prices of shape (n, 4).
+        
+        Returns:
+            The number of distinct candles of the batch now held in the buffer;
+            repeated updates of the same open candle count once.
+        """
+        return self._extend((timestamp, *prices) for timestamp, prices in zip(timestamps.tolist(), ohlc.tolist()))
+
+    def extend_periods(self, periods: List, timeframe: int) -> int:
+        """Apply the ``periods`` of a candle message entry without building arrays first.
+        
+        Args:
+            periods: ``[[start_time, [[open, high, low, close], ...]], ...]``.
+            timeframe: Spacing of the candles within a period in seconds (0 for ticks).
+        
+        Returns:
+            The number of distinct candles held in the buffer, as extend().
+        """
+        return self._extend((start_time + timeframe * i, candle[0], candle[1], candle[2], candle[3])
+                            for start_time, candles in periods for i, candle in enumerate(candles))
+
+    def _extend(self, candles: Iterable[Tuple[int, float, float, float, float]]) -> int:
+        appended = 0
+        replaced_latest = False
+        for timestamp, open_, high, low, close in candles:
+            result = self._apply(timestamp, open_, high, low, close)
+            if result == _APPENDED:
+                appended += 1
+            elif result == _REPLACED and not appended:
+                # Updated the candle that was latest before the batch
+                replaced_latest = True
+        return min(self.capacity, appended + replaced_latest)
+
+    def _view(self, array: np.ndarray) -> np.ndarray:
+        """Get a read-only view of the stored window of an array."""
+        end = self._head + self.capacity
+        view = array[..., end - self._size:end]
+        view.flags.writeable = False
+        return view
+
+    def timestamps(self) -> np.ndarray:
+        """Get candle timestamps, oldest first."""
+        return self._view(self._timestamps)
+
+    def opens(self) -> np.ndarray:
+        """Get open prices, oldest first."""
+        return self._view(self._prices[OPEN])
+
+    def highs(self) -> np.ndarray:
+        """Get high prices, oldest first."""
+        return self._view(self._prices[HIGH])
+
+    def lows(self) -> np.ndarray:
+        """Get low prices, oldest first."""
+        return self._view(self._prices[LOW])
+
+    def closes(self) -> np.ndarray:
+        """Get close prices, oldest first."""
+        return self._view(self._prices[CLOSE])
+
+    def ohlc(self) -> np.ndarray:
+        """Get a (4, n) view of open, high, low and close prices, oldest first."""
+        return self._view(self._prices)
+
+    @property
+    def latest_timestamp(self) -> Optional[int]:
+        """Get the timestamp of the latest candle, or None if empty."""
+        if not self._size:
+            return None
+        return int(self._timestamps[(self._head - 1) % self.capacity])
+
+    def latest(self) -> Optional[Candle]:
+        """Get the latest candle, or None if empty."""
+        if not self._size:
+            return None
+        return Candle(self._prices[:, (self._head - 1) % self.capacity].tolist())
+
+class CandleStore:
+    """Store of live candles per (asset_id, timeframe), fed by ``candles`` pushes."""
+
+    def __init__(self, capacity: int = 1000):
+        """Initialize the candle store.
+        
+        Args:
+            capacity: Maximum number of candles kept per asset and timeframe.
+        """
+        self.capacity = capacity
+        self.logger = logging.getLogger("CandleStore")
+        self._buffers: Dict[Tuple[int, int], CandleBuffer] = {}
+        self._listeners: List[Callable[[CandleSeries], None]] = []
+
+    def add_listener(self, listener: Callable[[CandleSeries], None]):
+        """Register a callback invoked with every candle series after it is stored."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[CandleSeries], None]):
+        """Unregister a callback added with add_listener()."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def keys(self) -> List[Tuple[int, int]]:
+        """Get the (asset_id, timeframe) pairs held in the store."""
+        return list(self._buffers.keys())
+
+    def buffer(self, asset_id: int, timeframe: int, create: bool = False) -> Optional[CandleBuffer]:
+        """Get the buffer for an asset and timeframe.
+        
+        Args:
+            asset_id: The ID of the asset.
+            timeframe: Candle timeframe in seconds.
+            create: Create an empty buffer if none exists yet.
+        
+        Returns:
+            The candle buffer, or None if it does not exist and create is False.
+        """
+        key = (asset_id, timeframe)
+        buffer = self._buffers.get(key)
+        if buffer is None and create:
+            buffer = self._buffers[key] = CandleBuffer(self.capacity, ticks=timeframe == 0)
+        return buffer
+
+    def latest(self, asset_id: int, timeframe: int) -> Optional[Candle]:
+        """Get the latest candle for an asset and timeframe.
+        
+        Args:
+            asset_id: The ID of the asset.
+            timeframe: Candle timeframe in seconds.
+        
+        Returns:
+            The latest candle, or None if no candles were received.
+        """
+        buffer = self._buffers.get((asset_id, timeframe))
+        return buffer.latest() if buffer is not None else None
+
+    def closes(self, asset_id: int, timeframe: int) -> np.ndarray:
+        """Get a read-only view of close prices for an asset and timeframe.
+        
+        Args:
+            asset_id: The ID of the asset.
+            timeframe: Candle timeframe in seconds.
+        
+        Returns:
+            Close prices, oldest first (empty if no candles were received).
+        """
+        buffer = self._buffers.get((asset_id, timeframe))
+        return buffer.closes() if buffer is not None else np.empty(0, dtype=np.float64)
+
+    def ingest(self, message: Dict) -> int:
+        """Ingest the message body of a ``candles`` push.
+        
+        Each entry of ``message["candles"]`` carries ``assetId``, ``tf`` and
+        ``periods`` as ``[[start_time, [[open, high, low, close], ...]], ...]``.
+        Candles within a period are ``tf`` seconds apart; ticks (``tf`` 0)
+        are all kept.
+        
+        Args:
+            message: The ``message`` field of the push.
+        
+        Returns:
+            The number of candles of the push held in the store.
+        """
+        written = 0
+        stored = []
+        try:
+            entries = (message.get("candles") or []) if isinstance(message, dict) else []
+            for entry in entries:
+                if not isinstance(entry, dict) or entry.get("assetId") is None:
+                    continue
+                timeframe = entry.get("tf") or 0
+                buffer = self.buffer(entry["assetId"], timeframe, create=True)
+                # Straight from the decoded message into the buffer; series are only built for listeners
+                written += buffer.extend_periods(entry.get("periods") or [], timeframe)
+                if self._listeners:
+                    stored.append(entry)
+        except Exception as e:
+            self.logger.error(f"Error ingesting candles: {e}")
+        # Listeners run after storage, each on its own, so one failing never loses candles
+        for entry in stored:
+            series = CandleSeries.from_entry(entry)
+            for listener in list(self._listeners):
+                try:
+                    listener(series)
+                except Exception as e:
+                    self.logger.error(f"Candle listener failed: {str(e)}", exc_info=True)
+        return written
\ No newline at end of file
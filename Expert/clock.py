@@ -0,0 +1,117 @@
+"""Server clock tracking for the ExpertOption API."""
+import logging
+import time
+from collections import deque
+from typing import Dict, FrozenSet, List, Optional
+
+# Actions whose messages are stamped with the current server time: ping replies and live candle pushes
+CLOCK_ACTIONS: FrozenSet[str] = frozenset({"ping", "candles"})
+
+class ServerClock:
+    """Estimate of the server clock derived from timestamped inbound messages.
+
+    Each timestamped message gives a sample of ``server_time - local_time``.
+    Server timestamps are whole seconds stamped before the message travels to
+    us, so every sample underestimates the true offset; the largest sample in
+    a recent window is therefore the best estimate.
+
+    A sample more than ``max_deviation`` seconds away from a fresh estimate
+    is rejected, so one bad or stale timestamp cannot hold the offset for a
+    whole window. If ``max_rejections`` samples in a row are rejected, the
+    server clock really moved and the estimate starts over from them.
+    """
+
+    def __init__(self, window: int = 64, max_age: float = 300.0, max_deviation: float = 30.0,
+                 max_rejections: int = 3):
+        """Initialize the server clock.
+        
+        Args:
+            window: Number of recent samples kept.
+            max_age: Seconds after the last sample before the estimate is considered stale.
+            max_deviation: Largest distance in seconds between a sample and a fresh estimate.
+            max_rejections: Consecutive rejected samples after which the estimate is rebuilt.
+        """
+        self.logger = logging.getLogger("ServerClock")
+        self.max_age = max_age
+        self.max_deviation = max_deviation
+        self.max_rejections = max_rejections
+        self.rejected = 0
+        self._samples = deque(maxlen=window)
+        self._rejected_streak: List[float] = []
+        self._offset: Optional[float] = None
+        self._last_sample: Optional[float] = None
+
+    @property
+    def synced(self) -> bool:
+        """Check whether a recent offset estimate is available."""
+        return self._last_sample is not None and time.time() - self._last_sample <= self.max_age
+
+    @property
+    def offset(self) -> Optional[float]:
+        """Get the estimated server minus local clock offset in seconds."""
+        return self._offset
+
+    def observe(self, server_time: float, local_time: Optional[float] = None) -> bool:
+        """Add a sample from a message stamped with the server time.
+        
+        Args:
+            server_time: Server timestamp carried by the message (Unix seconds).
+            local_time: Local receive time (defaults to now).
+        
+        Returns:
+            True if the sample was accepted.
+        """
+        local_time = time.time() if local_time is None else local_time
+        sample = server_time - local_time
+        fresh = self._last_sample is not None and local_time - self._last_sample <= self.max_age
+        if fresh and abs(sample - self._offset) > self.max_deviation:
+            self.rejected += 1
+            self._rejected_streak.append(sample)
+            if len(self._rejected_streak) < self.max_rejections:
+                self.logger.debug(f"Rejected clock sample {sample:.3f}s, estimate is {self._offset:.3f}s")
+                return False
+            self.logger.warning(f"Server clock moved: rebuilding offset from {len(self._rejected_streak)} samples")
+            self._samples.clear()
+            self._samples.extend(self._rejected_streak[:-1])
+        elif not fresh:
+            self._samples.clear()
+        self._rejected_streak = []
+        self._samples.append(sample)
+        self._offset = max(self._samples)
+        self._last_sample = local_time
+        return True
+
+    def observe_message(self, data: Dict) -> bool:
+        """Add a sample from an inbound message if it carries the current server time.
+        
+        Only CLOCK_ACTIONS are sampled: other messages may carry ``t`` fields
+        that are not the current time. Candle pushes carry ``t`` on each entry
+        of ``message["candles"]``; ping replies carry it in ``message``.
+        
+        Args:
+            data: The decoded inbound message.
+        
+        Returns:
+            True if a sample was taken.
+        """
+        if data.get("action") not in CLOCK_ACTIONS:
+            return False
+        message = data.get("message")
+        if not isinstance(message, dict):
+            return False
+        server_time = message.get("t")
+        if server_time is None and data.get("action") == "candles":
+            candles = message.get("candles")
+            if candles and isinstance(candles[0], dict):
+                server_time = candles[0].get("t")
+        if not isinstance(server_time, (int, float)):
+            return False
+        return self.observe(server_time)
+
+    def now(self) -> float:
+        """Get the estimated current server time, falling back to the local clock."""
+        return time.time() + (self._offset or 0.0)
+
+    def server_time(self) -> int:
+        """Get the estimated current server time in whole seconds."""
+        return int(self.now())
\ No newline at end of file
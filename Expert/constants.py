@@ -1,5 +1,6 @@
 """Constants for the ExpertOption API."""
 from typing import Dict, List
+from Expert.utils import normalize_symbol
 
 # Mapping of asset IDs to symbols
 ASSET_MAPPING: Dict[int, str] = {
@@ -101,8 +102,9 @@ ASSET_MAPPING: Dict[int, str] = {
     316: "TRUMP",
 }
 
-# Reverse mapping for symbol to ID
-SYMBOL_TO_ID: Dict[str, int] = {v: k for k, v in ASSET_MAPPING.items()}
+# Reverse mapping for normalized symbol to ID. Static and possibly stale; the
+# live table is ExpertOptionAPI.symbols. The first ID wins for duplicate symbols.
+SYMBOL_TO_ID: Dict[str, int] = {normalize_symbol(v): k for k, v in reversed(list(ASSET_MAPPING.items()))}
 
 # WebSocket server regions
 REGIONS: Dict[str, str] = {
@@ -114,15 +116,17 @@ REGIONS: Dict[str, str] = {
 }
 
 def get_asset_id(symbol: str) -> int:
-    """Retrieve asset ID from symbol.
+    """Retrieve asset ID from symbol in the static mapping.
+
+    Prefer ExpertOptionAPI.symbols, which follows the server catalog.
     
     Args:
-        symbol: The asset symbol (e.g., 'EURUSD_otc').
+        symbol: The asset symbol, in any case (e.g., 'EURUSD_otc').
     
     Returns:
         The corresponding asset ID or None if not found.
     """
-    return SYMBOL_TO_ID.get(symbol.upper())
+    return SYMBOL_TO_ID.get(normalize_symbol(symbol))
 
 def get_asset_symbol(asset_id: int) -> str:
     """Retrieve asset symbol from ID.
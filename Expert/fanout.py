@@ -0,0 +1,308 @@
+"""Multi-process fan-out of live candles to strategy workers.
+
+The process that owns the WebSocket publishes every candle update into a
+shared-memory ring per (asset_id, timeframe). Worker processes read the
+rings without copying data through pipes, run a strategy, and send order
+intents back over a queue. The main process places those orders, so slow
+strategy code never blocks pings or order acknowledgements on the event loop.
+
+A strategy is a picklable callable (for example a module-level function or
+an instance of a module-level class)::
+
+    def strategy(asset_id, timeframe, timestamps, ohlc):
+        # ohlc has shape (4, n): open, high, low and close rows, oldest first
+        if rsi(ohlc[3]) < 25:
+            return {"asset_id": asset_id, "amount": 1.0, "direction": "call"}
+        return None
+
+It may return None, one intent or a list of intents. Each asset is always
+evaluated by the same worker, so per-asset state kept on the strategy
+object persists between calls.
+"""
+import asyncio
+import logging
+import multiprocessing
+import queue
+from collections import deque
+from multiprocessing import shared_memory
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from Expert.ws.messages import CandleSeries
+
+# seq, head, size
+_HEADER_FIELDS = 3
+
+class SharedCandleRing:
+    """Candle ring buffer for one asset and timeframe in shared memory.
+
+    Uses the same double-written layout as CandleBuffer, so a window of
+    recent candles is one contiguous slice. A sequence counter that is odd
+    while a write is in progress lets readers detect torn reads and retry;
+    there is a single writer per ring.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, capacity: int, owner: bool):
+        self.shm = shm
+        self.capacity = capacity
+        self.owner = owner
+        self._header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        offset = self._header.nbytes
+        self._timestamps = np.ndarray((2 * capacity,), dtype=np.int64, buffer=shm.buf, offset=offset)
+        offset += self._timestamps.nbytes
+        self._prices = np.ndarray((4, 2 * capacity), dtype=np.float64, buffer=shm.buf, offset=offset)
+
+    @staticmethod
+    def _nbytes(capacity: int) -> int:
+        return 8 * (_HEADER_FIELDS + 2 * capacity + 8 * capacity)
+
+    @classmethod
+    def create(cls, capacity: int = 1000) -> "SharedCandleRing":
+        """Allocate a new, empty ring."""
+        shm = shared_memory.SharedMemory(create=True, size=cls._nbytes(capacity))
+        ring = cls(shm, capacity, owner=True)
+        ring._header[:] = 0
+        return ring
+
+    @classmethod
+    def attach(cls, name: str, capacity: int) -> "SharedCandleRing":
+        """Attach to a ring created by the parent process.
+        
+        Workers share the parent's resource tracker, so the block stays
+        registered once and is freed by the owner's close().
+        """
+        return cls(shared_memory.SharedMemory(name=name), capacity, owner=False)
+
+    @property
+    def name(self) -> str:
+        """Get the shared memory block name."""
+        return self.shm.name
+
+    @property
+    def seq(self) -> int:
+        """Get the write sequence number (even when no write is in progress)."""
+        return int(self._header[0])
+
+    def update(self, timestamp: int, open_: float, high: float, low: float, close: float) -> bool:
+        """Append or replace the latest candle, with the same rules as CandleBuffer.update()."""
+        header = self._header
+        head, size = int(header[1]), int(header[2])
+        replace = False
+        if size:
+            last_timestamp = self._timestamps[(head - 1) % self.capacity]
+            if timestamp < last_timestamp:
+                return False
+            replace = timestamp == last_timestamp
+        index = (head - 1) % self.capacity if replace else head
+        header[0] += 1
+        for i in (index, index + self.capacity):
+            self._timestamps[i] = timestamp
+            self._prices[:, i] = (open_, high, low, close)
+        if not replace:
+            header[1] = (head + 1) % self.capacity
+            header[2] = min(size + 1, self.capacity)
+        header[0] += 1
+        return True
+
+    def extend(self, timestamps: np.ndarray, ohlc: np.ndarray) -> int:
+        """Apply a batch of candles of shape (n,) and (n, 4), oldest first."""
+        written = 0
+        for timestamp, (open_, high, low, close) in zip(timestamps.tolist(), ohlc.tolist()):
+            if self.update(timestamp, open_, high, low, close):
+                written += 1
+        return written
+
+    def snapshot(self, length: Optional[int] = None, retries: int = 100) -> Tuple[np.ndarray, np.ndarray]:
+        """Copy a consistent window of the most recent candles.
+        
+        Args:
+            length: Maximum number of candles, or None for all stored candles.
+            retries: Attempts before giving up on a ring under constant writes.
+        
+        Returns:
+            Tuple of (timestamps of shape (n,), prices of shape (4, n)), oldest first.
+        
+        Raises:
+            RuntimeError: If no consistent snapshot could be taken.
+        """
+        for _ in range(retries):
+            seq = int(self._header[0])
+            if seq % 2:
+                continue
+            head, size = int(self._header[1]), int(self._header[2])
+            count = size if length is None else min(length, size)
+            end = head + self.capacity
+            timestamps = self._timestamps[end - count:end].copy()
+            prices = self._prices[:, end - count:end].copy()
+            if int(self._header[0]) == seq:
+                return timestamps, prices
+        raise RuntimeError(f"Could not take a consistent snapshot of ring {self.name}")
+
+    def close(self):
+        """Detach from the ring, freeing it if this process created it."""
+        # Drop the array views before closing the mapping they point into
+        self._header = self._timestamps = self._prices = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+def _worker_main(strategy: Callable, rings: Dict[Tuple[int, int], str], capacity: int, window: int,
+                 notify_queue, intent_queue):
+    """Worker process loop: read notified rings, run the strategy, forward intents."""
+    logger = logging.getLogger("FanOutWorker")
+    attached = {key: SharedCandleRing.attach(name, capacity) for key, name in rings.items()}
+    seen: Dict[Tuple[int, int], int] = {}
+    try:
+        while True:
+            keys = {notify_queue.get()}
+            # Coalesce notifications that piled up while the strategy was running
+            while True:
+                try:
+                    keys.add(notify_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in keys:
+                return
+            for key in keys:
+                ring = attached.get(key)
+                if ring is None or seen.get(key) == ring.seq:
+                    continue
+                seen[key] = ring.seq
+                try:
+                    timestamps, ohlc = ring.snapshot(window)
+                    result = strategy(key[0], key[1], timestamps, ohlc)
+                except Exception as e:
+                    logger.error(f"Strategy failed for asset ID {key[0]} tf {key[1]}: {str(e)}", exc_info=True)
+                    continue
+                for intent in (result if isinstance(result, list) else [result]):
+                    if intent:
+                        intent_queue.put(intent)
+    finally:
+        for ring in attached.values():
+            ring.close()
+
+class StrategyFanOut:
+    """Publishes live candles to worker processes and places the orders they request.
+
+    Runs in the process that owns the ExpertOptionAPI (or ConnectionPool):
+    candle updates stored by ``api.candle_store`` are mirrored into shared
+    rings, and order intents returned by workers are placed with
+    ``api.place_orders``.
+    """
+
+    def __init__(self, api, strategy: Callable, keys: Iterable[Tuple[int, int]], workers: Optional[int] = None,
+                 capacity: int = 1000, window: int = 200, start_method: str = "spawn",
+                 order_history: int = 1000, poll_interval: float = 0.5):
+        """Initialize the fan-out.
+        
+        Args:
+            api: An ExpertOptionAPI or ConnectionPool.
+            strategy: Picklable callable run in the workers.
+            keys: (asset_id, timeframe) pairs to publish.
+            workers: Number of worker processes (defaults to the CPU count).
+            capacity: Candles kept per shared ring.
+            window: Most recent candles passed to each strategy call.
+            start_method: multiprocessing start method for the workers.
+            order_history: Most recent placed order IDs kept in placed_orders.
+            poll_interval: Seconds each wait for intents lasts before checking
+                whether the fan-out is stopping.
+        """
+        self.api = api
+        self.strategy = strategy
+        self.keys = list(dict.fromkeys(keys))
+        self.workers = workers or multiprocessing.cpu_count()
+        self.capacity = capacity
+        self.window = window
+        self.poll_interval = poll_interval
+        self.logger = logging.getLogger("StrategyFanOut")
+        self._context = multiprocessing.get_context(start_method)
+        self._rings: Dict[Tuple[int, int], SharedCandleRing] = {}
+        self._processes = []
+        self._notify_queues = []
+        self._intent_queue = None
+        self._intent_task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.placed_orders: Deque = deque(maxlen=order_history)
+
+    def _worker_for(self, asset_id: int) -> int:
+        """Get the index of the worker that evaluates an asset."""
+        return hash(asset_id) % self.workers
+
+    def _publish(self, series: CandleSeries):
+        """Candle store listener: mirror a stored series into its ring and notify its worker."""
+        key = (series.asset_id, series.timeframe)
+        ring = self._rings.get(key)
+        if ring is None or not ring.extend(series.timestamps, series.ohlc):
+            return
+        self._notify_queues[self._worker_for(series.asset_id)].put_nowait(key)
+
+    async def start(self):
+        """Allocate the rings, start the workers and begin publishing."""
+        for key in self.keys:
+            ring = self._rings[key] = SharedCandleRing.create(self.capacity)
+            # Seed with candles already in the store
+            buffer = self.api.candle_store.buffer(*key)
+            if buffer is not None and len(buffer):
+                ring.extend(buffer.timestamps(), buffer.ohlc().T)
+        self._intent_queue = self._context.Queue()
+        self._stopping = False
+        for index in range(self.workers):
+            rings = {key: ring.name for key, ring in self._rings.items() if self._worker_for(key[0]) == index}
+            notify_queue = self._context.Queue()
+            process = self._context.Process(target=_worker_main, name=f"strategy-worker-{index}", daemon=True,
+                                            args=(self.strategy, rings, self.capacity, self.window,
+                                                  notify_queue, self._intent_queue))
+            process.start()
+            self._notify_queues.append(notify_queue)
+            self._processes.append(process)
+        self.api.candle_store.add_listener(self._publish)
+        self._intent_task = asyncio.create_task(self._consume_intents())
+        self.logger.info(f"Started {self.workers} strategy workers for {len(self._rings)} asset/timeframe rings")
+
+    async def _consume_intents(self):
+        """Place the orders requested by the workers, batching intents that arrive together."""
+        loop = asyncio.get_running_loop()
+        while True:
+            # A bounded wait, so no executor thread stays blocked once stop() has run
+            try:
+                intents = [await loop.run_in_executor(None, self._intent_queue.get, True, self.poll_interval)]
+            except queue.Empty:
+                if self._stopping:
+                    return
+                continue
+            while True:
+                try:
+                    intents.append(self._intent_queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in intents
+            intents = [intent for intent in intents if intent is not None]
+            if intents:
+                try:
+                    orders = await self.api.place_orders(intents)
+                    self.placed_orders.extend(order for order in orders if order is not None)
+                    self.logger.info(f"Placed {sum(1 for o in orders if o is not None)}/{len(intents)} worker orders")
+                except Exception as e:
+                    self.logger.error(f"Failed to place worker orders: {str(e)}", exc_info=True)
+            if stop:
+                return
+
+    async def stop(self, timeout: float = 5.0):
+        """Stop publishing, shut the workers down and free the rings."""
+        self.api.candle_store.remove_listener(self._publish)
+        self._stopping = True
+        for notify_queue in self._notify_queues:
+            notify_queue.put(None)
+        loop = asyncio.get_running_loop()
+        for process in self._processes:
+            await loop.run_in_executor(None, process.join, timeout)
+            if process.is_alive():
+                process.terminate()
+        if self._intent_task is not None:
+            self._intent_queue.put(None)
+            await self._intent_task
+        for ring in self._rings.values():
+            ring.close()
+        self._rings.clear()
+        self._processes.clear()
+        self._notify_queues.clear()
+        self.logger.info("Stopped strategy workers")
\ No newline at end of file
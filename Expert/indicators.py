@@ -1,7 +1,8 @@
 """Technical indicators for the ExpertOption API."""
 import numpy as np
 import logging
-from typing import Dict, List, Optional
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
 from Expert.api import ExpertOptionAPI
 from Expert.exceptions import InvalidAssetError, OrderPlacementError
 
@@ -102,6 +103,140 @@ class AlligatorIndicator:
         self.logger.debug("No trading signal generated. Holding position.")
         return "Hold"
 
+class RollingMean:
+    """Simple moving average over a fixed window, updated in O(1) per value."""
+
+    def __init__(self, period: int):
+        """Initialize the rolling mean.
+        
+        Args:
+            period: Number of values in the window.
+        """
+        self.period = period
+        self._window = deque(maxlen=period)
+        self._sum = 0.0
+        self._updates = 0
+
+    @property
+    def value(self) -> Optional[float]:
+        """Get the current mean, or None until the window is full."""
+        if len(self._window) < self.period:
+            return None
+        return self._sum / self.period
+
+    def update(self, value: float) -> Optional[float]:
+        """Add a value to the window.
+        
+        Args:
+            value: The new value.
+        
+        Returns:
+            The updated mean, or None until the window is full.
+        """
+        value = float(value)
+        if len(self._window) == self.period:
+            self._sum -= self._window[0]
+        self._window.append(value)
+        self._sum += value
+        self._updates += 1
+        # Re-sum once per full rotation so floating-point drift cannot accumulate
+        if self._updates % self.period == 0:
+            self._sum = float(sum(self._window))
+        return self.value
+
+    def seed(self, values: Sequence[float]) -> Optional[float]:
+        """Reset the window from a batch of historical values.
+        
+        Args:
+            values: Historical values, oldest first.
+        
+        Returns:
+            The mean of the last window, or None if there are too few values.
+        """
+        self._window = deque((float(v) for v in values[-self.period:]), maxlen=self.period)
+        self._sum = float(sum(self._window))
+        self._updates = 0
+        return self.value
+
+class StreamingAlligator:
+    """Incremental Alligator Indicator fed one closing price at a time.
+
+    Keeps rolling sums for the jaw, teeth and lips moving averages, so each
+    update costs O(1) instead of recomputing the full convolution. The latest
+    values match AlligatorIndicator's last jaw/teeth/lips entries.
+    """
+
+    def __init__(self, jaw_period: int = 13, teeth_period: int = 8, lips_period: int = 5):
+        """Initialize the streaming Alligator Indicator.
+        
+        Args:
+            jaw_period: Period of the jaw moving average.
+            teeth_period: Period of the teeth moving average.
+            lips_period: Period of the lips moving average.
+        """
+        self.logger = logging.getLogger("StreamingAlligator")
+        self._jaw = RollingMean(jaw_period)
+        self._teeth = RollingMean(teeth_period)
+        self._lips = RollingMean(lips_period)
+        self.previous: Optional[Tuple[float, float, float]] = None
+
+    @property
+    def current(self) -> Optional[Tuple[float, float, float]]:
+        """Get the latest (jaw, teeth, lips) values, or None until all are defined."""
+        values = (self._jaw.value, self._teeth.value, self._lips.value)
+        return None if None in values else values
+
+    def update(self, close: float) -> Optional[Tuple[float, float, float]]:
+        """Add a new closing price.
+        
+        Args:
+            close: The closing price of the new candle.
+        
+        Returns:
+            The updated (jaw, teeth, lips) values, or None until all are defined.
+        """
+        self.previous = self.current
+        self._jaw.update(close)
+        self._teeth.update(close)
+        self._lips.update(close)
+        return self.current
+
+    def seed(self, closes: Sequence[float]) -> Optional[Tuple[float, float, float]]:
+        """Reset the indicator from a batch of historical closing prices.
+        
+        Args:
+            closes: Historical closing prices, oldest first.
+        
+        Returns:
+            The (jaw, teeth, lips) values after the last price, or None if there are too few prices.
+        """
+        self.previous = None
+        if len(closes) == 0:
+            for line in (self._jaw, self._teeth, self._lips):
+                line.seed([])
+            return None
+        for line in (self._jaw, self._teeth, self._lips):
+            line.seed(closes[:-1])
+        return self.update(float(closes[-1]))
+
+    def signal(self) -> Optional[str]:
+        """Get the trade direction signalled by the latest update.
+        
+        Returns:
+            'call' when the lines just aligned (jaw > teeth > lips), 'put' when
+            that alignment just broke, or None otherwise.
+        """
+        current, previous = self.current, self.previous
+        if current is None or previous is None:
+            return None
+        last_order = current[0] > current[1] > current[2]
+        prev_order = previous[0] > previous[1] > previous[2]
+        if not prev_order and last_order:
+            return "call"
+        if prev_order and not last_order:
+            return "put"
+        return None
+
 class RSIIndicator:
     """Relative Strength Index (RSI) for analyzing market conditions."""
     
@@ -232,4 +367,119 @@ class RSIIndicator:
                 self.logger.error(f"Failed to execute sell order: {e}")
                 raise OrderPlacementError(f"Failed to execute sell order: {e}")
 
-        return "Hold"
\ No newline at end of file
+        return "Hold"
+
+class StreamingRSI:
+    """Incremental Relative Strength Index fed one closing price at a time.
+
+    Keeps Wilder-smoothed average gain and loss, so each update costs O(1).
+    With at least period + 1 prices the value matches RSIIndicator.calculate_rsi.
+    """
+
+    def __init__(self, period: int = 14):
+        """Initialize the streaming RSI.
+        
+        Args:
+            period: Number of periods for RSI calculation.
+        """
+        self.logger = logging.getLogger("StreamingRSI")
+        self.period = period
+        self.reset()
+
+    def reset(self):
+        """Clear all accumulated state."""
+        self._prev_close: Optional[float] = None
+        self._changes = 0
+        self._gain_sum = 0.0
+        self._loss_sum = 0.0
+        self.avg_gain: Optional[float] = None
+        self.avg_loss: Optional[float] = None
+
+    @property
+    def value(self) -> Optional[float]:
+        """Get the current RSI, or None until period + 1 prices were seen."""
+        if self.avg_gain is None:
+            return None
+        if self.avg_loss == 0:
+            return 100
+        rs = self.avg_gain / self.avg_loss
+        return 100 - (100 / (1 + rs))
+
+    def update(self, close: float) -> Optional[float]:
+        """Add a new closing price.
+        
+        Args:
+            close: The closing price of the new candle.
+        
+        Returns:
+            The updated RSI, or None until period + 1 prices were seen.
+        """
+        if self._prev_close is None:
+            self._prev_close = close
+            return None
+        change = close - self._prev_close
+        self._prev_close = close
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        if self.avg_gain is None:
+            self._changes += 1
+            self._gain_sum += gain
+            self._loss_sum += loss
+            if self._changes < self.period:
+                return None
+            self.avg_gain = self._gain_sum / self.period
+            self.avg_loss = self._loss_sum / self.period
+        else:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+        return self.value
+
+    def seed(self, closes: Sequence[float]) -> Optional[float]:
+        """Reset the indicator from a batch of historical closing prices.
+        
+        Args:
+            closes: Historical closing prices, oldest first.
+        
+        Returns:
+            The RSI after the last price, or None if there are too few prices.
+        """
+        self.reset()
+        if len(closes) == 0:
+            return None
+        prices = np.asarray(closes, dtype=np.float64)
+        self._prev_close = float(prices[-1])
+        changes = np.diff(prices)
+        gains = np.where(changes > 0, changes, 0.0)
+        losses = np.where(changes < 0, -changes, 0.0)
+        if len(changes) < self.period:
+            self._changes = len(changes)
+            self._gain_sum = float(gains.sum())
+            self._loss_sum = float(losses.sum())
+            return None
+        avg_gain = float(np.mean(gains[:self.period]))
+        avg_loss = float(np.mean(losses[:self.period]))
+        for gain, loss in zip(gains[self.period:].tolist(), losses[self.period:].tolist()):
+            avg_gain = (avg_gain * (self.period - 1) + gain) / self.period
+            avg_loss = (avg_loss * (self.period - 1) + loss) / self.period
+        self._changes = self.period
+        self.avg_gain, self.avg_loss = avg_gain, avg_loss
+        return self.value
+
+    def evaluate_market_condition(self, overbought_threshold: float = 70, oversold_threshold: float = 30) -> str:
+        """Evaluate if the market is overbought or oversold based on the current RSI.
+        
+        Args:
+            overbought_threshold: RSI threshold for overbought condition.
+            oversold_threshold: RSI threshold for oversold condition.
+        
+        Returns:
+            Market condition ("Overbought", "Oversold", "Neutral", or "Not enough data").
+        """
+        rsi = self.value
+        if rsi is None:
+            return "Not enough data"
+        if rsi > overbought_threshold:
+            return "Overbought"
+        if rsi < oversold_threshold:
+            return "Oversold"
+        return "Neutral"
\ No newline at end of file
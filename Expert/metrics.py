@@ -0,0 +1,272 @@
+"""Latency and throughput metrics for the ExpertOption client."""
+import asyncio
+import bisect
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+# Request latency bucket upper bounds in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Frame decode time bucket upper bounds in seconds
+DECODE_BUCKETS = (0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005)
+
+class Histogram:
+    """Fixed-bucket histogram; observe() is a binary search and two additions."""
+    __slots__ = ("bounds", "counts", "count", "sum", "max")
+
+    def __init__(self, bounds: Sequence[float]):
+        """Initialize an empty histogram.
+        
+        Args:
+            bounds: Ascending bucket upper bounds; larger values land in a final +Inf bucket.
+        """
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        """Record one value."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by interpolating inside its bucket.
+        
+        Args:
+            q: Quantile between 0 and 1.
+        
+        Returns:
+            The estimate, or None if nothing was observed.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - seen) / count)
+            seen += count
+        return self.max
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """Get (upper bound, cumulative count) pairs, ending with +Inf."""
+        pairs = []
+        total = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def summary(self) -> Dict:
+        """Summarize the histogram with quantiles in milliseconds."""
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 3) if value is not None else None
+        return {
+            "count": self.count,
+            "mean_ms": ms(self.sum / self.count) if self.count else None,
+            "p50_ms": ms(self.quantile(0.5)),
+            "p90_ms": ms(self.quantile(0.9)),
+            "p99_ms": ms(self.quantile(0.99)),
+            "max_ms": ms(self.max) if self.count else None,
+        }
+
+class ClientMetrics:
+    """Counters and histograms recorded by WebSocketClient.
+
+    Frame sizes are the length of the frame text, which equals its size in
+    bytes for the ASCII JSON the server sends.
+    """
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.request_latency: Dict[str, Histogram] = {}
+        self.request_timeouts: Dict[str, int] = {}
+        self.request_errors: Dict[str, int] = {}
+        self.recv_timeouts: Dict[str, int] = {}
+        self.frames_received: Dict[str, int] = {}
+        self.bytes_received: Dict[str, int] = {}
+        self.frames_sent: Dict[str, int] = {}
+        self.bytes_sent: Dict[str, int] = {}
+        self.decode_time = Histogram(DECODE_BUCKETS)
+        self.decode_errors = 0
+
+    def observe_request(self, action: str, seconds: float):
+        """Record the latency of a request answered by the server."""
+        histogram = self.request_latency.get(action)
+        if histogram is None:
+            histogram = self.request_latency[action] = Histogram(LATENCY_BUCKETS)
+        histogram.observe(seconds)
+
+    def observe_received(self, action: Optional[str], size: int, decode_seconds: float):
+        """Record a decoded inbound frame."""
+        action = action or "unknown"
+        self.frames_received[action] = self.frames_received.get(action, 0) + 1
+        self.bytes_received[action] = self.bytes_received.get(action, 0) + size
+        self.decode_time.observe(decode_seconds)
+
+    def observe_sent(self, action: Optional[str], size: int):
+        """Record an outbound frame."""
+        action = action or "unknown"
+        self.frames_sent[action] = self.frames_sent.get(action, 0) + 1
+        self.bytes_sent[action] = self.bytes_sent.get(action, 0) + size
+
+    @staticmethod
+    def increment(counter: Dict[str, int], action: Optional[str]):
+        """Add one to a per-action counter."""
+        action = action or "unknown"
+        counter[action] = counter.get(action, 0) + 1
+
+    def reset(self):
+        """Clear every metric."""
+        self.__init__()
+
+    def snapshot(self) -> Dict:
+        """Get the metrics as plain data.
+        
+        Returns:
+            Dictionary with uptime, per-action request latency summaries
+            and failure counts, per-action inbound and outbound frame and
+            byte counts, and the decode time summary.
+        """
+        requests = {}
+        for action in set(self.request_latency) | set(self.request_timeouts) | set(self.request_errors):
+            histogram = self.request_latency.get(action) or Histogram(LATENCY_BUCKETS)
+            requests[action] = {**histogram.summary(), "timeouts": self.request_timeouts.get(action, 0),
+                                "errors": self.request_errors.get(action, 0)}
+        return {
+            "uptime": round(time.monotonic() - self.started, 3),
+            "requests": requests,
+            "recv_timeouts": dict(self.recv_timeouts),
+            "received": {action: {"frames": frames, "bytes": self.bytes_received[action]}
+                         for action, frames in self.frames_received.items()},
+            "sent": {action: {"frames": frames, "bytes": self.bytes_sent[action]}
+                     for action, frames in self.frames_sent.items()},
+            "decode": {**self.decode_time.summary(), "errors": self.decode_errors},
+        }
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class PrometheusWriter:
+    """Builds Prometheus text exposition format (version 0.0.4)."""
+
+    def __init__(self, prefix: str = "expertoption"):
+        self.prefix = prefix
+        self.lines: List[str] = []
+
+    def family(self, name: str, kind: str, help_text: str) -> str:
+        """Start a metric family and get its full name."""
+        full = f"{self.prefix}_{name}"
+        self.lines.append(f"# HELP {full} {help_text}")
+        self.lines.append(f"# TYPE {full} {kind}")
+        return full
+
+    def sample(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        """Add one sample line."""
+        if labels:
+            label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+            self.lines.append(f"{name}{{{label_text}}} {_number(value)}")
+        else:
+            self.lines.append(f"{name} {_number(value)}")
+
+    def counter(self, name: str, help_text: str, values: Union[float, Dict[str, float]], label: str = "action"):
+        """Add a counter family, unlabelled or with one sample per label value."""
+        full = self.family(name, "counter", help_text)
+        if not isinstance(values, dict):
+            self.sample(full, values)
+            return
+        for key, value in sorted(values.items()):
+            self.sample(full, value, {label: key})
+
+    def gauge(self, name: str, help_text: str, value: float):
+        """Add an unlabelled gauge."""
+        self.sample(self.family(name, "gauge", help_text), value)
+
+    def histograms(self, name: str, help_text: str, histograms: Iterable[Tuple[Dict[str, str], Histogram]]):
+        """Add a histogram family."""
+        full = self.family(name, "histogram", help_text)
+        for labels, histogram in histograms:
+            for bound, count in histogram.cumulative():
+                self.sample(f"{full}_bucket", count, {**labels, "le": _number(bound)})
+            self.sample(f"{full}_sum", histogram.sum, labels or None)
+            self.sample(f"{full}_count", histogram.count, labels or None)
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+class MetricsServer:
+    """Minimal HTTP server answering ``GET /metrics`` with Prometheus text.
+
+    Usage::
+        
+        async with MetricsServer(api.prometheus_metrics, port=9108):
+            ...
+    """
+
+    def __init__(self, render: Callable[[], str], host: str = "127.0.0.1", port: int = 9108):
+        """Initialize the server.
+        
+        Args:
+            render: Callable returning the exposition text.
+            host: Interface to listen on.
+            port: Port to listen on (0 picks a free port).
+        """
+        self.render = render
+        self.host = host
+        self.port = port
+        self.logger = logging.getLogger("MetricsServer")
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> "MetricsServer":
+        """Start listening; port is updated with the bound port."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.logger.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+        return self
+
+    async def close(self):
+        """Stop listening."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "MetricsServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5.0)
+            # Skip the headers
+            while (await asyncio.wait_for(reader.readline(), timeout=5.0)) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                status, body = "200 OK", self.render().encode()
+            else:
+                status, body = "404 Not Found", b"Not found\n"
+            writer.write(f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                         f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError) as e:
+            self.logger.debug(f"Metrics request failed: {str(e)}")
+        except Exception as e:
+            self.logger.error(f"Error serving metrics: {str(e)}", exc_info=True)
+        finally:
+            writer.close()
\ No newline at end of file
@@ -0,0 +1,373 @@
+"""Local stand-in for the ExpertOption WebSocket server.
+
+Speaks the subset of the protocol the client uses so the API can be
+benchmarked and regression-tested without the real endpoint. Responses echo
+the request ``ns``; candle streams, history and order settlement are
+synthetic and deterministic for a given seed.
+
+Usage:
+    python -m Expert.mock_server [--port 8765] [--assets 20] [--candle-rate 1]
+                                 [--latency 0.02] [--jitter 0.01]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import time
+from typing import Dict, List, Optional, Set
+import websockets
+
+class MockExpertOptionServer:
+    """Asyncio WebSocket server imitating ExpertOption.
+
+    Handles ``multipleAction``, ``profile``, ``assets``, ``setContext``,
+    ``subscribeCandles``, ``assetHistoryCandles``, ``expertOption``,
+    ``openOptions``, ``tradeHistory``, ``ping`` and ``tradersChoice``.
+    Any other action is acknowledged with an empty message.
+
+    The extra ``mockBlast`` action makes the server push ``count`` candle
+    frames as fast as possible, followed by a ``mockBlastDone`` frame, so
+    benchmarks can drive the client from another process.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, assets: int = 20, candle_rate: float = 1.0,
+                 latency: float = 0.0, jitter: float = 0.0, malformed_rate: float = 0.0,
+                 disconnect_after: Optional[float] = None, settle_after: Optional[float] = None,
+                 max_history_candles: int = 1000, payout: int = 80, seed: int = 1):
+        """Initialize the mock server.
+        
+        Args:
+            host: Interface to listen on.
+            port: Port to listen on (0 picks a free port).
+            assets: Number of synthetic assets.
+            candle_rate: Candle pushes per second per subscribed asset.
+            latency: Mean delay added to every response in seconds.
+            jitter: Maximum random deviation from the latency in seconds.
+            malformed_rate: Probability that a candle push is replaced by a malformed frame.
+            disconnect_after: Close each connection after this many seconds, or None.
+            settle_after: Settle orders this many seconds after placement instead of at expiration.
+            max_history_candles: Maximum candles returned per history request.
+            payout: Profit percentage paid on winning orders.
+            seed: Random seed for prices and order outcomes.
+        """
+        self.host = host
+        self.port = port
+        self.asset_count = assets
+        self.candle_rate = candle_rate
+        self.latency = latency
+        self.jitter = jitter
+        self.malformed_rate = malformed_rate
+        self.disconnect_after = disconnect_after
+        self.settle_after = settle_after
+        self.max_history_candles = max_history_candles
+        self.payout = payout
+        self.logger = logging.getLogger("MockExpertOptionServer")
+        self._random = random.Random(seed)
+        self._server = None
+        self._connections: Set = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._next_order_id = 1
+        self.options: Dict[int, Dict] = {}
+        self.balance = 10000.0
+        self.demo_balance = 10000.0
+        # Counters for benchmarks and tests
+        self.frames_received = 0
+        self.frames_sent = 0
+        self.actions: Dict[str, int] = {}
+
+    @property
+    def uri(self) -> str:
+        """Get the WebSocket URI clients should connect to."""
+        return f"ws://{self.host}:{self.port}"
+
+    @property
+    def asset_ids(self) -> List[int]:
+        """Get the IDs of the synthetic assets."""
+        return list(range(1, self.asset_count + 1))
+
+    async def start(self) -> "MockExpertOptionServer":
+        """Start listening."""
+        self._server = await websockets.serve(self._handler, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.logger.info(f"Mock server listening on {self.uri}")
+        return self
+
+    async def stop(self):
+        """Close every connection and stop listening."""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "MockExpertOptionServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    def _spawn(self, coroutine) -> asyncio.Task:
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def drop_connections(self):
+        """Close every client connection, as a network failure would."""
+        for websocket in list(self._connections):
+            await websocket.close(code=1001, reason="mock disconnect")
+
+    async def send_malformed(self):
+        """Send a frame that is not valid JSON to every client."""
+        for websocket in list(self._connections):
+            await self._send_raw(websocket, '{"action": "candles", "message": ')
+
+    def price(self, asset_id: int, timestamp: float) -> float:
+        """Deterministic synthetic price of an asset at a time."""
+        base = 1.0 + asset_id / 10
+        return round(base + 0.01 * math.sin(timestamp / 60 + asset_id) + 0.002 * math.sin(timestamp / 7), 6)
+
+    def candle(self, asset_id: int, start: int, timeframe: int) -> List[float]:
+        """Synthetic [open, high, low, close] candle starting at a time."""
+        open_ = self.price(asset_id, start)
+        close = self.price(asset_id, start + max(timeframe, 1))
+        return [open_, round(max(open_, close) + 0.0005, 6), round(min(open_, close) - 0.0005, 6), close]
+
+    def expirations(self, now: Optional[int] = None) -> List[int]:
+        """Upcoming expiration times at whole minutes."""
+        now = int(time.time()) if now is None else now
+        first = now - now % 60 + 60
+        return [first + 60 * i for i in range(5)]
+
+    def _asset(self, asset_id: int) -> Dict:
+        return {
+            "id": asset_id,
+            "name": f"Mock Asset {asset_id}",
+            "symbol": f"MOCK{asset_id}",
+            "asset_group_id": 1 + asset_id % 3,
+            "is_active": 1,
+            "profit": self.payout,
+            "rates": [{"expirations": self.expirations()}],
+        }
+
+    async def _send_raw(self, websocket, frame: str):
+        try:
+            await websocket.send(frame)
+            self.frames_sent += 1
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+    async def _reply(self, websocket, action: str, message, ns: Optional[str]):
+        """Send a response after the configured latency."""
+        delay = self.latency + (self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await self._send_raw(websocket, json.dumps({"action": action, "message": message, "ns": ns}))
+
+    async def _handler(self, websocket, path: Optional[str] = None):
+        self._connections.add(websocket)
+        session = {"subscriptions": {}, "is_demo": 1}
+        tasks = [self._spawn(self._stream_candles(websocket, session))]
+        if self.disconnect_after is not None:
+            tasks.append(self._spawn(self._disconnect_later(websocket)))
+        try:
+            async for frame in websocket:
+                self.frames_received += 1
+                try:
+                    data = json.loads(frame)
+                except ValueError:
+                    await self._reply(websocket, "error", {"message": "Invalid JSON"}, None)
+                    continue
+                await self._dispatch(websocket, session, data)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            self._connections.discard(websocket)
+            for task in tasks:
+                task.cancel()
+
+    async def _disconnect_later(self, websocket):
+        await asyncio.sleep(self.disconnect_after)
+        await websocket.close(code=1001, reason="mock disconnect")
+
+    async def _dispatch(self, websocket, session: Dict, data: Dict):
+        action = data.get("action")
+        ns = data.get("ns")
+        message = data.get("message") or {}
+        self.actions[action] = self.actions.get(action, 0) + 1
+        if action == "multipleAction":
+            for sub in message.get("actions", []):
+                await self._dispatch(websocket, session, sub)
+            return
+        handler = getattr(self, f"_on_{action}", None)
+        if handler is None:
+            self._spawn(self._reply(websocket, action, {}, ns))
+            return
+        result = handler(websocket, session, message)
+        if result is not None:
+            self._spawn(self._reply(websocket, result[0], result[1], ns))
+
+    def _on_profile(self, websocket, session, message):
+        return "profile", {"profile": {"id": 1, "name": "mock", "balance": self.balance,
+                                       "demo_balance": self.demo_balance, "currency": "USD"}}
+
+    def _on_assets(self, websocket, session, message):
+        return "assets", {"assets": [self._asset(asset_id) for asset_id in self.asset_ids]}
+
+    def _on_getCandlesTimeframes(self, websocket, session, message):
+        return "getCandlesTimeframes", {"timeframes": [0, 5, 10, 15, 30, 60, 120, 300, 600, 900, 1800, 3600]}
+
+    def _on_setContext(self, websocket, session, message):
+        session["is_demo"] = message.get("is_demo", 1)
+        return "setContext", {"is_demo": session["is_demo"]}
+
+    def _on_ping(self, websocket, session, message):
+        return "ping", {"t": int(time.time())}
+
+    def _on_tradersChoice(self, websocket, session, message):
+        choices = []
+        for asset_id in message.get("assets", []):
+            put = self._random.randint(20, 80)
+            choices.append({"asset_id": asset_id, "put": put, "call": 100 - put})
+        return "tradersChoice", {"choices": choices}
+
+    def _on_subscribeCandles(self, websocket, session, message):
+        now = int(time.time())
+        timeframes = message.get("timeframes") or [5]
+        timeframes = timeframes if isinstance(timeframes, list) else [timeframes]
+        entries = []
+        for asset_id in message.get("assetsIds", []):
+            session["subscriptions"][asset_id] = timeframes
+            for timeframe in timeframes:
+                entries.append(self._candle_entry(asset_id, timeframe, now))
+        return "candles", {"candles": entries}
+
+    def _candle_entry(self, asset_id: int, timeframe: int, now: int) -> Dict:
+        start = now - now % timeframe if timeframe else now
+        return {"assetId": asset_id, "tf": timeframe, "t": now,
+                "periods": [[start, [self.candle(asset_id, start, timeframe)]]]}
+
+    def _on_assetHistoryCandles(self, websocket, session, message):
+        asset_id = message.get("assetid")
+        timeframes = message.get("timeframes") or [5]
+        entries = []
+        for timeframe in timeframes:
+            step = max(timeframe, 1)
+            periods = []
+            remaining = self.max_history_candles
+            for start, end in message.get("periods", []):
+                first = start - start % step
+                count = max(0, min(remaining, (end - first + step - 1) // step))
+                remaining -= count
+                periods.append([first, [self.candle(asset_id, first + i * step, step) for i in range(count)]])
+            entries.append({"assetId": asset_id, "tf": timeframe, "periods": periods})
+        return "assetHistoryCandles", {"candles": entries}
+
+    def _on_expertOption(self, websocket, session, message):
+        now = int(time.time())
+        placed = []
+        for opt in message.get("options", []):
+            order_id = self._next_order_id
+            self._next_order_id += 1
+            option = {
+                "id": order_id,
+                "asset_id": opt.get("asset_id"),
+                "amount": opt.get("amount"),
+                "direction": opt.get("direction"),
+                "expired": opt.get("expired"),
+                "strike_time": opt.get("strike_time", now),
+                "is_demo": opt.get("is_demo", session["is_demo"]),
+                "strike_rate": self.price(opt.get("asset_id") or 0, now),
+                "status": 0,
+            }
+            self.options[order_id] = option
+            placed.append(option)
+            settle_in = self.settle_after if self.settle_after is not None else max(0, (opt.get("expired") or now) - now)
+            self._spawn(self._settle_later(websocket, order_id, settle_in))
+        return "expertOption", {"options": placed}
+
+    async def _settle_later(self, websocket, order_id: int, delay: float):
+        await asyncio.sleep(delay)
+        option = self.options[order_id]
+        won = self._random.random() < 0.5
+        option["status"] = 1
+        option["profit"] = round(option["amount"] * self.payout / 100, 2) if won else -option["amount"]
+        if option["is_demo"]:
+            self.demo_balance += option["profit"]
+        else:
+            self.balance += option["profit"]
+        await self._reply(websocket, "tradeHistory", {"trades": [dict(option)]}, None)
+
+    def _on_openOptions(self, websocket, session, message):
+        return "openOptions", {"options": [dict(o) for o in self.options.values() if not o["status"]]}
+
+    def _on_tradeHistory(self, websocket, session, message):
+        closed = [dict(o) for o in self.options.values() if o["status"]]
+        count = message.get("count", 20)
+        return "tradeHistory", {"trades": closed[-count:]}
+
+    def _on_mockBlast(self, websocket, session, message):
+        count = int(message.get("count", 1000))
+        asset_ids = message.get("assets") or self.asset_ids
+        self._spawn(self._blast(websocket, count, asset_ids, message.get("timeframe", 5)))
+        return "mockBlast", {"count": count}
+
+    async def _blast(self, websocket, count: int, asset_ids: List[int], timeframe: int):
+        """Push candle frames back to back, then a mockBlastDone marker."""
+        start = int(time.time()) - count * timeframe
+        for i in range(count):
+            asset_id = asset_ids[i % len(asset_ids)]
+            timestamp = start + (i // len(asset_ids)) * timeframe
+            entry = {"assetId": asset_id, "tf": timeframe, "t": timestamp,
+                     "periods": [[timestamp, [self.candle(asset_id, timestamp, timeframe)]]]}
+            await self._send_raw(websocket, json.dumps({"action": "candles", "message": {"candles": [entry]},
+                                                        "ns": None}))
+        await self._send_raw(websocket, json.dumps({"action": "mockBlastDone", "message": {"count": count}, "ns": None}))
+
+    async def _stream_candles(self, websocket, session: Dict):
+        """Push candles for subscribed assets at the configured rate."""
+        if self.candle_rate <= 0:
+            return
+        interval = 1.0 / self.candle_rate
+        while True:
+            await asyncio.sleep(interval)
+            subscriptions = session["subscriptions"]
+            if not subscriptions:
+                continue
+            now = int(time.time())
+            for asset_id, timeframes in list(subscriptions.items()):
+                if self.malformed_rate and self._random.random() < self.malformed_rate:
+                    await self._send_raw(websocket, '{"action": "candles", "message": {"candles": [')
+                    continue
+                entries = [self._candle_entry(asset_id, timeframe, now) for timeframe in timeframes]
+                await self._send_raw(websocket, json.dumps({"action": "candles", "message": {"candles": entries},
+                                                            "ns": None}))
+
+async def _main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--assets", type=int, default=20)
+    parser.add_argument("--candle-rate", type=float, default=1.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--disconnect-after", type=float, default=None)
+    parser.add_argument("--settle-after", type=float, default=None)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    server = MockExpertOptionServer(args.host, args.port, assets=args.assets, candle_rate=args.candle_rate,
+                                    latency=args.latency, jitter=args.jitter, malformed_rate=args.malformed_rate,
+                                    disconnect_after=args.disconnect_after, settle_after=args.settle_after)
+    async with server:
+        print(f"Mock ExpertOption server on {server.uri}")
+        await asyncio.Future()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        pass
\ No newline at end of file
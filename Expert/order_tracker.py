@@ -0,0 +1,125 @@
+"""Event-driven order settlement tracking for the ExpertOption API."""
+import asyncio
+import logging
+from typing import Dict, List, Optional
+from Expert.ws.objects.order import Order
+
+ORDER_ACTIONS = ("expertOption", "openOptions", "tradeHistory")
+
+class OrderTracker:
+    """Keeps the order cache up to date from inbound order messages.
+
+    Every ``expertOption``, ``openOptions`` and ``tradeHistory`` message is
+    consumed once by the receive loop and applied to the cached orders in
+    place. Callers waiting on an order are woken when it settles, so no
+    polling coroutine is needed per open order.
+    """
+
+    def __init__(self, order_cache: Dict[int, Order]):
+        """Initialize the order tracker.
+        
+        Args:
+            order_cache: Mapping of order ID to Order, updated in place.
+        """
+        self.logger = logging.getLogger("OrderTracker")
+        self.order_cache = order_cache
+        self._waiters: Dict[int, List[asyncio.Future]] = {}
+
+    @staticmethod
+    def is_settled(order: Optional[Order]) -> bool:
+        """Check whether an order has closed (status other than 0 / unknown)."""
+        return order is not None and order.status not in (None, 0)
+
+    def ingest(self, action: str, message: Dict) -> int:
+        """Apply an inbound order message to the cache.
+        
+        Orders are read from ``message["options"]`` (or ``message["trades"]``
+        for trade history). Orders listed in ``tradeHistory`` are closed.
+        
+        Args:
+            action: The message action.
+            message: The ``message`` field of the inbound message.
+        
+        Returns:
+            The number of orders updated.
+        """
+        if not isinstance(message, dict):
+            return 0
+        updated = 0
+        for opt in message.get("options") or message.get("trades") or []:
+            order_id = opt.get("id") if isinstance(opt, dict) else None
+            if order_id is None:
+                continue
+            order = self.order_cache.get(order_id)
+            if order is None:
+                order = self.order_cache[order_id] = self._order_from_option(opt)
+            status = opt.get("status")
+            if status is not None:
+                order.status = status
+            elif action == "tradeHistory" and order.status in (None, 0):
+                order.status = 1
+            profit = opt.get("profit")
+            if profit is not None:
+                order.profit = profit
+            updated += 1
+            if self.is_settled(order):
+                self._resolve(order_id, order)
+        return updated
+
+    @staticmethod
+    def _order_from_option(opt: Dict) -> Order:
+        """Create an Order for an option that was not placed by this client."""
+        order = Order()
+        order.order_id = opt.get("id")
+        order.asset_id = opt.get("asset_id")
+        order.amount = opt.get("amount")
+        order.direction = opt.get("direction")
+        order.strike_time = opt.get("strike_time")
+        order.exp_time = opt.get("expired")
+        return order
+
+    def _resolve(self, order_id: int, order: Order):
+        """Wake every caller waiting on a settled order."""
+        for future in self._waiters.pop(order_id, []):
+            if not future.done():
+                future.set_result(order)
+
+    async def wait_settled(self, order_id: int, timeout: Optional[float] = None) -> Order:
+        """Wait until an order settles.
+        
+        Args:
+            order_id: The ID of the order.
+            timeout: Maximum time to wait, or None to wait indefinitely.
+        
+        Returns:
+            The settled order with its final status and profit.
+        
+        Raises:
+            asyncio.TimeoutError: If the order does not settle within the timeout.
+        """
+        order = self.order_cache.get(order_id)
+        if self.is_settled(order):
+            return order
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(order_id, []).append(future)
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            waiters = self._waiters.get(order_id)
+            if waiters and future in waiters:
+                waiters.remove(future)
+                if not waiters:
+                    del self._waiters[order_id]
+
+    def fail_all(self, error: Exception):
+        """Fail every pending waiter with the given error."""
+        for waiters in self._waiters.values():
+            for future in waiters:
+                if not future.done():
+                    future.set_exception(error)
+        self._waiters.clear()
+
+    @property
+    def open_orders(self) -> List[Order]:
+        """Get cached orders that have not settled yet."""
+        return [order for order in self.order_cache.values() if not self.is_settled(order)]
\ No newline at end of file
@@ -0,0 +1,208 @@
+"""Connection pool spreading candle subscriptions over several WebSockets."""
+import asyncio
+import bisect
+import hashlib
+import logging
+from collections import ChainMap
+from typing import Dict, Iterable, List, Optional
+from Expert.api import ExpertOptionAPI
+from Expert.candle_store import CandleStore
+from Expert.clock import ServerClock
+from Expert.ws.objects.order import Order
+
+class ConnectionPool:
+    """Several ExpertOption connections sharing one token, store and clock.
+
+    Candle subscriptions are assigned to ``size`` candle connections by
+    consistent hashing of the asset ID, so each asset always lands on the
+    same socket and resizing the pool moves as few assets as possible.
+    Orders, balance and settlement go through one dedicated connection
+    that carries no candle traffic.
+
+    All connections write into the same CandleStore and ServerClock, so
+    reads do not depend on which socket an asset is routed to.
+    """
+
+    def __init__(self, token: str, demo: bool = True, server_region: str = "wss://fr24g1us.expertoption.finance/ws/v40",
+                 size: int = 4, replicas: int = 64, **api_kwargs):
+        """Initialize the connection pool.
+        
+        Args:
+            token: Authentication token for the ExpertOption server.
+            demo: True for demo mode, False for real trading.
+            server_region: WebSocket server URI.
+            size: Number of candle connections.
+            replicas: Points per connection on the hash ring.
+            **api_kwargs: Extra arguments for each ExpertOptionAPI.
+        """
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.logger = logging.getLogger("ConnectionPool")
+        self.candle_store = CandleStore()
+        self.server_clock = ServerClock()
+        self.order_api = self._create_api(token, demo, server_region, api_kwargs)
+        self.candle_apis = [self._create_api(token, demo, server_region, api_kwargs) for _ in range(size)]
+        self._ring: List[int] = []
+        self._ring_apis: List[ExpertOptionAPI] = []
+        points = sorted((self._hash(f"{index}:{replica}"), index)
+                        for index in range(size) for replica in range(replicas))
+        for point, index in points:
+            self._ring.append(point)
+            self._ring_apis.append(self.candle_apis[index])
+
+    def _create_api(self, token: str, demo: bool, server_region: str, api_kwargs: Dict) -> ExpertOptionAPI:
+        """Create a connection that writes into the shared store and clock."""
+        api = ExpertOptionAPI(token, demo=demo, server_region=server_region, **api_kwargs)
+        api.candle_store = self.candle_store
+        api.server_clock = self.server_clock
+        return api
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        """Hash a key onto the ring."""
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+    def connection_for(self, asset_id: int) -> ExpertOptionAPI:
+        """Get the candle connection an asset is routed to.
+        
+        Args:
+            asset_id: The ID of the asset.
+        
+        Returns:
+            The connection that owns the asset's candle subscription.
+        """
+        index = bisect.bisect(self._ring, self._hash(str(asset_id))) % len(self._ring)
+        return self._ring_apis[index]
+
+    @property
+    def connections(self) -> List[ExpertOptionAPI]:
+        """Get every connection, the order connection first."""
+        return [self.order_api] + self.candle_apis
+
+    @property
+    def connected(self) -> bool:
+        """Check whether every connection is up."""
+        return all(api.connected for api in self.connections)
+
+    @property
+    def active_assets(self) -> Dict[int, Dict]:
+        """Get the active assets known to the order connection."""
+        return self.order_api.active_assets
+
+    @property
+    def asset_registry(self):
+        """Get the asset registry of the order connection."""
+        return self.order_api.asset_registry
+
+    @property
+    def profile(self):
+        """Get the user profile."""
+        return self.order_api.profile
+
+    @property
+    def order_cache(self) -> Dict[int, Order]:
+        """Get the order cache of the order connection."""
+        return self.order_api.order_cache
+
+    @property
+    def candle_cache(self) -> ChainMap:
+        """Get the latest subscription responses of all candle connections, keyed by asset ID."""
+        return ChainMap(*(api.candle_cache for api in self.candle_apis))
+
+    @property
+    def subscriptions(self) -> Dict[int, List[int]]:
+        """Get the active candle subscriptions of all candle connections."""
+        return dict(ChainMap(*(api.subscriptions for api in self.candle_apis)))
+
+    async def connect(self, max_retries: int = 3, retry_delay: float = 5.0):
+        """Connect every connection concurrently.
+        
+        Args:
+            max_retries: Maximum number of connection retries per connection.
+            retry_delay: Delay between retries in seconds.
+        
+        Raises:
+            ConnectionError: If any connection fails after all retries.
+        """
+        await asyncio.gather(*(api.connect(max_retries, retry_delay) for api in self.connections))
+        self.logger.info(f"Connected pool with {len(self.candle_apis)} candle connections and 1 order connection")
+
+    async def disconnect(self):
+        """Disconnect every connection."""
+        await asyncio.gather(*(api.disconnect() for api in self.connections))
+        self.logger.info("Disconnected connection pool")
+
+    async def get_candles(self, asset_id: int, timeframes: List[int] = [0, 5]) -> Dict:
+        """Subscribe to real-time candle data on the connection the asset is routed to.
+        
+        Args:
+            asset_id: The ID of the asset.
+            timeframes: List of timeframes (e.g., [0, 5] for tick and 5-second candles).
+        
+        Returns:
+            The candle data.
+        """
+        return await self.connection_for(asset_id).get_candles(asset_id, timeframes)
+
+    async def subscribe_many(self, asset_ids: Iterable[int], timeframes: List[int] = [0, 5]) -> Dict[int, Optional[Dict]]:
+        """Subscribe to many assets concurrently across the candle connections.
+        
+        Args:
+            asset_ids: IDs of the assets.
+            timeframes: List of timeframes for every asset.
+        
+        Returns:
+            Mapping of asset ID to candle data, or None if the subscription failed.
+        """
+        asset_ids = list(asset_ids)
+        responses = await asyncio.gather(*(self.get_candles(asset_id, timeframes) for asset_id in asset_ids),
+                                         return_exceptions=True)
+        results = {}
+        for asset_id, response in zip(asset_ids, responses):
+            if isinstance(response, Exception):
+                self.logger.error(f"Failed to subscribe to asset ID {asset_id}: {str(response)}")
+                response = None
+            results[asset_id] = response
+        return results
+
+    async def place_order(self, asset_id: int, amount: float, direction: str = "call") -> int:
+        """Place a trading order on the order connection.
+        
+        Args:
+            asset_id: The ID of the asset.
+            amount: The investment amount.
+            direction: The trade direction ("call" or "put").
+        
+        Returns:
+            The order ID.
+        """
+        return await self.order_api.place_order(asset_id, amount, direction)
+
+    async def place_orders(self, legs: List[Dict], max_legs_per_frame: int = 20) -> List[Optional[Order]]:
+        """Place several orders on the order connection (see ExpertOptionAPI.place_orders)."""
+        return await self.order_api.place_orders(legs, max_legs_per_frame)
+
+    async def place_order_by_symbol(self, symbol: str, amount: float, direction: str = "call") -> int:
+        """Place a trading order by asset symbol on the order connection."""
+        return await self.order_api.place_order_by_symbol(symbol, amount, direction)
+
+    async def wait_settled(self, order_id: int, timeout: Optional[float] = None) -> Order:
+        """Wait until a trading order settles (see ExpertOptionAPI.wait_settled)."""
+        return await self.order_api.wait_settled(order_id, timeout)
+
+    async def check_order_status(self, order_id: int, timeout: float = 60.0) -> Optional[Order]:
+        """Check the status of a trading order (see ExpertOptionAPI.check_order_status)."""
+        return await self.order_api.check_order_status(order_id, timeout)
+
+    def get_balance(self) -> float:
+        """Get the current account balance."""
+        return self.order_api.get_balance()
+
+    def metrics_snapshot(self) -> Dict:
+        """Get the metrics of every connection (see ExpertOptionAPI.metrics_snapshot)."""
+        return {"order": self.order_api.metrics_snapshot(),
+                "candles": [api.metrics_snapshot() for api in self.candle_apis]}
+
+    def distribution(self) -> Dict[int, int]:
+        """Get the number of subscribed assets per candle connection, by connection index."""
+        return {index: len(api.subscriptions) for index, api in enumerate(self.candle_apis)}
\ No newline at end of file
@@ -0,0 +1,186 @@
+"""Symbol to asset ID resolution built from the live asset catalog."""
+import json
+import logging
+import os
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from Expert.utils import normalize_symbol
+from Expert.ws.messages import AssetInfo
+
+def symbol_aliases(symbol: Optional[str], name: Optional[str]) -> List[str]:
+    """Get the normalized aliases an asset can be looked up by.
+
+    Args:
+        symbol: The server symbol (e.g., 'EURUSD_otc').
+        name: The display name (e.g., 'EUR/USD OTC').
+
+    Returns:
+        Normalized aliases, the symbol's first (e.g., ['EURUSDOTC']).
+    """
+    aliases = []
+    for value in (symbol, name):
+        if value:
+            alias = normalize_symbol(value)
+            if alias and alias not in aliases:
+                aliases.append(alias)
+    return aliases
+
+def resolution_rank(asset_id: int, active: bool, own_symbol: bool) -> Tuple[bool, bool, int]:
+    """Get the sort key choosing among assets that share an alias (lowest wins).
+
+    An active asset wins over an inactive one, then an asset whose own
+    symbol is the alias wins over a name match, then the lowest ID.
+    """
+    return (not active, not own_symbol, asset_id)
+
+class SymbolTable:
+    """Resolves symbols and names to asset IDs in O(1).
+
+    Fed by AssetRegistry updates, so it follows the server catalog instead
+    of the static constants.ASSET_MAPPING. Lookups ignore case and
+    separators (``eurusd_otc``, ``EURUSD-OTC`` and ``EUR/USD OTC`` are the
+    same). When several assets share an alias, resolution_rank() picks one.
+
+    Listeners are called with ``{alias: asset_id or None}`` for every alias
+    whose resolution changed.
+    """
+
+    def __init__(self, snapshot_path: Optional[str] = None):
+        """Initialize the table, loading the snapshot if it exists.
+        
+        Args:
+            snapshot_path: JSON file written by save() and read at startup,
+                so symbols resolve before the first assets response.
+        """
+        self.snapshot_path = snapshot_path
+        self.logger = logging.getLogger("SymbolTable")
+        # Asset ID -> (symbol, name, is_active)
+        self._assets: Dict[int, Tuple[Optional[str], Optional[str], bool]] = {}
+        self._candidates: Dict[str, Set[int]] = {}
+        self._resolved: Dict[str, int] = {}
+        self._listeners: List[Callable[[Dict[str, Optional[int]]], None]] = []
+        if snapshot_path and os.path.exists(snapshot_path):
+            self.load(snapshot_path)
+
+    def __len__(self) -> int:
+        return len(self._resolved)
+
+    def __contains__(self, symbol: str) -> bool:
+        return normalize_symbol(symbol) in self._resolved
+
+    def add_listener(self, listener: Callable[[Dict[str, Optional[int]]], None]):
+        """Register a callback for changed resolutions."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[Dict[str, Optional[int]]], None]):
+        """Unregister a callback added with add_listener()."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def resolve(self, symbol: str) -> Optional[int]:
+        """Get the asset ID for a symbol or name.
+        
+        Returns:
+            The asset ID, or None if no asset has that alias.
+        """
+        return self._resolved.get(normalize_symbol(symbol))
+
+    def is_active(self, asset_id: int) -> bool:
+        """Check whether an asset was active in the latest catalog."""
+        entry = self._assets.get(asset_id)
+        return entry is not None and entry[2]
+
+    def symbols(self, active_only: bool = True) -> Dict[str, int]:
+        """Get the server symbol of each asset mapped to its ID.
+        
+        Args:
+            active_only: Leave out inactive assets.
+        """
+        return {symbol: asset_id for asset_id, (symbol, _, active) in self._assets.items()
+                if symbol and (active or not active_only)}
+
+    def update(self, assets: Iterable[AssetInfo]):
+        """Apply added or changed assets (an AssetRegistry listener).
+        
+        Args:
+            assets: The changed assets.
+        """
+        touched: Set[str] = set()
+        for info in assets:
+            entry = (info.symbol, info.name, bool(info.is_active))
+            previous = self._assets.get(info.id)
+            if previous == entry:
+                continue
+            if previous is not None:
+                for alias in symbol_aliases(previous[0], previous[1]):
+                    self._candidates[alias].discard(info.id)
+                    touched.add(alias)
+            self._assets[info.id] = entry
+            for alias in symbol_aliases(info.symbol, info.name):
+                self._candidates.setdefault(alias, set()).add(info.id)
+                touched.add(alias)
+        changes = {}
+        for alias in touched:
+            winner = self._pick(alias)
+            if winner != self._resolved.get(alias):
+                changes[alias] = winner
+                if winner is None:
+                    del self._resolved[alias]
+                else:
+                    self._resolved[alias] = winner
+        if changes:
+            self.logger.debug(f"{len(changes)} symbol resolutions changed")
+            for listener in list(self._listeners):
+                try:
+                    listener(changes)
+                except Exception as e:
+                    self.logger.error(f"Symbol listener failed: {str(e)}", exc_info=True)
+
+    def _pick(self, alias: str) -> Optional[int]:
+        """Choose among the assets sharing an alias."""
+        candidates = self._candidates.get(alias)
+        if not candidates:
+            self._candidates.pop(alias, None)
+            return None
+        
+        def rank(asset_id: int):
+            symbol, _, active = self._assets[asset_id]
+            return resolution_rank(asset_id, active, bool(symbol) and normalize_symbol(symbol) == alias)
+        return min(candidates, key=rank)
+
+    def save(self, path: Optional[str] = None):
+        """Write a snapshot of the table atomically.
+        
+        Args:
+            path: Destination file (defaults to snapshot_path).
+        """
+        path = path or self.snapshot_path
+        if not path:
+            return
+        snapshot = {
+            "saved_at": time.time(),
+            "assets": [{"id": asset_id, "symbol": symbol, "name": name, "is_active": int(active)}
+                       for asset_id, (symbol, name, active) in self._assets.items()],
+        }
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(temporary, path)
+        except OSError as e:
+            self.logger.warning(f"Failed to save symbol snapshot {path}: {str(e)}")
+
+    def load(self, path: str):
+        """Apply a snapshot written by save().
+        
+        Entries from the live catalog received later replace it.
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable symbol snapshot {path}: {str(e)}")
+            return
+        self.update(AssetInfo.from_dict(asset) for asset in snapshot.get("assets", []) if asset.get("id") is not None)
+        self.logger.info(f"Loaded {len(self._assets)} assets from symbol snapshot {path}")
\ No newline at end of file
@@ -17,6 +17,17 @@ def validate_asset_id(asset_id: int, active_assets: dict) -> bool:
     """
     return asset_id in active_assets
 
+def normalize_symbol(symbol: str) -> str:
+    """Normalize a symbol for lookups by upper-casing it and dropping separators.
+
+    Args:
+        symbol: The symbol or pair name (e.g., 'eur/usd', 'EUR-USD').
+
+    Returns:
+        The normalized symbol (e.g., 'EURUSD').
+    """
+    return "".join(ch for ch in symbol.upper() if ch.isalnum())
+
 def validate_symbol(symbol: str) -> bool:
     """Validate if a symbol is valid.
     
@@ -27,11 +38,7 @@ def validate_symbol(symbol: str) -> bool:
         True if the symbol is valid, False otherwise.
     """
     from Expert.constants import get_asset_id
-    try:
-        get_asset_id(symbol)
-        return True
-    except KeyError:
-        return False
+    return get_asset_id(symbol) is not None
 
 def validate_expiration_time(expiration_time: int, server_time: int) -> bool:
     """Validate if an expiration time is valid.
@@ -0,0 +1,141 @@
+"""Micro-batching of outbound requests into multipleAction frames."""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+from uuid import uuid4
+from Expert.ws.scheduler import PRIORITY_CLASSES
+
+# Non-urgent actions whose requests may be delayed and bundled
+DEFAULT_BATCHED_ACTIONS: FrozenSet[str] = frozenset({
+    "subscribeCandles", "unsubscribeCandles", "tradersChoice", "assetHistoryCandles",
+})
+
+class RequestBatcher:
+    """Collects requests issued within a short window into one ``multipleAction`` frame.
+
+    The first request of a batch starts a ``window``-second timer; every
+    batched request submitted before it fires joins the same frame, which is
+    sent early once it holds ``max_batch`` requests. A batch of one is sent
+    as-is. Each request keeps its own ``ns``, so the server's responses
+    still resolve the individual WebSocketClient.request() callers.
+    """
+
+    def __init__(self, send: Callable[[Dict, Optional[str]], Awaitable], classify: Callable[[Optional[str]], str],
+                 window: float = 0.002, max_batch: int = 50, actions: Optional[Iterable[str]] = None):
+        """Initialize the batcher.
+        
+        Args:
+            send: Coroutine function sending one payload with a priority class.
+            classify: Function giving the priority class of an action.
+            window: Seconds to wait for more requests after the first of a batch.
+            max_batch: Maximum requests per frame.
+            actions: Actions to batch (defaults to DEFAULT_BATCHED_ACTIONS).
+        
+        Raises:
+            ValueError: If window is negative or max_batch is below 1.
+        """
+        if window < 0 or max_batch < 1:
+            raise ValueError(f"Invalid batching window {window} or max_batch {max_batch}")
+        self.send = send
+        self.classify = classify
+        self.window = window
+        self.max_batch = max_batch
+        self.actions = frozenset(actions) if actions is not None else DEFAULT_BATCHED_ACTIONS
+        self.logger = logging.getLogger("RequestBatcher")
+        self.frames_sent = 0
+        self.requests_sent = 0
+        self._pending: List[Tuple[Dict, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Tasks sending a batch, with the batch, until they finish
+        self._sending: Dict[asyncio.Task, List[Tuple[Dict, asyncio.Future]]] = {}
+
+    def accepts(self, payload: Dict) -> bool:
+        """Check whether a payload may be batched."""
+        return payload.get("action") in self.actions
+
+    async def submit(self, payload: Dict):
+        """Add a payload to the current batch and wait until its frame is sent.
+        
+        Raises:
+            Exception: Whatever sending the frame raised.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((payload, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+        await future
+
+    def _flush(self):
+        """Take the current batch and start sending it."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._send_batch(batch))
+            self._sending[task] = batch
+            task.add_done_callback(self._sent)
+
+    def _sent(self, task: asyncio.Task):
+        self._sending.pop(task, None)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error(f"Sending a batch failed: {str(task.exception())}")
+
+    async def _send_batch(self, batch: List[Tuple[Dict, asyncio.Future]]):
+        payloads = [payload for payload, future in batch if not future.done()]
+        if not payloads:
+            return
+        priority = min((self.classify(payload.get("action")) for payload in payloads), key=PRIORITY_CLASSES.index)
+        if len(payloads) == 1:
+            frame = payloads[0]
+        else:
+            frame = {
+                "action": "multipleAction",
+                "message": {"actions": payloads},
+                "token": payloads[0].get("token"),
+                "ns": str(uuid4())
+            }
+        try:
+            await self.send(frame, priority)
+            self.frames_sent += 1
+            self.requests_sent += len(payloads)
+            error = None
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            error = e
+        for _, future in batch:
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+
+    def fail(self, error: Exception):
+        """Fail every request waiting for its batch to be sent, cancelling batches being sent."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batches = [self._pending] + list(self._sending.values())
+        self._pending = []
+        for task in list(self._sending):
+            task.cancel()
+        for batch in batches:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+
+    def snapshot(self) -> Dict:
+        """Get frames and requests sent and the mean batch size."""
+        return {
+            "frames": self.frames_sent,
+            "requests": self.requests_sent,
+            "mean_batch": round(self.requests_sent / self.frames_sent, 2) if self.frames_sent else None,
+            "waiting": len(self._pending),
+            "sending": sum(len(batch) for batch in self._sending.values()),
+        }
\ No newline at end of file
@@ -19,8 +19,6 @@ class AuthenticateChannel(BaseChannel):
             "ns": str(uuid4())
         }
         self.logger.debug(f"Sending authentication request: {payload}")
-        await self.api.websocket_client.send(payload)
-        
-        response = await self.api.websocket_client.recv("authenticate", timeout=20.0)
+        response = await self.api.websocket_client.request(payload, timeout=20.0)
         self.logger.debug(f"Received authentication response: {response}")
         return response
\ No newline at end of file
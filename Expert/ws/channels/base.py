@@ -1,6 +1,7 @@
 """Base channel class for WebSocket channels."""
 import logging
 from typing import Any, Dict
+from uuid import uuid4
 
 class BaseChannel:
     """Base class for WebSocket channels."""
@@ -25,4 +26,26 @@ class BaseChannel:
         Raises:
             NotImplementedError: If not overridden by a subclass.
         """
-        raise NotImplementedError("Subclasses must implement __call__ method")
\ No newline at end of file
+        raise NotImplementedError("Subclasses must implement __call__ method")
+
+    async def send_request(self, action: str, message: Any, timeout: float = 20.0) -> Dict:
+        """Send a request for an action and wait for its correlated response.
+        
+        Args:
+            action: The action name (e.g., 'tradersChoice').
+            message: The message body for the action.
+            timeout: Maximum time to wait for the response.
+        
+        Returns:
+            The server response as a dictionary.
+        """
+        payload = {
+            "action": action,
+            "message": message,
+            "token": self.api.token,
+            "ns": str(uuid4())
+        }
+        self.logger.debug(f"Sending {action} request: {payload}")
+        response = await self.api.websocket_client.request(payload, timeout=timeout)
+        self.logger.debug(f"Received {action} response: {response}")
+        return response
\ No newline at end of file
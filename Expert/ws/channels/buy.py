@@ -1,7 +1,7 @@
 """Buy channel for placing trading orders."""
 import logging
 import time
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from uuid import uuid4
 from Expert.ws.channels.base import BaseChannel
 from Expert.utils import validate_asset_id, validate_expiration_time
@@ -18,7 +18,8 @@ class BuyChannel(BaseChannel):
         super().__init__(api)
         self.logger = logging.getLogger("BuyChannel")
     
-    async def __call__(self, asset_id: int, amount: float, direction: str, exp_time: int, is_demo: bool) -> Dict:
+    async def __call__(self, asset_id: int, amount: float, direction: str, exp_time: int, is_demo: bool,
+                       strike_time: Optional[int] = None) -> Dict:
         """Place a trading order.
         
         Args:
@@ -27,6 +28,44 @@ class BuyChannel(BaseChannel):
             direction: The trade direction ("call" or "put").
             exp_time: The expiration time of the order.
             is_demo: True for demo mode, False for real trading.
+            strike_time: Server time of the order (defaults to the local clock).
+        
+        Returns:
+            The response from the server.
+        """
+        option = self.build_option(asset_id, amount, direction, exp_time, is_demo, strike_time)
+        return await self.send_options([option])
+
+    @staticmethod
+    def build_option(asset_id: int, amount: float, direction: str, exp_time: int, is_demo: bool,
+                     strike_time: Optional[int] = None) -> Dict:
+        """Build a single option entry for an expertOption request.
+        
+        Args:
+            asset_id: The ID of the asset.
+            amount: The investment amount.
+            direction: The trade direction ("call" or "put").
+            exp_time: The expiration time of the order.
+            is_demo: True for demo mode, False for real trading.
+            strike_time: Server time of the order (defaults to the local clock).
+        
+        Returns:
+            The option dictionary.
+        """
+        return {
+            "amount": amount,
+            "asset_id": asset_id,
+            "direction": direction,
+            "expired": exp_time,
+            "is_demo": 1 if is_demo else 0,
+            "strike_time": strike_time if strike_time is not None else int(time.time())
+        }
+
+    async def send_options(self, options: List[Dict]) -> Dict:
+        """Place one or more orders in a single expertOption request.
+        
+        Args:
+            options: Option entries built with build_option().
         
         Returns:
             The response from the server.
@@ -34,22 +73,12 @@ class BuyChannel(BaseChannel):
         payload = {
             "action": "expertOption",
             "message": {
-                "options": [
-                    {
-                        "amount": amount,
-                        "asset_id": asset_id,
-                        "direction": direction,
-                        "expired": exp_time,
-                        "is_demo": 1 if is_demo else 0,
-                        "strike_time": int(time.time())  # Use current time as fallback
-                    }
-                ]
+                "options": options
             },
             "token": self.api.token,
             "ns": str(uuid4())
         }
         self.logger.debug(f"Sending buy request: {payload}")
-        await self.api.websocket_client.send(payload)
-        response = await self.api.websocket_client.recv("expertOption", timeout=20.0)
+        response = await self.api.websocket_client.request(payload, timeout=20.0)
         self.logger.debug(f"Received buy response: {response}")
         return response
\ No newline at end of file
@@ -36,8 +36,8 @@ class CandlesChannel(BaseChannel):
             "ns": str(uuid4())
         }
         self.logger.debug(f"Sending candles subscription request: {payload}")
-        await self.api.websocket_client.send(payload)
-        response = await self.api.websocket_client.recv("candles", timeout=30.0)
+        # Also accept the next candles message until the server is seen echoing ns
+        response = await self.api.websocket_client.request(payload, timeout=30.0, fallback_action="candles")
         if response.get("action") == "error":
             self.logger.error(f"Received error response: {response}")
             raise ValueError(f"Server error: {response.get('message')}")
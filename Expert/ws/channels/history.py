@@ -9,13 +9,14 @@ class HistoryChannel(BaseChannel):
     
     name = "history"
     
-    async def __call__(self, asset_id: int, periods: List[List[int]], timeframe: int = 5):
+    async def __call__(self, asset_id: int, periods: List[List[int]], timeframe: int = 5, timeout: float = 20.0):
         """Fetch historical candle data for a specific asset.
         
         Args:
             asset_id: The ID of the asset.
             periods: List of time periods (e.g., [[start_time, end_time], ...]).
             timeframe: Candle timeframe (e.g., 5 for 5-second candles).
+            timeout: Maximum time to wait for the response.
         
         Returns:
             The historical candle data response.
@@ -31,4 +32,4 @@ class HistoryChannel(BaseChannel):
             "periods": periods,
             "timeframes": [timeframe]
         }
-        return await self.send_request("assetHistoryCandles", message)
\ No newline at end of file
+        return await self.send_request("assetHistoryCandles", message, timeout=timeout)
\ No newline at end of file
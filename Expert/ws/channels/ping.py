@@ -33,8 +33,8 @@ class PingChannel(BaseChannel):
             "ns": str(uuid4())
         }
         self.logger.debug(f"Sending ping request: {payload}")
-        await api.websocket_client.send(payload)
-        response = await api.websocket_client.recv("ping", timeout=20.0)
+        # Also accept the next ping reply until the server is seen echoing ns
+        response = await api.websocket_client.request(payload, timeout=20.0, fallback_action="ping")
         self.logger.debug(f"Received ping response: {response}")
         return response
     
@@ -1,25 +1,67 @@
 """WebSocket client for the ExpertOption API."""
 import asyncio
 import logging
+import time
+from collections import deque
 import websockets
-import json
-from typing import Dict, Optional
+from typing import Callable, Deque, Dict, List, Optional, Set
+from uuid import uuid4
 from Expert.exceptions import ConnectionError
+from Expert.metrics import ClientMetrics
+from Expert.order_tracker import ORDER_ACTIONS
+from Expert.ws.codec import Codec, get_codec
+from Expert.ws.message_queue import BoundedMessageQueue, DROP_OLDEST, COALESCE_LATEST
+from Expert.ws.batcher import RequestBatcher
+from Expert.ws.scheduler import OutboundScheduler
+
+# Live pushes where only the newest message matters
+DEFAULT_QUEUE_POLICIES: Dict[str, str] = {
+    "candles": COALESCE_LATEST,
+    "assets": COALESCE_LATEST,
+    "profile": COALESCE_LATEST,
+}
 
 class WebSocketClient:
     """WebSocket client for communicating with the ExpertOption server."""
     
-    def __init__(self, api):
+    def __init__(self, api, queue_capacity: int = 100, queue_policies: Optional[Dict[str, str]] = None,
+                 codec: Optional[Codec] = None, scheduler: Optional[OutboundScheduler] = None,
+                 batch_window: Optional[float] = None, max_batch: int = 50):
         """Initialize the WebSocket client.
         
         Args:
             api: The ExpertOption API instance.
+            queue_capacity: Maximum number of queued messages per action.
+            queue_policies: Overflow policy per action, merged over DEFAULT_QUEUE_POLICIES.
+            codec: JSON codec for frames (defaults to the fastest installed one).
+            scheduler: Outbound priority scheduler (defaults to one without rate limits).
+            batch_window: Bundle non-urgent requests sent within this many seconds into one
+                multipleAction frame (see Expert.ws.batcher), or None to send each on its own.
+            max_batch: Maximum requests per batched frame.
         """
         self.api = api
         self.websocket: Optional[websockets.WebSocketClientProtocol] = None
         self.logger = logging.getLogger("ExpertOptionWebSocketClient")
-        self.message_queue: Dict[str, asyncio.Queue] = {}
+        self.codec = codec or get_codec()
+        self.message_queue: Dict[str, BoundedMessageQueue] = {}
+        self.queue_capacity = queue_capacity
+        self.queue_policies: Dict[str, str] = {**DEFAULT_QUEUE_POLICIES, **(queue_policies or {})}
+        self.pending_requests: Dict[str, asyncio.Future] = {}
+        # Futures resolved by the next message of an action, whatever its ns (see expect())
+        self.action_waiters: Dict[str, List[asyncio.Future]] = {}
+        # Response actions seen carrying the ns of their request
+        self.ns_echoed: Set[str] = set()
+        # Requests that accept an unmatched message of an action while ns echoing is unconfirmed
+        self.fallback_waiters: Dict[str, Deque[asyncio.Future]] = {}
         self.connected = False
+        self.metrics = ClientMetrics()
+        self.scheduler = scheduler or OutboundScheduler()
+        self.batcher: Optional[RequestBatcher] = None
+        if batch_window is not None:
+            self.batcher = RequestBatcher(self.send, self.scheduler.classify, batch_window, max_batch)
+        # Called with the error when the connection drops without disconnect() being called
+        self.on_connection_lost: Optional[Callable[[Exception], None]] = None
+        self._closing = False
 
     async def connect(self, uri: str):
         """Connect to the WebSocket server.
@@ -37,8 +79,12 @@ class WebSocketClient:
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
                 "Sec-WebSocket-Extensions": "permessage-deflate; client_max_window_bits"
             }
-            self.websocket = await websockets.connect(uri, ping_interval=5, ping_timeout=20, extra_headers=headers)
+            # A small write buffer keeps backlogged frames in the priority scheduler instead of the FIFO transport
+            self.websocket = await websockets.connect(uri, ping_interval=5, ping_timeout=20, extra_headers=headers,
+                                                      write_limit=4096)
             self.connected = True
+            self._closing = False
+            self.scheduler.start(self.websocket.send)
             self.logger.info("WebSocket connection established successfully")
             asyncio.create_task(self._receive_messages())
         except Exception as e:
@@ -48,32 +94,175 @@ class WebSocketClient:
 
     async def disconnect(self):
         """Disconnect from the WebSocket server."""
+        self._closing = True
+        if self.batcher is not None:
+            self.batcher.fail(ConnectionError("WebSocket connection closed"))
+        self.scheduler.stop(ConnectionError("WebSocket connection closed"))
         try:
             if self.websocket and self.connected:
                 await self.websocket.close()
                 self.connected = False
                 self.logger.info("WebSocket connection closed")
+            self._fail_pending_requests(ConnectionError("WebSocket connection closed"))
         except Exception as e:
             self.logger.error(f"Failed to disconnect from WebSocket server: {str(e)}", exc_info=True)
 
-    async def send(self, payload: Dict):
-        """Send a message to the WebSocket server.
+    async def send(self, payload: Dict, priority: Optional[str] = None):
+        """Send a message to the WebSocket server through the outbound scheduler.
         
         Args:
             payload: The message payload to send.
+            priority: Priority class (see Expert.ws.scheduler), overriding the one for the action.
+                Payloads with an explicit priority are never batched.
         
         Raises:
             ConnectionError: If not connected or sending fails.
         """
+        if self.batcher is not None and priority is None and self.batcher.accepts(payload):
+            if not self.connected or not self.websocket:
+                raise ConnectionError("Not connected to WebSocket server")
+            # Raises the ConnectionError of the send() call that carries the batch
+            await self.batcher.submit(payload)
+            return
         try:
             if not self.connected or not self.websocket:
                 raise ConnectionError("Not connected to WebSocket server")
-            await self.websocket.send(json.dumps(payload))
-            self.logger.debug(f"Sent message: {json.dumps(payload, indent=2)}")
+            message = self.codec.dumps(payload)
+            await self.scheduler.submit(message, payload.get("action"), priority)
+            self.metrics.observe_sent(payload.get("action"), len(message))
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Sent message: {message}")
         except Exception as e:
             self.logger.error(f"Failed to send message: {str(e)}", exc_info=True)
             raise ConnectionError(f"Failed to send message: {str(e)}")
 
+    async def request(self, payload: Dict, timeout: float = 20.0, priority: Optional[str] = None,
+                      fallback_action: Optional[str] = None) -> Dict:
+        """Send a request and wait for the response carrying the same ``ns``.
+        
+        Each request gets its own future in ``pending_requests``, so concurrent
+        requests for the same action never receive each other's responses.
+        
+        With ``fallback_action``, a message of that action that matches no
+        pending ``ns`` is also accepted (oldest request first) until a
+        response of that action has been seen echoing its request's ``ns``
+        (see ns_echoed), for servers that do not echo it.
+        
+        Args:
+            payload: The message payload to send. A fresh ``ns`` is added if missing.
+            timeout: Maximum time to wait for the response.
+            priority: Priority class, overriding the one for the action.
+            fallback_action: Action of the response to accept while ns echoing is unconfirmed.
+        
+        Returns:
+            The response message.
+        
+        Raises:
+            asyncio.TimeoutError: If no response is received within the timeout.
+            ConnectionError: If sending fails or the connection is lost.
+        """
+        ns = payload.get("ns")
+        if not ns:
+            ns = payload["ns"] = str(uuid4())
+        action = payload.get("action")
+        future = asyncio.get_running_loop().create_future()
+        self.pending_requests[ns] = future
+        fallback = None
+        if fallback_action is not None and fallback_action not in self.ns_echoed:
+            fallback = asyncio.get_running_loop().create_future()
+            self.fallback_waiters.setdefault(fallback_action, deque()).append(fallback)
+        started = time.perf_counter()
+        try:
+            await self.send(payload, priority)
+            if fallback is None:
+                response = await asyncio.wait_for(future, timeout=timeout)
+            else:
+                done, _ = await asyncio.wait((future, fallback), timeout=timeout,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    raise asyncio.TimeoutError()
+                # Prefer the ns match when both arrived together
+                response = (future if future in done else fallback).result()
+            self.metrics.observe_request(action, time.perf_counter() - started)
+            return response
+        except asyncio.TimeoutError:
+            self.metrics.increment(self.metrics.request_timeouts, action)
+            self.logger.error(f"Timeout waiting for response to {action} (ns={ns}) after {timeout}s")
+            raise
+        except ConnectionError:
+            self.metrics.increment(self.metrics.request_errors, action)
+            raise
+        finally:
+            self.pending_requests.pop(ns, None)
+            if fallback is not None and not fallback.done():
+                fallback.cancel()
+                waiters = self.fallback_waiters.get(fallback_action)
+                if waiters and fallback in waiters:
+                    waiters.remove(fallback)
+
+    def expect(self, action: str) -> asyncio.Future:
+        """Get a future resolved by the next message received for an action.
+        
+        Unlike request(), the match is on the action alone, so this also
+        catches responses to actions batched inside a multipleAction. Call it
+        before sending the request so a fast response is not missed.
+        
+        Args:
+            action: The action to wait for.
+        
+        Returns:
+            Future resolved with the message, or failed if the connection is lost.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.action_waiters.setdefault(action, []).append(future)
+        return future
+
+    def _fail_pending_requests(self, error: Exception):
+        """Fail every outstanding request and action future with the given error."""
+        for future in self.pending_requests.values():
+            if not future.done():
+                future.set_exception(error)
+        self.pending_requests.clear()
+        for futures in list(self.action_waiters.values()) + list(self.fallback_waiters.values()):
+            for future in futures:
+                if not future.done():
+                    future.set_exception(error)
+        self.action_waiters.clear()
+        self.fallback_waiters.clear()
+
+    def configure_queue(self, action: str, capacity: Optional[int] = None, policy: Optional[str] = None):
+        """Set the capacity and overflow policy of an action's queue.
+        
+        The existing queue is changed in place, so pending recv() calls keep
+        waiting on it; queued messages beyond the new capacity are dropped,
+        oldest first.
+        
+        Args:
+            action: The action whose queue to configure.
+            capacity: Maximum number of queued messages (defaults to queue_capacity).
+            policy: Overflow policy (defaults to the current policy for the action).
+        """
+        policy = policy or self.queue_policies.get(action, DROP_OLDEST)
+        self.queue_policies[action] = policy
+        queue = self.message_queue.get(action)
+        if queue is None:
+            self.message_queue[action] = BoundedMessageQueue(capacity or self.queue_capacity, policy)
+        else:
+            queue.reconfigure(capacity or self.queue_capacity, policy)
+
+    def _get_queue(self, action: str) -> BoundedMessageQueue:
+        """Get the queue for an action, creating it on first use."""
+        queue = self.message_queue.get(action)
+        if queue is None:
+            policy = self.queue_policies.get(action, DROP_OLDEST)
+            queue = self.message_queue[action] = BoundedMessageQueue(self.queue_capacity, policy)
+        return queue
+
+    @property
+    def dropped_messages(self) -> Dict[str, int]:
+        """Get the number of messages dropped per action due to queue overflow."""
+        return {action: queue.dropped for action, queue in self.message_queue.items() if queue.dropped}
+
     async def recv(self, action: str, timeout: float = 20.0) -> Dict:
         """Receive a message for a specific action.
         
@@ -88,11 +277,10 @@ class WebSocketClient:
             asyncio.TimeoutError: If no message is received within the timeout.
         """
         try:
-            if action not in self.message_queue:
-                self.message_queue[action] = asyncio.Queue()
-            return await asyncio.wait_for(self.message_queue[action].get(), timeout=timeout)
+            return await asyncio.wait_for(self._get_queue(action).get(), timeout=timeout)
         except asyncio.TimeoutError:
-            self.logger.error(f"Timeout waiting for message with action: {action}")
+            self.metrics.increment(self.metrics.recv_timeouts, action)
+            self.logger.error(f"Timeout waiting for message with action: {action} after {timeout}s")
             raise
         except Exception as e:
             self.logger.error(f"Failed to receive message for action {action}: {str(e)}", exc_info=True)
@@ -104,31 +292,87 @@ class WebSocketClient:
             while self.connected and self.websocket:
                 message = await self.websocket.recv()
                 try:
-                    data = json.loads(message)
+                    started = time.perf_counter()
+                    data = self.codec.loads(message)
                     action = data.get("action")
-                    ns = data.get("ns")
-                    self.logger.debug(f"Received message: {json.dumps(data, indent=2)}")
-                    
-                    # Store profile and assets data
-                    if action == "profile":
-                        self.api.profile_data = data
-                        self.logger.info(f"Stored profile data from multipleAction: {data}")
-                    elif action == "assets":
-                        self.api.assets_data = data
-                        self.logger.info(f"Stored assets data from multipleAction: {data}")
-                    
-                    # Queue the message for specific action
-                    if action in self.message_queue:
-                        await self.message_queue[action].put(data)
-                except json.JSONDecodeError:
+                    self.metrics.observe_received(action, len(message), time.perf_counter() - started)
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug(f"Received message: {message}")
+                    self._handle_message(data)
+                except self.codec.decode_errors:
+                    self.metrics.decode_errors += 1
                     self.logger.warning(f"Received non-JSON message: {message}")
                 except Exception as e:
                     self.logger.error(f"Error processing received message: {str(e)}", exc_info=True)
         except websockets.exceptions.ConnectionClosed as e:
             self.logger.warning(f"WebSocket connection closed: {str(e)}")
-            self.connected = False
-            await self.disconnect()
+            await self._connection_lost(ConnectionError(f"WebSocket connection closed: {str(e)}"))
         except Exception as e:
             self.logger.error(f"Error in receiving messages: {str(e)}", exc_info=True)
-            self.connected = False
-            await self.disconnect()
\ No newline at end of file
+            await self._connection_lost(ConnectionError(f"Error in receiving messages: {str(e)}"))
+
+    def _handle_message(self, data: Dict):
+        """Route a decoded message to its consumers and the request or queue waiting for it."""
+        action = data.get("action")
+        ns = data.get("ns")
+        if action == "multipleAction":
+            responses = (data.get("message") or {}).get("actions") if isinstance(data.get("message"), dict) else None
+            if isinstance(responses, list):
+                # A bundled reply: route each response on its own, so batched requests get theirs by ns
+                for response in responses:
+                    if isinstance(response, dict) and response.get("action"):
+                        self._handle_message(response)
+                return
+        
+        # Store profile and assets data
+        if action == "profile":
+            self.api.profile_data = data
+            self.logger.info(f"Stored profile data from multipleAction: {data}")
+        elif action == "assets":
+            self.api.assets_data = data
+            changed = self.api.asset_registry.apply(data.get("message"))
+            self.logger.info(f"Stored assets data: {len(changed)} assets added or changed")
+        elif action == "candles":
+            self.api.candle_store.ingest(data.get("message") or {})
+        elif action in ORDER_ACTIONS:
+            self.api.order_tracker.ingest(action, data.get("message"))
+        self.api.server_clock.observe_message(data)
+        if self.action_waiters:
+            for waiter in self.action_waiters.pop(action, ()):
+                if not waiter.done():
+                    waiter.set_result(data)
+        
+        # Resolve the request waiting on this ns, if any
+        future = self.pending_requests.pop(ns, None) if ns else None
+        if future is not None:
+            self.ns_echoed.add(action)
+            if not future.done():
+                future.set_result(data)
+            return
+        fallbacks = self.fallback_waiters.get(action)
+        while fallbacks:
+            fallback = fallbacks.popleft()
+            if not fallback.done():
+                fallback.set_result(data)
+                return
+        
+        # Queue the message for specific action
+        queue = self.message_queue.get(action)
+        if queue is not None and not queue.offer(data):
+            self.logger.debug(f"Dropped {action} message: queue full ({queue.maxsize})")
+
+    async def _connection_lost(self, error: Exception):
+        """Tear down a dropped connection and notify the owner unless the close was requested."""
+        self.connected = False
+        if self.batcher is not None:
+            self.batcher.fail(error)
+        self.scheduler.stop(error)
+        self._fail_pending_requests(error)
+        if self._closing:
+            return
+        try:
+            await self.websocket.close()
+        except Exception:
+            pass
+        if self.on_connection_lost is not None:
+            self.on_connection_lost(error)
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""JSON codecs for the ExpertOption WebSocket client.
+
+orjson or msgspec are used when installed, falling back to the standard
+library otherwise. All codecs decode ``str`` or ``bytes`` frames and encode
+to ``str`` so outgoing frames stay text frames.
+"""
+import json
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple, Type
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+class Codec(NamedTuple):
+    """A JSON encoder/decoder pair."""
+    name: str
+    loads: Callable[[Any], Any]
+    dumps: Callable[[Any], str]
+    decode_errors: Tuple[Type[Exception], ...]
+
+def _json_codec() -> Codec:
+    return Codec("json", json.loads, json.dumps, (json.JSONDecodeError,))
+
+def _orjson_codec() -> Codec:
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+    return Codec("orjson", orjson.loads, dumps, (orjson.JSONDecodeError,))
+
+def _msgspec_codec() -> Codec:
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+
+    def dumps(obj: Any) -> str:
+        return encoder.encode(obj).decode()
+    return Codec("msgspec", decoder.decode, dumps, (msgspec.DecodeError,))
+
+def available_codecs() -> Dict[str, Codec]:
+    """Get the codecs usable in this environment, fastest first.
+
+    Returns:
+        Mapping of codec name to codec.
+    """
+    codecs = {}
+    if orjson is not None:
+        codecs["orjson"] = _orjson_codec()
+    if msgspec is not None:
+        codecs["msgspec"] = _msgspec_codec()
+    codecs["json"] = _json_codec()
+    return codecs
+
+def get_codec(name: Optional[str] = None) -> Codec:
+    """Get a codec by name, or the fastest available one.
+
+    Args:
+        name: 'orjson', 'msgspec' or 'json', or None for the fastest available.
+
+    Returns:
+        The codec.
+
+    Raises:
+        ValueError: If the named codec is not available.
+    """
+    codecs = available_codecs()
+    if name is None:
+        return next(iter(codecs.values()))
+    if name not in codecs:
+        raise ValueError(f"Codec {name} is not available (installed: {', '.join(codecs)})")
+    return codecs[name]
\ No newline at end of file
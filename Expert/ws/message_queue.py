@@ -0,0 +1,72 @@
+"""Bounded message queues for the ExpertOption WebSocket client."""
+import asyncio
+from typing import Any
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+COALESCE_LATEST = "coalesce_latest"
+
+OVERFLOW_POLICIES = (DROP_OLDEST, DROP_NEWEST, COALESCE_LATEST)
+
+class BoundedMessageQueue(asyncio.Queue):
+    """Fixed-capacity queue that drops messages instead of growing when full."""
+
+    def __init__(self, capacity: int = 100, policy: str = DROP_OLDEST):
+        """Initialize the queue.
+
+        Args:
+            capacity: Maximum number of queued messages.
+            policy: Overflow policy ('drop_oldest', 'drop_newest' or 'coalesce_latest').
+
+        Raises:
+            ValueError: If the capacity or policy is invalid.
+        """
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        if capacity < 1:
+            raise ValueError(f"Queue capacity must be at least 1, got {capacity}")
+        # Coalescing only ever keeps the most recent message
+        super().__init__(maxsize=1 if policy == COALESCE_LATEST else capacity)
+        self.policy = policy
+        self.dropped = 0
+
+    def reconfigure(self, capacity: int, policy: str):
+        """Change the capacity and overflow policy in place.
+        
+        Coroutines waiting in get() keep waiting on this queue. If more
+        messages are queued than the new capacity allows, the oldest are
+        dropped.
+        
+        Args:
+            capacity: Maximum number of queued messages.
+            policy: Overflow policy ('drop_oldest', 'drop_newest' or 'coalesce_latest').
+        
+        Raises:
+            ValueError: If the capacity or policy is invalid.
+        """
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        if capacity < 1:
+            raise ValueError(f"Queue capacity must be at least 1, got {capacity}")
+        self._maxsize = 1 if policy == COALESCE_LATEST else capacity
+        self.policy = policy
+        while self.qsize() > self._maxsize:
+            self.get_nowait()
+            self.dropped += 1
+
+    def offer(self, item: Any) -> bool:
+        """Queue a message without blocking, applying the overflow policy.
+
+        Args:
+            item: The message to queue.
+
+        Returns:
+            True if the message was queued, False if it was dropped.
+        """
+        if self.full():
+            self.dropped += 1
+            if self.policy == DROP_NEWEST:
+                return False
+            self.get_nowait()
+        self.put_nowait(item)
+        return True
\ No newline at end of file
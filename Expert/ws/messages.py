@@ -0,0 +1,80 @@
+"""Typed views of inbound ExpertOption messages.
+
+Only data that is indexed or handed to callers gets a ``__slots__`` struct:
+candle series as NumPy arrays, and assets kept by AssetRegistry. Hot paths
+(CandleStore, OrderTracker, profile updates) read the decoded dicts
+directly, so no per-frame copy is made. Unknown fields are ignored and
+missing ones become None.
+"""
+from typing import Dict, List, Optional
+import numpy as np
+
+class CandleSeries:
+    """Candles of one asset and timeframe from a ``candles`` or history message."""
+    __slots__ = ("asset_id", "timeframe", "server_time", "timestamps", "ohlc")
+
+    def __init__(self, asset_id: Optional[int], timeframe: int, server_time: Optional[int],
+                 timestamps: np.ndarray, ohlc: np.ndarray):
+        self.asset_id = asset_id
+        self.timeframe = timeframe
+        self.server_time = server_time
+        self.timestamps = timestamps
+        self.ohlc = ohlc
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_entry(cls, entry: Dict) -> "CandleSeries":
+        """Build a series from one entry of ``message["candles"]``.
+        
+        The entry carries ``periods`` as ``[[start_time, [[open, high, low, close], ...]], ...]``;
+        candles within a period are ``tf`` seconds apart. Ticks (``tf`` 0) carry
+        no time of their own, so every tick of a period gets its start time.
+        
+        Args:
+            entry: The candle entry.
+        
+        Returns:
+            The candle series with (n,) int64 timestamps and (n, 4) float64 OHLC arrays.
+        """
+        timeframe = entry.get("tf") or 0
+        timestamps = []
+        rows = []
+        for start_time, candles in entry.get("periods") or []:
+            timestamps.append(start_time + timeframe * np.arange(len(candles), dtype=np.int64))
+            rows.extend(candle[:4] for candle in candles)
+        if rows:
+            ts = np.concatenate(timestamps)
+            ohlc = np.array(rows, dtype=np.float64).reshape(-1, 4)
+        else:
+            ts = np.empty(0, dtype=np.int64)
+            ohlc = np.empty((0, 4), dtype=np.float64)
+        return cls(entry.get("assetId"), timeframe, entry.get("t"), ts, ohlc)
+
+class AssetInfo:
+    """An asset from an ``assets`` message."""
+    __slots__ = ("id", "name", "symbol", "group_id", "is_active", "profit", "expirations")
+
+    def __init__(self, id: int, name: Optional[str], symbol: Optional[str], group_id, is_active: bool,
+                 profit: Optional[float], expirations: List[int]):
+        self.id = id
+        self.name = name
+        self.symbol = symbol
+        self.group_id = group_id
+        self.is_active = is_active
+        self.profit = profit
+        self.expirations = expirations
+
+    @classmethod
+    def from_dict(cls, asset: Dict) -> "AssetInfo":
+        """Build an asset from its raw dictionary."""
+        rates = asset.get("rates") or [{}]
+        return cls(asset.get("id"), asset.get("name"), asset.get("symbol"), asset.get("asset_group_id"),
+                   asset.get("is_active") == 1, asset.get("profit"), rates[0].get("expirations") or [])
+
+def decode_candles(message: Optional[Dict]) -> List[CandleSeries]:
+    """Decode the ``message`` field of a ``candles`` or ``assetHistoryCandles`` message."""
+    if not isinstance(message, dict):
+        return []
+    return [CandleSeries.from_entry(entry) for entry in message.get("candles") or [] if isinstance(entry, dict)]
\ No newline at end of file
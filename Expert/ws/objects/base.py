@@ -1,17 +1,10 @@
 """Base class for ExpertOption WebSocket objects."""
-from typing import Optional
 
 class BaseObject:
-    """Base class for ExpertOption WebSocket objects."""
+    """Base class for ExpertOption WebSocket objects.
     
-    def __init__(self):
-        self.__name: Optional[str] = None
-    
-    @property
-    def name(self) -> str:
-        """Get the name of the WebSocket object.
-        
-        Returns:
-            The name of the object.
-        """
-        return self.__name
\ No newline at end of file
+    Subclasses declare their fields in ``__slots__`` so instances carry no
+    per-instance ``__dict__``, and set ``name`` as a class attribute.
+    """
+    __slots__ = ()
+    name: str = None
\ No newline at end of file
@@ -0,0 +1,226 @@
+"""Outbound frame scheduling for the ExpertOption WebSocket client."""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple
+from Expert.metrics import Histogram, LATENCY_BUCKETS
+
+# Priority classes, highest first
+ORDERS = "orders"
+PINGS = "pings"
+SUBSCRIPTIONS = "subscriptions"
+BULK = "bulk"
+PRIORITY_CLASSES = (ORDERS, PINGS, SUBSCRIPTIONS, BULK)
+
+# Priority class per action; anything else is SUBSCRIPTIONS
+DEFAULT_ACTION_PRIORITIES: Dict[str, str] = {
+    "expertOption": ORDERS,
+    "buy": ORDERS,
+    "ping": PINGS,
+    "assetHistoryCandles": BULK,
+    "tradeHistory": BULK,
+    "getTournaments": BULK,
+    "getTournamentInfo": BULK,
+}
+
+class TokenBucket:
+    """Token bucket rate limit: ``rate`` frames per second with bursts of up to ``burst``."""
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self, now: float) -> bool:
+        """Take a token if one is available."""
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def wait_time(self, now: float) -> float:
+        """Get the seconds until a token is available."""
+        self._refill(now)
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+class OutboundScheduler:
+    """Sends frames one at a time, highest priority class first.
+
+    Frames wait in one FIFO per priority class (orders, pings,
+    subscriptions, bulk). Whenever the socket is free, the writer sends the
+    oldest frame of the highest class that has one and, if the class is
+    rate limited, a token. An order submitted during a subscription storm or
+    backfill therefore waits for at most the frame already being written.
+    When nothing is queued or being written, a frame is sent directly by its
+    caller without a task switch.
+
+    Lower classes are only served when higher ones are empty, so a flood of
+    orders delays pings and subscriptions; rate-limit the orders class if
+    that matters.
+    """
+
+    def __init__(self, rate_limits: Optional[Dict[str, Tuple[float, Optional[float]]]] = None,
+                 action_priorities: Optional[Dict[str, str]] = None):
+        """Initialize the scheduler.
+        
+        Args:
+            rate_limits: (frames per second, burst) per priority class; classes left out are unlimited.
+            action_priorities: Priority class per action, merged over DEFAULT_ACTION_PRIORITIES.
+        
+        Raises:
+            ValueError: If a priority class is unknown or a rate is not positive.
+        """
+        self.action_priorities: Dict[str, str] = {**DEFAULT_ACTION_PRIORITIES, **(action_priorities or {})}
+        for priority in list((rate_limits or {}).keys()) + list(self.action_priorities.values()):
+            if priority not in PRIORITY_CLASSES:
+                raise ValueError(f"Unknown priority class {priority!r}, expected one of {PRIORITY_CLASSES}")
+        self.buckets: Dict[str, TokenBucket] = {priority: TokenBucket(*limit)
+                                                for priority, limit in (rate_limits or {}).items()}
+        self.logger = logging.getLogger("OutboundScheduler")
+        self.queues: Dict[str, Deque[Tuple[str, asyncio.Future, float]]] = {p: deque() for p in PRIORITY_CLASSES}
+        self.queue_delay: Dict[str, Histogram] = {p: Histogram(LATENCY_BUCKETS) for p in PRIORITY_CLASSES}
+        self.sent: Dict[str, int] = {p: 0 for p in PRIORITY_CLASSES}
+        self._send: Optional[Callable[[str], Awaitable]] = None
+        self._busy = False
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def classify(self, action: Optional[str]) -> str:
+        """Get the priority class of an action."""
+        return self.action_priorities.get(action, SUBSCRIPTIONS)
+
+    def start(self, send: Callable[[str], Awaitable]):
+        """Start the writer for a new connection.
+        
+        Args:
+            send: Coroutine function writing one frame to the socket.
+        """
+        self.stop()
+        self._send = send
+        self._busy = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self, error: Optional[Exception] = None):
+        """Stop the writer and fail every queued frame.
+        
+        Args:
+            error: Exception given to the callers of queued frames.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._send = None
+        error = error or ConnectionResetError("Outbound scheduler stopped")
+        for queue in self.queues.values():
+            while queue:
+                _, future, _ = queue.popleft()
+                if not future.done():
+                    future.set_exception(error)
+
+    async def submit(self, frame: str, action: Optional[str] = None, priority: Optional[str] = None):
+        """Send a frame according to its priority.
+        
+        Args:
+            frame: The encoded frame.
+            action: The frame's action, used to pick its priority class.
+            priority: Priority class overriding the action's.
+        
+        Raises:
+            ConnectionResetError: If the scheduler is not running or stops before the frame is sent.
+        """
+        if self._send is None:
+            raise ConnectionResetError("Outbound scheduler is not running")
+        priority = priority or self.classify(action)
+        bucket = self.buckets.get(priority)
+        if not self._busy and not any(self.queues.values()) and (bucket is None or bucket.try_take(time.monotonic())):
+            # Socket idle and nothing waiting: send directly
+            self._busy = True
+            try:
+                self.queue_delay[priority].observe(0.0)
+                await self._send(frame)
+                self.sent[priority] += 1
+            finally:
+                self._busy = False
+                if any(self.queues.values()):
+                    self._wakeup.set()
+            return
+        future = asyncio.get_running_loop().create_future()
+        self.queues[priority].append((frame, future, time.perf_counter()))
+        self._wakeup.set()
+        await future
+
+    def _next(self) -> Tuple[Optional[str], Optional[float]]:
+        """Pick the class to serve next.
+        
+        Returns:
+            (priority class, None) if a frame can be sent now, else
+            (None, seconds until a rate-limited class has a token, or None if nothing is queued).
+        """
+        now = time.monotonic()
+        wait = None
+        for priority in PRIORITY_CLASSES:
+            if not self.queues[priority]:
+                continue
+            bucket = self.buckets.get(priority)
+            if bucket is None or bucket.try_take(now):
+                return priority, None
+            delay = bucket.wait_time(now)
+            wait = delay if wait is None else min(wait, delay)
+        return None, wait
+
+    async def _run(self):
+        """Writer loop: send queued frames in priority order."""
+        while True:
+            if self._busy:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            priority, wait = self._next()
+            if priority is None:
+                # Sleep until a frame arrives or a token refills
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            frame, future, enqueued = self.queues[priority].popleft()
+            if future.done():
+                continue
+            self.queue_delay[priority].observe(time.perf_counter() - enqueued)
+            self._busy = True
+            try:
+                await self._send(frame)
+                self.sent[priority] += 1
+                if not future.done():
+                    future.set_result(None)
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.set_exception(ConnectionResetError("Outbound scheduler stopped"))
+                raise
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self._busy = False
+
+    def depths(self) -> Dict[str, int]:
+        """Get the number of frames waiting per priority class."""
+        return {priority: len(queue) for priority, queue in self.queues.items()}
+
+    def snapshot(self) -> Dict:
+        """Get frames sent, waiting and queueing delay per priority class."""
+        return {priority: {"sent": self.sent[priority], "queued": len(self.queues[priority]),
+                           "queue_delay": self.queue_delay[priority].summary()}
+                for priority in PRIORITY_CLASSES}
\ No newline at end of file
@@ -139,23 +139,32 @@ async def analysis_loop(bot, chat_id):
         # يمكنك تغيير هذا لاحقاً ليكون ديناميكياً
         target_asset = None
 
-        # البحث عن Bitcoin أو اليورو دولار
-        for aid, data in api.active_assets.items():
-            name_lower = data.get('name', '').lower()
-            if data.get('is_active', False):
-                if 'bitcoin' in name_lower or 'eur/usd' in name_lower or 'eurusd' in name_lower:
-                    target_asset = {'id': aid, 'name': data['name']}
-                    print(f"✅ Found preferred asset: {data['name']}")
-                    break
+        # البحث عن Bitcoin أو اليورو دولار (جدول الرموز يفهرس الرموز والأسماء ويتجاهل حالة الأحرف والفواصل)
+        for symbol in ("Bitcoin", "BTCUSD", "EUR/USD"):
+            asset_id = api.symbols.resolve(symbol)
+            asset = api.asset_registry.get(asset_id) if asset_id is not None else None
+            if asset and asset.is_active:
+                target_asset = {'id': asset.id, 'name': asset.name}
+                print(f"✅ Found preferred asset: {asset.name}")
+                break
+
+        # أسماء مثل "Bitcoin OTC" لا تطابق أي رمز تماماً، فنبحث في الأسماء كما من قبل
+        if not target_asset:
+            for aid, data in api.active_assets.items():
+                name_lower = data.get('name', '').lower()
+                if data.get('is_active', False):
+                    if 'bitcoin' in name_lower or 'eur/usd' in name_lower or 'eurusd' in name_lower:
+                        target_asset = {'id': aid, 'name': data['name']}
+                        print(f"✅ Found preferred asset: {data['name']}")
+                        break
 
         # FALLBACK 1: If Bitcoin/EURUSD not found, use ANY active asset with profit > 70%
         if not target_asset:
             print("⚠️ Preferred asset not found. Searching for fallback (profit > 70%)...")
-            for aid, data in api.active_assets.items():
-                if data.get('is_active', False) and data.get('profit', 0) > 70:
-                    target_asset = {'id': aid, 'name': data['name']}
-                    print(f"✅ Using fallback asset: {data['name']} (Profit: {data['profit']}%)")
-                    break
+            best = api.asset_registry.top(1)
+            if best and (best[0].profit or 0) > 70:
+                target_asset = {'id': best[0].id, 'name': best[0].name}
+                print(f"✅ Using fallback asset: {best[0].name} (Profit: {best[0].profit}%)")
 
         # FALLBACK 2: If still None, use ANY active asset regardless of profit
         if not target_asset:
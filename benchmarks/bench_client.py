@@ -0,0 +1,135 @@
+"""End-to-end client benchmarks against the local mock server.
+
+Measures:
+    connect   -- ExpertOptionAPI.connect() wall time
+    receive   -- candle frames processed per second by the receive loop
+    orders    -- place_order latency percentiles
+    soak      -- memory growth of the client over a long candle stream
+
+The mock server runs in a child process, so its CPU and memory are not
+counted against the client.
+
+Usage:
+    python -m benchmarks.bench_client [--only connect,receive,orders,soak]
+        [--connects 5] [--frames 50000] [--orders 500] [--soak-messages 1000000]
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List
+from Expert.api import ExpertOptionAPI
+from benchmarks.common import MockServerProcess, blast, percentiles, quiet_logging, rss_bytes
+
+TOKEN = "benchmark"
+
+async def _connected_api(uri: str) -> ExpertOptionAPI:
+    api = ExpertOptionAPI(TOKEN, server_region=uri, auto_reconnect=False)
+    await api.connect()
+    return api
+
+async def bench_connect(uri: str, runs: int = 5) -> Dict:
+    """Time connect() from a fresh client to a ready session, with the mean time to each phase."""
+    samples = []
+    phases: Dict[str, List[float]] = {}
+    for _ in range(runs):
+        api = ExpertOptionAPI(TOKEN, server_region=uri, auto_reconnect=False)
+        started = time.perf_counter()
+        await api.connect()
+        samples.append(time.perf_counter() - started)
+        for phase, seconds in api.connect_timings.items():
+            phases.setdefault(phase, []).append(seconds)
+        await api.disconnect()
+    return {"runs": runs, **percentiles(samples),
+            "phases_ms": {phase: round(sum(values) / len(values) * 1000, 3) for phase, values in phases.items()}}
+
+async def bench_receive(uri: str, frames: int = 50000, assets: int = 50) -> Dict:
+    """Measure candle frames decoded and stored per second."""
+    api = await _connected_api(uri)
+    try:
+        await blast(api, min(frames, 1000), list(range(1, assets + 1)))  # warm-up
+        elapsed = await blast(api, frames, list(range(1, assets + 1)))
+        return {"frames": frames, "assets": assets, "seconds": round(elapsed, 3),
+                "frames_per_sec": round(frames / elapsed, 1)}
+    finally:
+        await api.disconnect()
+
+async def bench_orders(uri: str, orders: int = 500) -> Dict:
+    """Measure place_order round-trip latency."""
+    api = await _connected_api(uri)
+    try:
+        asset_id = next(iter(api.active_assets))
+        await api.get_candles(asset_id, [5])
+        samples = []
+        for _ in range(orders):
+            started = time.perf_counter()
+            await api.place_order(asset_id, 1.0, "call")
+            samples.append(time.perf_counter() - started)
+        return {"orders": orders, **percentiles(samples)}
+    finally:
+        await api.disconnect()
+
+async def bench_soak(uri: str, messages: int = 1_000_000, samples: int = 10, assets: int = 200) -> Dict:
+    """Stream many candle frames and record the client's memory after each slice."""
+    api = await _connected_api(uri)
+    try:
+        step = max(1, messages // samples)
+        await blast(api, min(step, 10000), list(range(1, assets + 1)))  # warm-up allocations
+        baseline = rss_bytes()
+        trace = []
+        sent = 0
+        started = time.perf_counter()
+        while sent < messages:
+            count = min(step, messages - sent)
+            await blast(api, count, list(range(1, assets + 1)))
+            sent += count
+            trace.append({"messages": sent, "rss_mb": round((rss_bytes() or 0) / 2 ** 20, 1)})
+        elapsed = time.perf_counter() - started
+        final = rss_bytes()
+        return {
+            "messages": sent,
+            "assets": assets,
+            "seconds": round(elapsed, 1),
+            "baseline_rss_mb": round((baseline or 0) / 2 ** 20, 1),
+            "growth_mb": round(((final or 0) - (baseline or 0)) / 2 ** 20, 1),
+            "dropped_messages": api.websocket_client.dropped_messages,
+            "trace": trace,
+        }
+    finally:
+        await api.disconnect()
+
+async def run(only=("connect", "receive", "orders", "soak"), connects: int = 5, frames: int = 50000,
+              orders: int = 500, soak_messages: int = 1_000_000, latency: float = 0.0) -> Dict:
+    """Run the selected client benchmarks.
+
+    Returns:
+        Results keyed by benchmark name.
+    """
+    quiet_logging()
+    results = {}
+    with MockServerProcess(assets=200, candle_rate=0, latency=latency, settle_after=3600) as uri:
+        if "connect" in only:
+            results["connect"] = await bench_connect(uri, connects)
+        if "receive" in only:
+            results["receive"] = await bench_receive(uri, frames)
+        if "orders" in only:
+            results["orders"] = await bench_orders(uri, orders)
+        if "soak" in only:
+            results["soak"] = await bench_soak(uri, soak_messages)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", default="connect,receive,orders,soak", help="Comma-separated benchmarks")
+    parser.add_argument("--connects", type=int, default=5)
+    parser.add_argument("--frames", type=int, default=50000)
+    parser.add_argument("--orders", type=int, default=500)
+    parser.add_argument("--soak-messages", type=int, default=1_000_000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock server response latency in seconds")
+    args = parser.parse_args()
+    results = asyncio.run(run(args.only.split(","), args.connects, args.frames, args.orders,
+                              args.soak_messages, args.latency))
+    print(json.dumps({"benchmark": "client", **results}, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark inbound frame decoding throughput.
+
+Measures frames/sec decoded by each available JSON codec on candle traffic,
+next to the previous receive path (json.loads plus an eager indented
+json.dumps for the debug log).
+
+Usage:
+    python -m benchmarks.bench_decode [--input frames.jsonl] [--frames 20000]
+
+--input takes recorded traffic with one raw frame per line; without it a
+synthetic candle stream is generated.
+"""
+import argparse
+import json
+import random
+import time
+from typing import Dict, List
+from Expert.ws.codec import available_codecs
+
+def synthetic_candle_frames(count: int, assets: int = 50, candles_per_frame: int = 2, seed: int = 1) -> List[str]:
+    """Generate candle push frames shaped like live ``candles`` traffic.
+
+    Args:
+        count: Number of frames.
+        assets: Number of distinct assets in the stream.
+        candles_per_frame: Candles carried in each frame.
+        seed: Random seed.
+
+    Returns:
+        Encoded frames.
+    """
+    rng = random.Random(seed)
+    prices = {asset_id: 100.0 + asset_id for asset_id in range(assets)}
+    start = int(time.time())
+    frames = []
+    for i in range(count):
+        asset_id = i % assets
+        candles = []
+        for _ in range(candles_per_frame):
+            open_ = prices[asset_id]
+            close = open_ + rng.uniform(-0.05, 0.05)
+            candles.append([round(open_, 5), round(max(open_, close) + 0.01, 5),
+                            round(min(open_, close) - 0.01, 5), round(close, 5)])
+            prices[asset_id] = close
+        frames.append(json.dumps({
+            "action": "candles",
+            "message": {"candles": [{"assetId": asset_id, "tf": 5, "t": start + i,
+                                     "periods": [[start + i - i % 5, candles]]}]},
+            "ns": None,
+        }))
+    return frames
+
+def load_recorded_frames(path: str) -> List[str]:
+    """Load recorded frames, one raw frame per line."""
+    with open(path, encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+def _rate(frames: List[str], decode, repeat: int) -> float:
+    """Get the best frames/sec over several passes."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for frame in frames:
+            decode(frame)
+        best = min(best, time.perf_counter() - start)
+    return len(frames) / best
+
+def run(frames: List[str], repeat: int = 3) -> Dict:
+    """Run the decode benchmark.
+
+    Args:
+        frames: Encoded frames to decode.
+        repeat: Passes per codec; the best one is reported.
+
+    Returns:
+        Benchmark results.
+    """
+    def legacy(frame):
+        data = json.loads(frame)
+        json.dumps(data, indent=2)
+
+    results = {"frames": len(frames), "bytes_per_frame": sum(len(f) for f in frames) / max(len(frames), 1),
+               "frames_per_sec": {"legacy_json_debug_dump": _rate(frames, legacy, repeat)}}
+    for name, codec in available_codecs().items():
+        results["frames_per_sec"][name] = _rate(frames, codec.loads, repeat)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", help="Recorded frames, one per line")
+    parser.add_argument("--frames", type=int, default=20000, help="Synthetic frame count")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    frames = load_recorded_frames(args.input) if args.input else synthetic_candle_frames(args.frames)
+    print(json.dumps({"benchmark": "decode", **run(frames, args.repeat)}, indent=2))
+
+if __name__ == "__main__":
+    main()
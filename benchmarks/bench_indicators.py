@@ -0,0 +1,87 @@
+"""Benchmark indicator throughput.
+
+Compares the dict-based RSIIndicator and AlligatorIndicator with the
+streaming classes (per-candle updates) and the vectorized batch functions
+(many assets at once).
+
+Usage:
+    python -m benchmarks.bench_indicators [--candles 1000] [--assets 100]
+"""
+import argparse
+import json
+import time
+from typing import Callable, Dict
+import numpy as np
+from Expert.batch_indicators import batch_alligator, batch_rsi
+from Expert.indicators import AlligatorIndicator, RSIIndicator, StreamingAlligator, StreamingRSI
+
+def synthetic_closes(assets: int, candles: int, seed: int = 1) -> np.ndarray:
+    """Random-walk closing prices of shape (assets, candles)."""
+    rng = np.random.default_rng(seed)
+    return 100 + np.cumsum(rng.normal(0, 0.05, size=(assets, candles)), axis=1)
+
+def candle_message(closes: np.ndarray, start: int = 1_700_000_000, timeframe: int = 5) -> Dict:
+    """Wrap closing prices in the candle message shape the dict-based indicators read."""
+    rows = [[float(c), float(c), float(c), float(c)] for c in closes]
+    return {"candles": [{"assetId": 1, "tf": timeframe, "periods": [[start, rows]]}]}
+
+def _per_sec(func: Callable, repeat: int) -> float:
+    """Get the best calls per second over several timed runs."""
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        best = min(best, time.perf_counter() - started)
+    return repeat / best
+
+def run(candles: int = 1000, assets: int = 100, repeat: int = 50) -> Dict:
+    """Run the indicator benchmark.
+
+    Args:
+        candles: Candles per series.
+        assets: Assets in the batch benchmarks.
+        repeat: Calls per timed run.
+
+    Returns:
+        Benchmark results.
+    """
+    closes = synthetic_closes(assets, candles)
+    message = candle_message(closes[0])
+    series = closes[0].tolist()
+
+    def streaming_rsi():
+        rsi = StreamingRSI()
+        for close in series:
+            rsi.update(close)
+
+    def streaming_alligator():
+        alligator = StreamingAlligator()
+        for close in series:
+            alligator.update(close)
+
+    return {
+        "candles": candles,
+        "assets": assets,
+        "series_per_sec": {
+            "RSIIndicator": round(_per_sec(lambda: RSIIndicator(message).calculate_rsi(), repeat), 1),
+            "AlligatorIndicator": round(_per_sec(lambda: AlligatorIndicator(message), repeat), 1),
+            "StreamingRSI": round(_per_sec(streaming_rsi, repeat), 1),
+            "StreamingAlligator": round(_per_sec(streaming_alligator, repeat), 1),
+        },
+        "assets_per_sec": {
+            "batch_rsi": round(_per_sec(lambda: batch_rsi(closes), max(1, repeat // 10)) * assets, 1),
+            "batch_alligator": round(_per_sec(lambda: batch_alligator(closes), max(1, repeat // 10)) * assets, 1),
+        },
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candles", type=int, default=1000)
+    parser.add_argument("--assets", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    print(json.dumps({"benchmark": "indicators", **run(args.candles, args.assets, args.repeat)}, indent=2))
+
+if __name__ == "__main__":
+    main()
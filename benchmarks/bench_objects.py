@@ -0,0 +1,114 @@
+"""Benchmark memory and attribute access of the value objects.
+
+Compares the slotted Candle and Order against the previous layout (a
+per-instance ``__dict__`` holding name-mangled fields behind properties).
+
+Usage:
+    python -m benchmarks.bench_objects [--objects 100000]
+"""
+import argparse
+import json
+import timeit
+import tracemalloc
+from typing import Callable, Dict, List
+from Expert.ws.objects.candles import Candle
+from Expert.ws.objects.order import Order
+
+class LegacyCandle:
+    """Candle as it was before slots: mangled fields behind read-only properties."""
+
+    def __init__(self, candle_data: List[float]):
+        self.__open = candle_data[0]
+        self.__high = candle_data[1]
+        self.__low = candle_data[2]
+        self.__close = candle_data[3]
+
+    @property
+    def open(self) -> float:
+        return self.__open
+
+    @property
+    def close(self) -> float:
+        return self.__close
+
+class LegacyOrder:
+    """Order as it was before slots, with the unused name field set by the base class."""
+
+    def __init__(self):
+        self.__name = None
+        self.__name = "order"
+        self.__order_id = None
+        self.__asset_id = None
+        self.__amount = None
+        self.__direction = None
+        self.__strike_time = None
+        self.__exp_time = None
+        self.__profit = None
+        self.__status = None
+
+    @property
+    def status(self) -> int:
+        return self.__status
+
+    @status.setter
+    def status(self, value: int):
+        self.__status = value
+
+def _bytes_per_object(factory: Callable[[int], object], count: int) -> float:
+    """Get the average bytes allocated per object, including its attribute storage."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    # The list holding the objects is not part of the per-object cost
+    allocated -= objects.__sizeof__()
+    return allocated / count
+
+def _ns_per_access(obj: object, attribute: str, number: int = 1_000_000) -> float:
+    """Get the best nanoseconds per attribute read over several runs."""
+    timer = timeit.Timer(f"obj.{attribute}", globals={"obj": obj})
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e9
+
+def run(count: int = 100_000) -> Dict:
+    """Run the object benchmark.
+
+    Args:
+        count: Number of objects allocated per variant.
+
+    Returns:
+        Benchmark results.
+    """
+    # Distinct floats so every candle owns its prices, as decoded candles do
+    def candle(i):
+        return [100.0 + i, 100.5 + i, 99.5 + i, 100.25 + i]
+
+    variants = {
+        "candle": {
+            "legacy": (lambda i: LegacyCandle(candle(i)), "close"),
+            "slots": (lambda i: Candle(candle(i)), "close"),
+        },
+        "order": {
+            "legacy": (lambda i: LegacyOrder(), "status"),
+            "slots": (lambda i: Order(), "status"),
+        },
+    }
+    results = {"objects": count}
+    for kind, layouts in variants.items():
+        results[kind] = {}
+        for layout, (factory, attribute) in layouts.items():
+            results[kind][layout] = {
+                "bytes_per_object": round(_bytes_per_object(factory, count), 1),
+                "ns_per_access": round(_ns_per_access(factory(0), attribute), 1),
+            }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--objects", type=int, default=100_000, help="Objects allocated per variant")
+    args = parser.parse_args()
+    print(json.dumps({"benchmark": "objects", **run(args.objects)}, indent=2))
+
+if __name__ == "__main__":
+    main()
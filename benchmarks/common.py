@@ -0,0 +1,109 @@
+"""Shared helpers for the benchmark scripts."""
+import asyncio
+import logging
+import multiprocessing
+import os
+import platform
+import subprocess
+import time
+from typing import Dict, List, Optional, Sequence
+
+def percentiles(samples: Sequence[float], points: Sequence[int] = (50, 90, 99)) -> Dict[str, float]:
+    """Summarize latency samples (in seconds) as milliseconds.
+
+    Returns:
+        Dictionary with min, the requested percentiles and max, in ms.
+    """
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    result = {"min_ms": ordered[0] * 1000}
+    for point in points:
+        index = min(len(ordered) - 1, max(0, round(point / 100 * len(ordered)) - 1))
+        result[f"p{point}_ms"] = ordered[index] * 1000
+    result["max_ms"] = ordered[-1] * 1000
+    return {key: round(value, 3) for key, value in result.items()}
+
+def rss_bytes() -> Optional[int]:
+    """Get the resident set size of this process, or None if unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        # ru_maxrss is the peak, in KiB on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if platform.system() == "Darwin" else peak * 1024
+    except ImportError:
+        return None
+
+def environment() -> Dict:
+    """Describe the environment results were produced in."""
+    from Expert.ws.codec import get_codec
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "codec": get_codec().name,
+        "timestamp": int(time.time()),
+    }
+
+def _serve(options: Dict, ports):
+    """Run a mock server until the parent process terminates us."""
+    from Expert.mock_server import MockExpertOptionServer
+    quiet_logging()
+
+    async def main():
+        async with MockExpertOptionServer(**options) as server:
+            ports.put(server.port)
+            await asyncio.Future()
+    asyncio.run(main())
+
+class MockServerProcess:
+    """Runs Expert.mock_server in a child process so it does not share the client's CPU or memory.
+
+    Usage::
+
+        with MockServerProcess(latency=0.001) as uri:
+            api = ExpertOptionAPI(token, server_region=uri)
+    """
+
+    def __init__(self, **options):
+        self.options = options
+        self._context = multiprocessing.get_context("spawn")
+        self._process = None
+
+    def __enter__(self) -> str:
+        ports = self._context.Queue()
+        self._process = self._context.Process(target=_serve, args=(self.options, ports), daemon=True)
+        self._process.start()
+        return f"ws://127.0.0.1:{ports.get(timeout=30)}"
+
+    def __exit__(self, *exc_info):
+        self._process.terminate()
+        self._process.join(5)
+
+def quiet_logging():
+    """Silence client logging so it does not skew the measurements."""
+    logging.disable(logging.WARNING)
+
+async def blast(api, count: int, asset_ids: Optional[List[int]] = None, timeout: float = 600.0) -> float:
+    """Have the mock server push candle frames and wait until the client has processed them all.
+
+    Returns:
+        Elapsed seconds from the request to the last frame being processed.
+    """
+    client = api.websocket_client
+    # Registered before sending, so the mockBlastDone reply cannot be missed
+    done = client.expect("mockBlastDone")
+    started = time.perf_counter()
+    await client.send({"action": "mockBlast", "message": {"count": count, "assets": asset_ids}, "ns": None})
+    await asyncio.wait_for(done, timeout=timeout)
+    return time.perf_counter() - started
@@ -0,0 +1,52 @@
+"""Run every benchmark and emit one JSON document.
+
+The output records the git commit, Python version and JSON codec, so
+results from different versions can be compared for regressions.
+
+Usage:
+    python -m benchmarks.run_all [--quick] [--output results.json]
+
+--quick shrinks every workload (and the soak to 100k messages) for a
+fast smoke run.
+"""
+import argparse
+import asyncio
+import json
+from benchmarks import bench_client, bench_decode, bench_indicators, bench_objects
+from benchmarks.common import environment
+
+def run(quick: bool = False) -> dict:
+    """Run all benchmarks.
+
+    Args:
+        quick: Use small workloads.
+
+    Returns:
+        Results keyed by benchmark name, plus the environment.
+    """
+    scale = 10 if quick else 1
+    results = {"environment": environment()}
+    results["decode"] = bench_decode.run(bench_decode.synthetic_candle_frames(20000 // scale))
+    results["objects"] = bench_objects.run(100_000 // scale)
+    results["indicators"] = bench_indicators.run(repeat=50 // scale)
+    results["client"] = asyncio.run(bench_client.run(
+        connects=5 if not quick else 2,
+        frames=50000 // scale,
+        orders=500 // scale,
+        soak_messages=1_000_000 // scale,
+    ))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="Small workloads for a smoke run")
+    parser.add_argument("--output", help="Also write the results to this file")
+    args = parser.parse_args()
+    document = json.dumps(run(args.quick), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(document + "\n")
+    print(document)
+
+if __name__ == "__main__":
+    main()
@@ -26,12 +26,9 @@ async def main():
         print("🚀 جاري بدء تشغيل البوت الذكي...")
         print("="*50)
         
+        # connect() يعود بعد وصول الملف الشخصي وقائمة العملات
         await api.connect()
-        print("✅ تم إرسال طلب الاتصال...")
-
-        # --- الحل السحري: الانتظار 8 ثوانٍ حتى تصل قائمة العملات من السيرفر ---
-        print("⏳ جاري تحميل قائمة العملات (يرجى الانتظار)...")
-        await asyncio.sleep(8)
+        print(f"✅ تم الاتصال خلال {api.connect_timings.get('total', 0):.2f} ثانية")
         
         # طباعة عدد الأصول التي تم العثور عليها
         print(f"📊 عدد الأصول المتاحة الآن: {len(api.active_assets)}")
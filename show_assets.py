@@ -19,41 +19,28 @@ async def show_assets():
     api = ExpertOptionAPI(token=TOKEN, demo=True, server_region=SERVER)
     await api.connect()
 
-    # الانتظار لتحميل البيانات
-    await asyncio.sleep(5)
+    # عرض الأصول (السجل مفهرس حسب المجموعة والربح)
+    registry = api.asset_registry
 
-    # عرض الأصول
-    assets = api.active_assets
-
-    print(f"\n📊 إجمالي الأصول المتاحة: {len(assets)}\n")
+    print(f"\n📊 إجمالي الأصول المتاحة: {len(registry)}\n")
     print("=" * 80)
 
-    # تصنيف الأصول حسب المجموعة
-    groups = {}
-    for aid, data in assets.items():
-        group = data.get('asset_group_id', 'other')
-        if group not in groups:
-            groups[group] = []
-        groups[group].append((aid, data))
-
     # عرض كل مجموعة
-    for group_name, group_assets in groups.items():
-        print(f"\n📁 {group_name.upper()}")
+    for group_name in registry.groups:
+        print(f"\n📁 {str(group_name or 'other').upper()}")
         print("-" * 80)
 
-        for aid, data in sorted(group_assets, key=lambda x: x[1]['profit'], reverse=True):
-            status = "✅" if data['is_active'] == 1 else "❌"
-            name = data['name']
-            profit = data['profit']
-            symbol = data.get('symbol', 'N/A')
+        for asset in sorted(registry.group(group_name, active_only=False), key=lambda a: a.profit or 0, reverse=True):
+            status = "✅" if asset.is_active else "❌"
+            symbol = asset.symbol or 'N/A'
 
-            print(f"{status} ID: {aid:4d} | {name:30s} | Profit: {profit:3.0f}% | Symbol: {symbol}")
+            print(f"{status} ID: {asset.id:4d} | {asset.name:30s} | Profit: {asset.profit or 0:3.0f}% | Symbol: {symbol}")
 
     print("\n" + "=" * 80)
 
     # إحصائيات
-    active_count = sum(1 for d in assets.values() if d['is_active'] == 1)
-    inactive_count = len(assets) - active_count
+    active_count = len(registry.active)
+    inactive_count = len(registry) - active_count
 
     print(f"\n📈 إحصائيات:")
     print(f"   - أصول نشطة: {active_count}")
@@ -63,11 +50,8 @@ async def show_assets():
     print(f"\n🏆 أفضل 10 أصول نشطة (حسب الربح):")
     print("-" * 80)
 
-    active_assets = [(aid, data) for aid, data in assets.items() if data['is_active'] == 1]
-    top_10 = sorted(active_assets, key=lambda x: x[1]['profit'], reverse=True)[:10]
-
-    for i, (aid, data) in enumerate(top_10, 1):
-        print(f"{i:2d}. ID: {aid:4d} | {data['name']:30s} | Profit: {data['profit']:3.0f}%")
+    for i, asset in enumerate(registry.top(10), 1):
+        print(f"{i:2d}. ID: {asset.id:4d} | {asset.name:30s} | Profit: {asset.profit:3.0f}%")
 
     # قطع الاتصال
     await api.disconnect()
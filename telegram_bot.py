@@ -72,7 +72,6 @@ async def trading_logic(bot, chat_id):
                 api = ExpertOptionAPI(token=EXPERT_TOKEN, demo=True, server_region=SERVER_REGION)
                 await api.connect()
                 GLOBAL_STATE["api"] = api
-                await asyncio.sleep(3) # انتظار استقرار الاتصال
             else:
                 api = GLOBAL_STATE["api"]
 
@@ -91,17 +90,16 @@ async def trading_logic(bot, chat_id):
             # الوضع التلقائي (الذكاء الاصطناعي)
             if GLOBAL_STATE["mode"] == "AUTO":
                 max_score = 0
-                for aid, data in api.active_assets.items():
-                    if not data['is_active']: continue
-                    
-                    name = data['name'].lower()
-                    profit = data['profit']
+                # الأصول النشطة بربح 70% فأكثر فقط، من فهرس السجل بدلاً من فحص الكل
+                for asset in api.asset_registry.with_min_payout(70):
+                    aid = asset.id
+                    name = asset.name.lower()
+                    profit = asset.profit
                     
                     # 🛡️ الفلترة الصارمة (توصية التدقيق: منع الشموع الصفرية)
                     if 'otc' in name: continue           # خطر جداً - Keep OTC blocked
                     # if 'smarty' in name: continue      # Allow SMARTY (user request)
                     # if 'index' in name: continue       # Allow INDEX (user request)
-                    if profit < 70: continue             # ربح ضعيف
 
                     # نظام النقاط
                     score = profit
@@ -111,7 +109,7 @@ async def trading_logic(bot, chat_id):
                     
                     if score > max_score:
                         max_score = score
-                        best_asset = {'id': aid, 'name': data['name'], 'profit': profit}
+                        best_asset = {'id': aid, 'name': asset.name, 'profit': profit}
 
             if not best_asset:
                 print("⚠️ No valid assets found. Retrying in 5s...")
@@ -177,17 +175,21 @@ async def trading_logic(bot, chat_id):
                     
                     try:
                         # جلب الرصيد قبل الصفقة
-                        profile = api.profile
-                        bal_start = profile.balance if hasattr(profile, 'balance') else profile.get('balance', 0)
+                        bal_start = api.get_balance()
                         
                         # تنفيذ الصفقة
                         order = await api.place_order(best_asset['id'], 50, direction)
-                        await bot.send_message(chat_id, f"✅ Order #{order} Placed. Waiting 60s...")
+                        await bot.send_message(chat_id, f"✅ Order #{order} Placed. Waiting for settlement (up to 90s)...")
                         
-                        await asyncio.sleep(62) # انتظار نتيجة الصفقة
+                        # انتظار تسوية الصفقة (يصل الإشعار من الخادم بدلاً من الانتظار الثابت)
+                        settled = await api.check_order_status(order, timeout=90)
+                        if settled is None:
+                            await bot.send_message(chat_id, f"⏳ Order #{order} not settled after 90s.")
+                            continue
                         
-                        # جلب الرصيد بعد الصفقة وحساب النتيجة
-                        bal_end = api.profile.balance if hasattr(api.profile, 'balance') else api.profile.get('balance', 0)
+                        # تحديث الملف الشخصي بعد التسوية ثم حساب النتيجة كفرق الرصيد
+                        await api.fetch_profile(refresh=True)
+                        bal_end = api.get_balance()
                         diff = bal_end - bal_start
                         
                         result_txt = f"💵 Result: ${diff:.2f}"
@@ -207,8 +209,8 @@ async def trading_logic(bot, chat_id):
                 print(f"\n⚠️ System Error: {e}")
                 await bot.send_message(chat_id, "⚠️ خلل في الاتصال، جاري الإصلاح الذاتي...")
             
-            # تنظيف الاتصال القديم
-            if GLOBAL_STATE["api"]:
+            # تنظيف الاتصال القديم (الـ API يعيد الاتصال تلقائياً، نعيد البناء فقط إذا توقف عن المحاولة)
+            if GLOBAL_STATE["api"] and not GLOBAL_STATE["api"].connected:
                 try: await GLOBAL_STATE["api"].disconnect()
                 except: pass
                 GLOBAL_STATE["api"] = None
@@ -264,15 +266,14 @@ async def list_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     msg = "📊 **أفضل الأصول المتاحة حالياً:**\n"
     candidates = []
-    for aid, data in api.active_assets.items():
-        if data['is_active'] and data['profit'] >= 70:
-            name = data['name']
-            if 'otc' not in name.lower() and 'smarty' not in name.lower():
-                candidates.append((aid, name, data['profit']))
-    
-    candidates.sort(key=lambda x: x[2], reverse=True)
+    # مرتبة تنازلياً حسب الربح
+    for asset in api.asset_registry.with_min_payout(70):
+        if 'otc' not in asset.name.lower() and 'smarty' not in asset.name.lower():
+            candidates.append((asset.id, asset.name, asset.profit))
+            if len(candidates) == 10:
+                break
     
-    for item in candidates[:10]:
+    for item in candidates:
         msg += f"🆔 `{item[0]}` : {item[1]} ({item[2]}%)\n"
     
     msg += "\nللتداول اليدوي: `/trade ID`"
@@ -0,0 +1,55 @@
+"""Tests for CandleArchive writes, merges and live archiving."""
+import asyncio
+import os
+import numpy as np
+from Expert.archive import CandleArchive
+from Expert.candle_store import CandleStore
+
+def prices(values):
+    return np.array([[value] * 4 for value in values], dtype=float)
+
+def test_round_trip_survives_reopen(tmp_path):
+    archive = CandleArchive(str(tmp_path))
+    timestamps = np.arange(100, 200, 5)
+    assert archive.write(1, 5, timestamps, prices(range(20))) == 20
+    archive.close()
+    records = CandleArchive(str(tmp_path)).read(1, 5, 150, 175)
+    assert records["t"].tolist() == [150, 155, 160, 165, 170]
+    assert records["close"].tolist() == [10, 11, 12, 13, 14]
+
+def test_repeated_and_newer_candles_do_not_rewrite(tmp_path, monkeypatch):
+    archive = CandleArchive(str(tmp_path))
+    archive.write(1, 5, np.arange(100, 200, 5), prices([1] * 20))
+    merges = []
+    monkeypatch.setattr(archive, "_merge", lambda *args: merges.append(args) or 0)
+    archive.write(1, 5, np.array([190, 195, 200, 205]), prices([2, 2, 2, 2]))
+    assert merges == []
+    records = archive.read(1, 5)
+    assert len(records) == 22
+    assert records["close"][-5:].tolist() == [1, 2, 2, 2, 2]
+
+def test_older_missing_candles_are_merged(tmp_path):
+    archive = CandleArchive(str(tmp_path))
+    archive.write(1, 5, np.arange(100, 200, 5), prices([1] * 20))
+    archive.write(1, 5, np.array([50, 150, 210]), prices([3, 3, 3]))
+    records = archive.read(1, 5)
+    assert records["t"][:2].tolist() == [50, 100]
+    assert records["close"][records["t"] == 150].tolist() == [3]
+    assert archive.range(1, 5) == (50, 210)
+
+def test_attach_writes_off_the_event_loop(tmp_path):
+    async def main():
+        archive = CandleArchive(str(tmp_path), flush_interval=0.05)
+        store = CandleStore()
+        archive.attach(store)
+        for start in (100, 105, 105, 110):
+            store.ingest({"candles": [{"assetId": 1, "tf": 5, "periods": [[start, [[start, start, start, start]]]]},
+                                      {"assetId": 1, "tf": 0, "periods": [[start, [[1, 1, 1, 1], [2, 2, 2, 2]]]]}]})
+        # Queued only: nothing is written inside the listener
+        assert not os.path.exists(tmp_path / "1_5.candles")
+        await asyncio.sleep(0.2)
+        assert os.path.exists(tmp_path / "1_5.candles.idx")
+        assert archive.read(1, 5)["t"].tolist() == [100, 105, 110]
+        assert archive.range(1, 0) is None
+        archive.close()
+    asyncio.run(main())
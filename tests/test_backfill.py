@@ -0,0 +1,38 @@
+"""Tests for HistoryBackfill chunking and de-duplication."""
+import asyncio
+import numpy as np
+from Expert.backfill import HistoryBackfill
+
+class FakeHistoryAPI:
+    """Answers get_historical_candles from a fixed list of entries per timeframe."""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.requests = []
+
+    async def get_historical_candles(self, asset_id, periods, timeframe, timeout=None):
+        self.requests.append((periods[0][0], periods[0][1]))
+        return {"candles": [entry for entry in self.entries if entry["tf"] == timeframe]}
+
+def test_chunks_align_to_timeframe():
+    backfill = HistoryBackfill(None, chunk_candles=10)
+    assert backfill.chunks(5, 1003, 1120) == [(1000, 1050), (1050, 1100), (1100, 1120)]
+
+def test_tick_chunks_use_time_span():
+    backfill = HistoryBackfill(None, tick_chunk_seconds=60)
+    assert backfill.chunks(0, 1000, 1150) == [(1000, 1060), (1060, 1120), (1120, 1150)]
+
+def test_candles_are_deduplicated_and_sorted():
+    entries = [{"tf": 5, "periods": [[1010, [[2, 2, 2, 2], [3, 3, 3, 3]]], [1000, [[1, 1, 1, 1], [9, 9, 9, 9]]]]}]
+    series = asyncio.run(HistoryBackfill(FakeHistoryAPI(entries)).fetch_range(1, 5, 1000, 1100))
+    # 1005 comes from the second period, 1010 is reported once
+    assert series.timestamps.tolist() == [1000, 1005, 1010, 1015]
+    assert series.ohlc[:, 3].tolist() == [1, 9, 2, 3]
+
+def test_every_tick_is_kept():
+    ticks_in = [[float(i)] * 4 for i in range(7)]
+    entries = [{"tf": 0, "periods": [[1000, ticks_in[:4]], [1001, ticks_in[4:]]]}]
+    series = asyncio.run(HistoryBackfill(FakeHistoryAPI(entries)).fetch_range(1, 0, 1000, 1010))
+    assert len(series) == len(ticks_in)
+    assert series.timestamps.tolist() == [1000] * 4 + [1001] * 3
+    assert np.array_equal(series.ohlc[:, 3], np.arange(7, dtype=float))
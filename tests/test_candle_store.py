@@ -0,0 +1,59 @@
+"""Tests for the CandleBuffer ring and CandleStore ingestion."""
+import numpy as np
+from Expert.candle_store import CandleBuffer, CandleStore
+
+def fill(buffer, timestamps):
+    for t in timestamps:
+        buffer.update(t, t, t + 1, t - 1, t + 0.5)
+
+def test_wraparound_keeps_the_latest_candles_in_order():
+    buffer = CandleBuffer(5)
+    fill(buffer, range(0, 60, 5))
+    assert len(buffer) == 5
+    assert buffer.timestamps().tolist() == [35, 40, 45, 50, 55]
+    assert buffer.closes().tolist() == [35.5, 40.5, 45.5, 50.5, 55.5]
+    assert buffer.ohlc().shape == (4, 5)
+    assert buffer.latest_timestamp == 55
+
+def test_views_are_read_only_and_not_copies():
+    buffer = CandleBuffer(4)
+    fill(buffer, range(3))
+    closes = buffer.closes()
+    assert not closes.flags.writeable
+    assert not closes.flags.owndata
+
+def test_same_timestamp_replaces_and_older_is_ignored():
+    buffer = CandleBuffer(3)
+    assert buffer.update(10, 1, 2, 0, 1)
+    assert buffer.update(10, 1, 3, 0, 2)
+    assert not buffer.update(5, 9, 9, 9, 9)
+    assert buffer.timestamps().tolist() == [10]
+    assert buffer.closes().tolist() == [2]
+
+def test_tick_buffer_appends_repeated_timestamps():
+    buffer = CandleBuffer(10, ticks=True)
+    assert buffer.extend(np.array([7, 7, 7]), np.arange(12, dtype=float).reshape(3, 4)) == 3
+    assert buffer.timestamps().tolist() == [7, 7, 7]
+
+def test_extend_counts_distinct_candles():
+    buffer = CandleBuffer(10)
+    fill(buffer, [0])
+    # Updates the open candle twice, then appends two
+    timestamps = np.array([0, 0, 5, 10])
+    assert buffer.extend(timestamps, np.ones((4, 4))) == 3
+    assert CandleBuffer(2).extend(np.arange(5), np.ones((5, 4))) == 2
+
+def test_ingest_stores_periods_and_reports_kept_candles():
+    store = CandleStore(capacity=10)
+    seen = []
+    store.add_listener(lambda series: seen.append(series.asset_id))
+    store.add_listener(lambda series: 1 / 0)
+    message = {"candles": [
+        {"assetId": 1, "tf": 5, "periods": [[100, [[1, 2, 0, 1.5], [1.5, 2, 1, 1.8]]]]},
+        {"assetId": 1, "tf": 0, "periods": [[100, [[1, 1, 1, 1], [2, 2, 2, 2]]]]},
+    ]}
+    assert store.ingest(message) == 4
+    assert store.buffer(1, 5).timestamps().tolist() == [100, 105]
+    assert store.buffer(1, 0).closes().tolist() == [1, 2]
+    # A failing listener does not stop the others
+    assert seen == [1, 1]
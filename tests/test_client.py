@@ -0,0 +1,104 @@
+"""Tests for WebSocketClient request correlation against the mock server."""
+import asyncio
+import logging
+from uuid import uuid4
+from Expert.api import ExpertOptionAPI
+from Expert.mock_server import MockExpertOptionServer
+
+logging.disable(logging.CRITICAL)
+
+async def connected_api(server, **kwargs):
+    api = ExpertOptionAPI("token", server_region=server.uri, auto_reconnect=False, bootstrap="minimal", **kwargs)
+    await api.connect()
+    return api
+
+def test_concurrent_requests_get_their_own_responses():
+    async def main():
+        async with MockExpertOptionServer(assets=10, candle_rate=0, latency=0.01, jitter=0.009) as server:
+            api = await connected_api(server)
+            responses = await asyncio.gather(*(api.get_candles(asset_id, [5]) for asset_id in range(1, 11)))
+            assert [r["candles"][0]["assetId"] for r in responses] == list(range(1, 11))
+            assert api.websocket_client.pending_requests == {}
+            await api.disconnect()
+    asyncio.run(main())
+
+def test_request_times_out_and_cleans_up():
+    async def main():
+        async with MockExpertOptionServer(assets=2, candle_rate=0) as server:
+            api = await connected_api(server)
+            server._on_tradeHistory = lambda *args: None
+            client = api.websocket_client
+            try:
+                await client.request({"action": "tradeHistory", "message": {}, "token": "token"}, timeout=0.05)
+                assert False, "expected a timeout"
+            except asyncio.TimeoutError:
+                pass
+            assert client.pending_requests == {}
+            assert client.metrics.request_timeouts["tradeHistory"] == 1
+            await api.disconnect()
+    asyncio.run(main())
+
+def test_fallback_accepts_responses_without_ns_until_echo_is_seen():
+    async def main():
+        async with MockExpertOptionServer(assets=2, candle_rate=0) as server:
+            api = await connected_api(server)
+            reply = server._reply
+            server._reply = lambda websocket, action, message, ns: reply(
+                websocket, action, message, None if action == "candles" else ns)
+            response = await api.get_candles(1, [5])
+            assert response["candles"][0]["assetId"] == 1
+            assert "candles" not in api.websocket_client.ns_echoed
+            # Once the server echoes ns, only the ns match is accepted
+            server._reply = reply
+            await api.get_candles(2, [5])
+            assert "candles" in api.websocket_client.ns_echoed
+            assert not api.websocket_client.fallback_waiters.get("candles")
+            await api.disconnect()
+    asyncio.run(main())
+
+def test_batched_requests_are_demultiplexed_by_ns():
+    async def main():
+        async with MockExpertOptionServer(assets=30, candle_rate=0) as server:
+            api = await connected_api(server, batch_window=0.005, max_batch=20)
+            results = await api.subscribe_many(range(1, 31), [5])
+            assert all(results[asset_id]["candles"][0]["assetId"] == asset_id for asset_id in range(1, 31))
+            # 30 requests in batches of at most 20
+            assert api.websocket_client.batcher.snapshot()["frames"] == 2
+            await api.disconnect()
+    asyncio.run(main())
+
+def test_settlement_wakes_the_waiter():
+    async def main():
+        async with MockExpertOptionServer(assets=3, candle_rate=0, settle_after=0.05) as server:
+            api = await connected_api(server)
+            order_id = await api.place_order(1, 10, "call")
+            started = asyncio.get_running_loop().time()
+            order = await api.check_order_status(order_id, timeout=5)
+            assert order is not None and api.order_tracker.is_settled(order)
+            assert asyncio.get_running_loop().time() - started < 1
+            assert order.profit in (8.0, -10)
+            await api.disconnect()
+    asyncio.run(main())
+
+def test_reconnect_restores_the_session_and_subscriptions():
+    async def main():
+        async with MockExpertOptionServer(assets=3, candle_rate=50, disconnect_after=0.3) as server:
+            api = await connected_api(server)
+            api.auto_reconnect = True
+            await api.get_candles(1, [5])
+            await api.get_candles(2, [5])
+            subscribed = server.actions["subscribeCandles"]
+            for _ in range(100):
+                await asyncio.sleep(0.02)
+                if api.reconnect_count:
+                    break
+            assert api.reconnect_count == 1
+            # Both subscriptions replayed in one frame, after a new profile and assets request
+            assert server.actions["subscribeCandles"] == subscribed + 1
+            assert server.actions["profile"] >= 2 and server.actions["assets"] >= 2
+            pushed = []
+            api.candle_store.add_listener(lambda series: pushed.append(series.asset_id))
+            await asyncio.sleep(0.1)
+            assert {1, 2} <= set(pushed)
+            await api.disconnect()
+    asyncio.run(main())
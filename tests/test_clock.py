@@ -0,0 +1,38 @@
+"""Tests for the ServerClock offset estimate."""
+from Expert.clock import ServerClock
+
+def test_offset_is_the_largest_recent_sample():
+    clock = ServerClock()
+    for local, server in [(1000.0, 1002), (1001.0, 1003.5), (1002.0, 1003)]:
+        assert clock.observe(server, local)
+    assert clock.offset == 2.5
+
+def test_outlier_is_rejected():
+    clock = ServerClock(max_deviation=30.0)
+    clock.observe(1002, 1000.0)
+    assert not clock.observe(5000, 1001.0)
+    assert clock.offset == 2
+    assert clock.rejected == 1
+    assert clock.observe(1005, 1002.0)
+    assert clock.offset == 3
+
+def test_consistent_outliers_rebuild_the_estimate():
+    clock = ServerClock(max_deviation=30.0, max_rejections=3)
+    clock.observe(1002, 1000.0)
+    assert not clock.observe(1101, 1001.0)
+    assert not clock.observe(1102, 1002.0)
+    assert clock.observe(1103, 1003.0)
+    assert clock.offset == 100
+
+def test_stale_estimate_starts_over():
+    clock = ServerClock(max_age=10.0)
+    clock.observe(1002, 1000.0)
+    assert clock.observe(5000, 2000.0)
+    assert clock.offset == 3000
+
+def test_only_clock_actions_are_sampled():
+    clock = ServerClock()
+    assert not clock.observe_message({"action": "tradeHistory", "message": {"t": 1}})
+    assert not clock.offset
+    assert clock.observe_message({"action": "candles", "message": {"candles": [{"t": 10**9}]}})
+    assert clock.offset is not None
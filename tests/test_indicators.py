@@ -0,0 +1,31 @@
+"""Tests that streaming indicators agree with the batch versions."""
+import numpy as np
+from Expert.batch_indicators import batch_alligator, batch_rsi
+from Expert.indicators import RSIIndicator, StreamingAlligator, StreamingRSI
+
+def random_closes(n=300, seed=3):
+    return 100 + np.cumsum(np.random.default_rng(seed).normal(size=n))
+
+def test_streaming_rsi_matches_batch_at_every_step():
+    closes = random_closes()
+    expected = batch_rsi(closes[None, :])[0]
+    rsi = StreamingRSI()
+    values = [rsi.update(close) for close in closes]
+    assert all(value is None for value in values[:14])
+    np.testing.assert_allclose(values[14:], expected[14:], rtol=1e-9)
+
+def test_seeded_rsi_matches_the_candle_data_indicator():
+    closes = random_closes(seed=4)
+    candle_data = {"candles": [{"periods": [[0, [[c, c, c, c] for c in closes]]]}]}
+    rsi = StreamingRSI()
+    rsi.seed(closes)
+    assert abs(rsi.value - RSIIndicator(candle_data).calculate_rsi()) < 1e-9
+
+def test_streaming_alligator_matches_batch():
+    closes = random_closes(seed=5)
+    jaw, teeth, lips = (line[0, -1] for line in batch_alligator(closes[None, :]))
+    alligator = StreamingAlligator()
+    alligator.seed(closes[:100])
+    for close in closes[100:]:
+        alligator.update(close)
+    np.testing.assert_allclose(alligator.current, (jaw, teeth, lips), rtol=1e-9)
@@ -0,0 +1,96 @@
+"""Tests for outbound scheduling, request batching and inbound queue overflow."""
+import asyncio
+import pytest
+from Expert.ws.batcher import RequestBatcher
+from Expert.ws.message_queue import BoundedMessageQueue, COALESCE_LATEST, DROP_NEWEST, DROP_OLDEST
+from Expert.ws.scheduler import OutboundScheduler
+
+def test_scheduler_serves_higher_classes_first():
+    async def main():
+        scheduler = OutboundScheduler()
+        sent = []
+        gate = asyncio.Event()
+
+        async def send(frame):
+            sent.append(frame)
+            if frame == "first":
+                await gate.wait()
+        scheduler.start(send)
+        # "first" holds the socket while the rest queue up
+        first = asyncio.ensure_future(scheduler.submit("first", "tradeHistory"))
+        await asyncio.sleep(0)
+        waiting = [asyncio.ensure_future(scheduler.submit(frame, action)) for frame, action in [
+            ("bulk1", "tradeHistory"), ("sub1", "subscribeCandles"), ("order1", "expertOption"),
+            ("bulk2", "tradeHistory"), ("ping1", "ping"), ("order2", "expertOption")]]
+        await asyncio.sleep(0)
+        assert scheduler.depths()["orders"] == 2
+        gate.set()
+        await asyncio.gather(first, *waiting)
+        assert sent == ["first", "order1", "order2", "ping1", "sub1", "bulk1", "bulk2"]
+        scheduler.stop()
+    asyncio.run(main())
+
+def test_scheduler_stop_fails_queued_frames():
+    async def main():
+        scheduler = OutboundScheduler()
+        gate = asyncio.Event()
+
+        async def send(frame):
+            await gate.wait()
+        scheduler.start(send)
+        first = asyncio.ensure_future(scheduler.submit("first", "ping"))
+        await asyncio.sleep(0)
+        queued = asyncio.ensure_future(scheduler.submit("second", "ping"))
+        await asyncio.sleep(0)
+        scheduler.stop(ConnectionError("down"))
+        with pytest.raises(ConnectionError):
+            await queued
+        first.cancel()
+    asyncio.run(main())
+
+def test_batcher_splits_at_max_batch_and_keeps_order():
+    async def main():
+        frames = []
+
+        async def send(frame, priority):
+            frames.append((frame, priority))
+        batcher = RequestBatcher(send, lambda action: "bulk", window=0.01, max_batch=3)
+        payloads = [{"action": "tradersChoice", "ns": str(i), "token": "t"} for i in range(7)]
+        await asyncio.gather(*(batcher.submit(payload) for payload in payloads))
+        assert [len(frame["message"]["actions"]) if frame["action"] == "multipleAction" else 1
+                for frame, _ in frames] == [3, 3, 1]
+        sent = [a["ns"] for frame, _ in frames for a in (frame["message"]["actions"] if frame["action"] == "multipleAction" else [frame])]
+        assert sent == [str(i) for i in range(7)]
+        assert batcher.snapshot()["requests"] == 7
+    asyncio.run(main())
+
+def test_batcher_fail_releases_requests_being_sent():
+    async def main():
+        gate = asyncio.Event()
+
+        async def send(frame, priority):
+            await gate.wait()
+        batcher = RequestBatcher(send, lambda action: "bulk", window=0.001, max_batch=2)
+        submits = [asyncio.ensure_future(batcher.submit({"action": "tradersChoice", "ns": str(i)})) for i in range(3)]
+        await asyncio.sleep(0.01)
+        assert batcher.snapshot()["sending"] == 3
+        batcher.fail(ConnectionError("down"))
+        results = await asyncio.gather(*submits, return_exceptions=True)
+        assert all(isinstance(result, ConnectionError) for result in results)
+        await asyncio.sleep(0)
+        assert batcher.snapshot()["sending"] == 0
+    asyncio.run(main())
+
+@pytest.mark.parametrize("policy, kept, dropped", [
+    (DROP_OLDEST, [2, 3, 4], 2),
+    (DROP_NEWEST, [0, 1, 2], 2),
+    (COALESCE_LATEST, [4], 4),
+])
+def test_queue_overflow_policies(policy, kept, dropped):
+    async def main():
+        queue = BoundedMessageQueue(3, policy)
+        for i in range(5):
+            queue.offer(i)
+        assert [queue.get_nowait() for _ in range(queue.qsize())] == kept
+        assert queue.dropped == dropped
+    asyncio.run(main())
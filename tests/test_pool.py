@@ -0,0 +1,32 @@
+"""Tests for ConnectionPool routing and the dedicated order connection."""
+import asyncio
+import logging
+from Expert.mock_server import MockExpertOptionServer
+from Expert.pool import ConnectionPool
+
+logging.disable(logging.CRITICAL)
+
+def test_rehash_moves_few_assets():
+    small = ConnectionPool("token", size=4)
+    large = ConnectionPool("token", size=5)
+    index = {id(api): i for i, api in enumerate(small.candle_apis)}
+    index.update({id(api): i for i, api in enumerate(large.candle_apis)})
+    moved = sum(index[id(small.connection_for(a))] != index[id(large.connection_for(a))] for a in range(1000))
+    # Adding a fifth connection should move about a fifth of the assets
+    assert moved < 350
+
+def test_orders_never_subscribe_on_the_order_connection():
+    async def main():
+        async with MockExpertOptionServer(assets=5, candle_rate=0) as server:
+            pool = ConnectionPool("token", server_region=server.uri, size=2, auto_reconnect=False,
+                                  bootstrap="minimal")
+            await pool.connect()
+            assert not pool.server_clock.synced
+            order_id = await pool.place_order(1, 1.0, "call")
+            orders = await pool.place_orders([{"asset_id": 2, "amount": 1.0}, {"asset_id": 99, "amount": 1.0}])
+            assert order_id is not None and orders[0] is not None and orders[1] is None
+            assert pool.order_api.subscriptions == {}
+            assert "subscribeCandles" not in pool.order_api.websocket_client.metrics.frames_sent
+            assert pool.server_clock.synced
+            await pool.disconnect()
+    asyncio.run(main())
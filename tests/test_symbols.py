@@ -0,0 +1,40 @@
+"""Tests for symbol resolution when several assets share an alias."""
+from Expert.asset_registry import AssetRegistry
+from Expert.symbols import SymbolTable
+
+def asset(asset_id, symbol, name, active=1, profit=80):
+    return {"id": asset_id, "symbol": symbol, "name": name, "is_active": active, "profit": profit,
+            "asset_group_id": 1}
+
+def registry_with_table():
+    registry = AssetRegistry()
+    table = SymbolTable()
+    registry.add_listener(table.update)
+    return registry, table
+
+def test_active_asset_wins_and_lowest_id_breaks_ties():
+    registry, table = registry_with_table()
+    registry.update([asset(3, "EURUSD", "Euro", active=0), asset(7, "EURUSD", "Euro 2"), asset(5, "EURUSD", "Euro 3")])
+    assert table.resolve("eur/usd") == 5
+    assert registry.by_symbol("EURUSD").id == 5
+    # Deactivating the winner hands the symbol to the next active asset
+    registry.update([{"id": 5, "is_active": 0}])
+    assert table.resolve("EURUSD") == 7
+    assert registry.by_symbol("EURUSD").id == 7
+
+def test_own_symbol_wins_over_a_name_match():
+    registry, table = registry_with_table()
+    registry.update([asset(1, "GOLD_X", "BTCUSD"), asset(2, "BTCUSD", "Bitcoin")])
+    assert table.resolve("BTCUSD") == 2
+    assert table.resolve("bitcoin") == 2
+    assert table.resolve("gold-x") == 1
+
+def test_changes_are_reported_and_listener_errors_isolated():
+    registry, table = registry_with_table()
+    changes = []
+    registry.add_listener(lambda assets: 1 / 0)
+    registry.add_listener(lambda assets: changes.append([a.id for a in assets]))
+    table.add_listener(changes.append)
+    registry.update([asset(1, "AAA", "Alpha")])
+    assert {"AAA": 1, "ALPHA": 1} in changes
+    assert [1] in changes